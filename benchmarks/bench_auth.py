@@ -0,0 +1,44 @@
+"""Password verification throughput of the authentication executor.
+
+    python benchmarks/bench_auth.py [--verifications N] [--workers W ...]
+
+Reports verifications per second and per core for each worker count, using the same
+PBKDF2 parameters as login.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fintechx_desktop.app import auth  # noqa: E402
+from fintechx_desktop.app.auth_executor import AuthExecutor  # noqa: E402
+
+
+def main(argv=None) -> int:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verifications", type=int, default=4 * cores)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, cores}))
+    args = parser.parse_args(argv)
+
+    backend = "native" if auth.fintechx_native is not None else "hashlib"
+    print(f"backend: {backend}, iterations: {auth.PBKDF2_ITERATIONS_AUTH}, cores: {cores}")
+    stored_hash, salt = auth.hash_password("correct horse battery staple")
+
+    for workers in args.workers:
+        executor = AuthExecutor(max_workers=workers)
+        start = time.perf_counter()
+        futures = [executor.submit_verify_password(stored_hash, "correct horse battery staple", salt)
+                   for _ in range(args.verifications)]
+        assert all(f.result() for f in futures)
+        elapsed = time.perf_counter() - start
+        executor.shutdown()
+        rate = args.verifications / elapsed
+        print(f"workers {workers:>3}: {rate:8.1f} verifications/s   {rate / min(workers, cores):8.1f} /s per core")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Connection-open latency for the SQLCipher layer: legacy passphrase open vs raw-key fast open.
+
+    python benchmarks/bench_db_open.py [--repeat N]
+
+Runs against a throwaway database in a temporary directory. The derived key is computed once,
+as the key cache does, so the numbers isolate what SQLCipher itself does on open.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fintechx_desktop.infrastructure import database  # noqa: E402
+
+
+def _time_opens(open_fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        open_fn().close()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _report(label: str, samples: list[float]):
+    ms = sorted(s * 1000 for s in samples)
+    print(f"{label:<24} median {statistics.median(ms):9.3f} ms   p95 {ms[int(len(ms) * 0.95) - 1]:9.3f} ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        key_hex = os.urandom(database.DB_KEY_LENGTH).hex()
+        legacy_path = os.path.join(tmp, "legacy.db")
+        fast_path = os.path.join(tmp, "fast.db")
+
+        def open_legacy():
+            return database._try_open(legacy_path, database._legacy_key_literal(key_hex),
+                                      database.LEGACY_CIPHER_PRAGMAS, True)
+
+        def open_fast():
+            return database._try_open(fast_path, database._raw_key_literal(key_hex),
+                                      database.CIPHER_PRAGMAS, True)
+
+        for open_fn in (open_legacy, open_fast):
+            conn = open_fn()
+            database.initialize_schema(conn)
+            conn.close()
+
+        _report("legacy (passphrase key)", _time_opens(open_legacy, args.repeat))
+        _report("raw key", _time_opens(open_fast, args.repeat))
+
+        migrate_path = os.path.join(tmp, "migrate.db")
+        os.replace(legacy_path, migrate_path)
+        start = time.perf_counter()
+        migrated = database.migrate_legacy_database(migrate_path, key_hex)
+        print(f"{'one-off migration':<24} {'ok' if migrated else 'FAILED'} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
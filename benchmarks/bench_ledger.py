@@ -0,0 +1,95 @@
+"""Index-backed ledger query latency on a generated encrypted database.
+
+    python benchmarks/bench_ledger.py [--rows 10000000] [--accounts 1000] [--db PATH]
+
+Builds the database once (reused on later runs when --db is given), then times keyset page
+reads by account and by category, including a deep page, and prints the query plans.
+"""
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fintechx_desktop.infrastructure import database, ledger  # noqa: E402
+
+CATEGORIES = ["groceries", "rent", "travel", "salary", "utilities", "dining", "fees", "transfer"]
+BENCH_PASSWORD = "ledger-benchmark"
+
+
+def generate_rows(count: int, accounts: int, seed: int = 7):
+    rng = random.Random(seed)
+    start = datetime.date(2015, 1, 1).toordinal()
+    for _ in range(count):
+        yield (
+            rng.randrange(1, accounts + 1),
+            "generated",
+            rng.randrange(-50000, 50001),
+            rng.choice(CATEGORIES),
+            datetime.date.fromordinal(start + rng.randrange(3650)).isoformat(),
+        )
+
+
+def timed(fn, repeat: int = 50) -> float:
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return statistics.median(samples) * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--db", help="database path to build/reuse (default: temporary)")
+    args = parser.parse_args(argv)
+
+    tmp = None
+    db_path = args.db
+    if db_path is None:
+        tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp.name, "ledger.db")
+
+    pool = database.ConnectionPool(db_path)
+    with pool.connection(BENCH_PASSWORD) as conn:
+        (existing,) = conn.execute("SELECT count(*) FROM transactions").fetchone()
+        if existing < args.rows:
+            t = time.perf_counter()
+            ledger.insert_transactions(conn, generate_rows(args.rows - existing, args.accounts))
+            print(f"inserted {args.rows - existing} rows in {time.perf_counter() - t:.1f} s")
+
+        account = args.accounts // 2
+        first, after = ledger.fetch_account_transactions(conn, account)
+        deep_after = None
+        for _ in range(20):
+            _, deep_after = ledger.fetch_account_transactions(conn, account, after=deep_after)
+
+        print(f"account page (first):     {timed(lambda: ledger.fetch_account_transactions(conn, account)):8.3f} ms")
+        print(f"account page (20th):      {timed(lambda: ledger.fetch_account_transactions(conn, account, after=deep_after)):8.3f} ms")
+        print(f"account page (1 month):   {timed(lambda: ledger.fetch_account_transactions(conn, account, '2020-03-01', '2020-03-31')):8.3f} ms")
+        print(f"category page (1 month):  {timed(lambda: ledger.fetch_category_transactions(conn, 'travel', '2020-03-01', '2020-03-31')):8.3f} ms")
+
+        for label, sql, params in (
+            ("account", "SELECT * FROM transactions WHERE account_id = ? AND (transaction_date, id) > (?, ?) "
+                        "ORDER BY transaction_date, id LIMIT 100", (account, "2020-01-01", 0)),
+            ("category", "SELECT * FROM transactions WHERE category = ? AND transaction_date >= ? "
+                         "ORDER BY transaction_date, id LIMIT 100", ("travel", "2020-01-01")),
+        ):
+            plan = " / ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+            print(f"plan ({label}): {plan}")
+
+    pool.close()
+    if tmp is not None:
+        tmp.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
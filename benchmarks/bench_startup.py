@@ -0,0 +1,92 @@
+"""Cold-start cost of the desktop app: import time and time to first window.
+
+    python benchmarks/bench_startup.py [--runs 5] [--top 15]
+
+Each run is a fresh interpreter. Import cost comes from ``python -X importtime``; time to
+first window is measured from interpreter start to the first event-loop turn after
+MainWindow.show(). Set QT_QPA_PLATFORM=offscreen to run headless.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+FIRST_WINDOW_SNIPPET = """
+import sys, time
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
+from fintechx_desktop.ui.main_window import MainWindow
+
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+
+def done():
+    print(time.perf_counter())
+    app.quit()
+
+QTimer.singleShot(0, done)
+app.exec()
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = SRC + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def import_profile(module: str) -> list[tuple[int, str]]:
+    """(cumulative microseconds, module) for every module imported, from -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=_env(), check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports keep their leading indentation
+        rows.append((int(cumulative), name[1:].rstrip()))
+    return rows
+
+
+def time_to_first_window() -> float:
+    """Seconds from interpreter start to the first event-loop turn with the main window shown."""
+    # perf_counter is CLOCK_MONOTONIC on Linux, so the child's reading is comparable with ours
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", FIRST_WINDOW_SNIPPET],
+                            capture_output=True, text=True, env=_env(), check=True)
+    return float(result.stdout.strip().splitlines()[-1]) - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest top-level imports to list")
+    args = parser.parse_args(argv)
+
+    totals = []
+    for _ in range(args.runs):
+        rows = import_profile("fintechx_desktop.main")
+        totals.append(next(us for us, name in rows if name.strip() == "fintechx_desktop.main"))
+    print(f"import fintechx_desktop.main: median {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs")
+
+    top_level = sorted(((us, name) for us, name in rows if not name.startswith(" ")), reverse=True)
+    for us, name in top_level[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    try:
+        windows = [time_to_first_window() for _ in range(args.runs)]
+    except subprocess.CalledProcessError as e:
+        print(f"time to first window: unavailable ({e.stderr.strip().splitlines()[-1] if e.stderr else e})")
+        return 1
+    print(f"time to first window: median {statistics.median(windows) * 1000:.1f} ms over {args.runs} runs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""Minimal benchmark harness: registration, calibrated timing, JSON results and baseline comparison.
+
+Suites are modules named ``suite_*.py`` in this directory. Each benchmark is a function decorated
+with ``@benchmark`` that does its setup and returns the zero-argument callable to time. A
+generator function may instead ``yield`` the callable and clean up after the yield. Raise
+``SkipBenchmark`` when a dependency (native module, SQLCipher) is unavailable.
+"""
+import contextlib
+import datetime
+import fnmatch
+import importlib
+import inspect
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, NamedTuple, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+BASELINE_DIR = os.path.join(BENCH_DIR, "baselines")
+RESULTS_FORMAT = 1
+
+MIN_SAMPLE_TIME = 0.2 # Seconds each timed sample should last; loops are calibrated to reach it
+REPEAT = 5 # Samples per benchmark; the median is what gets compared
+QUICK_MIN_SAMPLE_TIME = 0.02
+QUICK_REPEAT = 3
+
+class SkipBenchmark(Exception):
+    """Raised from a benchmark's setup when it cannot run in this environment."""
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable
+    params: dict # Parameter name -> list of values; every combination is a separate case
+    items: Optional[Callable] # Maps a case's params to items processed per call, for throughput
+    unit: str # What an item is ("B", "PANs", ...)
+
+class Case(NamedTuple):
+    benchmark: Benchmark
+    params: dict
+
+    @property
+    def name(self) -> str:
+        if not self.params:
+            return self.benchmark.name
+        args = ",".join(f"{k}={v}" for k, v in self.params.items())
+        return f"{self.benchmark.name}[{args}]"
+
+_registry: list[Benchmark] = []
+
+def benchmark(name: str = None, params: dict = None, items: Callable = None, unit: str = "items"):
+    """Registers a benchmark; its name defaults to <suite>.<function> (suite_ prefix dropped)."""
+    def register(func):
+        suite = func.__module__.rsplit(".", 1)[-1].removeprefix("suite_")
+        _registry.append(Benchmark(name or f"{suite}.{func.__name__}", func, dict(params or {}), items, unit))
+        return func
+    return register
+
+def load_suites() -> list[Benchmark]:
+    """Imports every suite_*.py module in this directory and returns the registered benchmarks."""
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+    if BENCH_DIR not in sys.path:
+        sys.path.insert(0, BENCH_DIR)
+    for filename in sorted(os.listdir(BENCH_DIR)):
+        if filename.startswith("suite_") and filename.endswith(".py"):
+            importlib.import_module(filename[:-3])
+    return list(_registry)
+
+def expand_cases(benchmarks: list[Benchmark], patterns: list[str] = None) -> list[Case]:
+    """All parameter combinations, filtered by shell-style patterns on the case or benchmark name."""
+    cases = []
+    for bench in benchmarks:
+        keys = list(bench.params)
+        for values in itertools.product(*(bench.params[k] for k in keys)):
+            case = Case(bench, dict(zip(keys, values)))
+            if not patterns or any(fnmatch.fnmatch(case.name, p) or fnmatch.fnmatch(bench.name, p) for p in patterns):
+                cases.append(case)
+    return cases
+
+@contextlib.contextmanager
+def _prepared(case: Case):
+    """Runs the benchmark's setup, yields the callable to time, then its teardown."""
+    if inspect.isgeneratorfunction(case.benchmark.func):
+        with contextlib.contextmanager(case.benchmark.func)(**case.params) as fn:
+            yield fn
+    else:
+        yield case.benchmark.func(**case.params)
+
+def _time_loops(fn: Callable, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+def time_case(case: Case, min_sample_time: float = MIN_SAMPLE_TIME, repeat: int = REPEAT) -> dict:
+    """Times one case: calibrates the loop count, then takes `repeat` samples of seconds per call."""
+    with _prepared(case) as fn:
+        fn() # Warm-up: first-call costs (lazy imports, caches) are not what we track
+        number = 1
+        while True:
+            elapsed = _time_loops(fn, number)
+            if elapsed >= min_sample_time or number >= 1 << 30:
+                break
+            number = max(number * 2, int(number * min_sample_time / max(elapsed, 1e-9) * 1.2))
+        samples = [elapsed / number] + [_time_loops(fn, number) / number for _ in range(repeat - 1)]
+
+    result = {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "number": number,
+        "repeat": len(samples),
+        "params": case.params,
+    }
+    if case.benchmark.items is not None:
+        items = case.benchmark.items(**case.params)
+        result["items_per_call"] = items
+        result["unit"] = case.benchmark.unit
+        result["throughput"] = items / result["median"]
+    return result
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def machine_info() -> dict:
+    info = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "commit": _git_commit(),
+    }
+    try:
+        from fintechx_desktop.infrastructure import fintechx_native
+        info["luhn_kernel"] = fintechx_native.luhn_batch_kernel()
+    except (ImportError, AttributeError):
+        info["luhn_kernel"] = None
+    return info
+
+def run_cases(cases: list[Case], quick: bool = False, log=print) -> dict:
+    """Runs cases in order and returns the results document (see save_results)."""
+    min_sample_time, repeat = (QUICK_MIN_SAMPLE_TIME, QUICK_REPEAT) if quick else (MIN_SAMPLE_TIME, REPEAT)
+    results, skipped = {}, {}
+    for case in cases:
+        try:
+            result = time_case(case, min_sample_time, repeat)
+        except SkipBenchmark as e:
+            skipped[case.name] = str(e)
+            log(f"{case.name:<56} skipped: {e}")
+            continue
+        results[case.name] = result
+        log(f"{case.name:<56} {format_result(result)}")
+    return {
+        "format": RESULTS_FORMAT,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "quick": quick,
+        "results": results,
+        "skipped": skipped,
+    }
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+def format_result(result: dict) -> str:
+    text = f"median {format_seconds(result['median'])}  (+/- {result['stdev'] / result['median'] * 100:4.1f}%)"
+    if "throughput" in result:
+        rate = result["throughput"]
+        prefix, scale = next(((p, s) for p, s in (("G", 1e9), ("M", 1e6), ("k", 1e3)) if rate >= s), ("", 1.0))
+        text += f"  {rate / scale:8.2f} {prefix}{result['unit']}/s"
+    return text
+
+def baseline_path(name: str) -> str:
+    """A bare name refers to benchmarks/baselines/<name>.json; anything with a separator or .json is a path."""
+    if os.sep in name or "/" in name or name.endswith(".json"):
+        return name
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+def save_results(document: dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    if document.get("format") != RESULTS_FORMAT:
+        raise ValueError(f"{path}: unsupported results format {document.get('format')!r}")
+    return document
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: float # Median seconds per call
+    current: float
+    change: float # Relative change in time per call; +0.10 is 10% slower
+
+    def status(self, threshold: float) -> str:
+        if self.change > threshold:
+            return "REGRESSION"
+        if self.change < -threshold:
+            return "improved"
+        return "ok"
+
+def compare(baseline: dict, current: dict) -> tuple[list[Comparison], list[str], list[str]]:
+    """Pairs results by case name. Returns (comparisons, only in baseline, only in current)."""
+    old, new = baseline["results"], current["results"]
+    comparisons = [Comparison(name, old[name]["median"], new[name]["median"],
+                              new[name]["median"] / old[name]["median"] - 1.0)
+                   for name in old if name in new]
+    return comparisons, sorted(set(old) - set(new)), sorted(set(new) - set(old))
+
+def format_comparison(comparisons: list[Comparison], missing: list[str], added: list[str],
+                      threshold: float) -> str:
+    lines = [f"{'benchmark':<56} {'baseline':>11} {'current':>11} {'change':>8}"]
+    for c in sorted(comparisons, key=lambda c: c.change, reverse=True):
+        lines.append(f"{c.name:<56} {format_seconds(c.baseline):>11} {format_seconds(c.current):>11} "
+                     f"{c.change * 100:+7.1f}%  {c.status(threshold)}")
+    for name in missing:
+        lines.append(f"{name:<56} not run (in baseline only)")
+    for name in added:
+        lines.append(f"{name:<56} new (no baseline)")
+    return "\n".join(lines)
@@ -0,0 +1,120 @@
+"""Benchmark suite for the native and database hot paths, with JSON baselines and regression checks.
+
+    python benchmarks/run.py list [-k PATTERN ...]
+    python benchmarks/run.py run [-k PATTERN ...] [--quick] [-o results.json] [--save-baseline NAME]
+                                 [--compare BASELINE] [--threshold 0.10]
+    python benchmarks/run.py compare BASELINE CURRENT [--threshold 0.10]
+
+BASELINE and CURRENT are result files; a bare name such as ``main`` means
+benchmarks/baselines/main.json. Cases are compared on their median time per call. compare
+(and run --compare) exits 1 if any case is slower than its baseline by more than the
+threshold. Baselines are only meaningful on the machine that produced them.
+"""
+import argparse
+import sys
+
+import harness
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+EXIT_ERROR = 2
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def _report_comparison(baseline: dict, current: dict, threshold: float) -> int:
+    if baseline["machine"].get("platform") != current["machine"].get("platform") or \
+            baseline["machine"].get("cpu_count") != current["machine"].get("cpu_count"):
+        print("warning: baseline was recorded on a different machine; differences may not be regressions",
+              file=sys.stderr)
+    if baseline.get("quick") or current.get("quick"):
+        print("warning: quick runs are noisy; use full runs for baselines", file=sys.stderr)
+
+    comparisons, missing, added = harness.compare(baseline, current)
+    print(harness.format_comparison(comparisons, missing, added, threshold))
+    regressions = [c for c in comparisons if c.status(threshold) == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {threshold * 100:.0f}%")
+        return EXIT_REGRESSION
+    return EXIT_OK
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    for case in harness.expand_cases(harness.load_suites(), args.filter):
+        print(case.name)
+    return EXIT_OK
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    cases = harness.expand_cases(harness.load_suites(), args.filter)
+    if not cases:
+        print("error: no benchmarks match", file=sys.stderr)
+        return EXIT_ERROR
+    baseline = None
+    if args.compare:
+        try:
+            baseline = harness.load_results(harness.baseline_path(args.compare))
+        except (OSError, ValueError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return EXIT_ERROR
+
+    document = harness.run_cases(cases, quick=args.quick)
+
+    for path in filter(None, (args.output, args.save_baseline and harness.baseline_path(args.save_baseline))):
+        harness.save_results(document, path)
+        print(f"results written to {path}")
+
+    if baseline is not None:
+        print()
+        return _report_comparison(baseline, document, args.threshold)
+    return EXIT_OK
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    try:
+        baseline = harness.load_results(harness.baseline_path(args.baseline))
+        current = harness.load_results(harness.baseline_path(args.current))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    return _report_comparison(baseline, current, args.threshold)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = subparsers.add_parser("list", help="list benchmark cases")
+    list_cmd.add_argument("-k", "--filter", action="append", help="shell-style name pattern (repeatable)")
+    list_cmd.set_defaults(func=cmd_list)
+
+    run = subparsers.add_parser("run", help="run benchmarks")
+    run.add_argument("-k", "--filter", action="append", help="shell-style name pattern, e.g. 'native.*' (repeatable)")
+    run.add_argument("--quick", action="store_true", help="shorter, noisier samples for a smoke run")
+    run.add_argument("-o", "--output", help="write results to this JSON file")
+    run.add_argument("--save-baseline", metavar="NAME", help="write results as benchmarks/baselines/NAME.json")
+    run.add_argument("--compare", metavar="BASELINE", help="compare against a baseline after running")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                     help="relative slowdown counted as a regression (default: 0.10)")
+    run.set_defaults(func=cmd_run)
+
+    compare = subparsers.add_parser("compare", help="compare two result files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help="relative slowdown counted as a regression (default: 0.10)")
+    compare.set_defaults(func=cmd_compare)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "threshold", 0) < 0:
+        parser.error("--threshold must not be negative")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Database open latency and end-to-end authentication against a throwaway SQLCipher database."""
+import os
+import shutil
+import tempfile
+
+from harness import SkipBenchmark, benchmark
+
+DB_PASSWORD = "benchmark database password"
+USERNAME = "bench-user"
+USER_PASSWORD = "correct horse battery staple"
+
+
+def _database():
+    try:
+        from fintechx_desktop.infrastructure import database
+    except ImportError as e:
+        raise SkipBenchmark(f"database layer unavailable: {e}")
+    return database
+
+
+class _TemporaryDatabase:
+    """Points the database module at a fresh file in a temporary directory, then restores it."""
+
+    def __init__(self, database):
+        self.database = database
+        self.directory = tempfile.mkdtemp(prefix="fintechx-bench-")
+        self.path = os.path.join(self.directory, database.DATABASE_FILE)
+        self._saved = (database.DATABASE_PATH, database._pool)
+        database.DATABASE_PATH = self.path
+        database._pool = database.ConnectionPool(self.path)
+
+    def close(self):
+        self.database._pool.close()
+        self.database._key_cache.evict(self.path)
+        self.database.DATABASE_PATH, self.database._pool = self._saved
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@benchmark()
+def get_db_connection():
+    # Key already derived and cached, as for every open after login: measures the keyed open itself
+    database = _database()
+    db = _TemporaryDatabase(database)
+    try:
+        database.get_db_connection(DB_PASSWORD).close()
+        yield lambda: database.get_db_connection(DB_PASSWORD).close()
+    finally:
+        db.close()
+
+
+@benchmark()
+def get_db_connection_cold():
+    # First open of a session: PBKDF2 key derivation plus the keyed open
+    database = _database()
+    db = _TemporaryDatabase(database)
+    try:
+        database.get_db_connection(DB_PASSWORD).close()
+
+        def open_cold():
+            database._key_cache.evict(db.path)
+            database.get_db_connection(DB_PASSWORD).close()
+
+        yield open_cold
+    finally:
+        db.close()
+
+
+@benchmark()
+def pooled_connection():
+    database = _database()
+    db = _TemporaryDatabase(database)
+
+    def borrow():
+        with database.pooled_connection(DB_PASSWORD):
+            pass
+
+    try:
+        borrow()
+        yield borrow
+    finally:
+        db.close()
+
+
+@benchmark()
+def authenticate_user():
+    database = _database()
+    from fintechx_desktop.app import auth
+    db = _TemporaryDatabase(database)
+    try:
+        if not auth.create_user(DB_PASSWORD, USERNAME, USER_PASSWORD):
+            raise SkipBenchmark("could not create the benchmark user")
+        yield lambda: auth.authenticate_user(DB_PASSWORD, USERNAME, USER_PASSWORD)
+    finally:
+        db.close()
@@ -0,0 +1,89 @@
+"""Native module hot paths: Luhn, PAN generation, AES-GCM, PBKDF2, PAN scanning and BIN lookup."""
+import hashlib
+import os
+
+from harness import SkipBenchmark, benchmark
+
+PAYLOAD_SIZES = [64, 1024, 64 * 1024, 1024 * 1024]
+PBKDF2_ITERATIONS = [150000, 200000] # Database key and login password hashing
+PBKDF2_SALT = b"\x01" * 16
+TEST_PAN = "4111111111111111"
+
+
+def _native():
+    try:
+        from fintechx_desktop.infrastructure import fintechx_native
+    except ImportError:
+        raise SkipBenchmark("native module (fintechx_native) not built")
+    return fintechx_native
+
+
+@benchmark()
+def luhn_check():
+    native = _native()
+    return lambda: native.luhn_check(TEST_PAN)
+
+
+@benchmark(params={"rows": [1000000]}, items=lambda rows: rows, unit="PANs")
+def luhn_check_batch(rows):
+    native = _native()
+    pans = native.generate_pan_batch_array("4", 16, rows)
+    return lambda: native.luhn_check_batch(pans)
+
+
+@benchmark(params={"count": [100, 10000]}, items=lambda count: count, unit="PANs")
+def generate_pan_batch(count):
+    native = _native()
+    return lambda: native.generate_pan_batch("4", 16, count)
+
+
+@benchmark(params={"count": [1000000]}, items=lambda count: count, unit="PANs")
+def generate_pan_batch_bytes(count):
+    native = _native()
+    return lambda: native.generate_pan_batch_bytes("4", 16, count)
+
+
+@benchmark(params={"size": PAYLOAD_SIZES}, items=lambda size: size, unit="B")
+def encrypt_aes_gcm(size):
+    native = _native()
+    key, iv, plaintext = os.urandom(32), os.urandom(12), os.urandom(size)
+    return lambda: native.encrypt_aes_gcm(plaintext, key, iv)
+
+
+@benchmark(params={"size": PAYLOAD_SIZES}, items=lambda size: size, unit="B")
+def decrypt_aes_gcm(size):
+    native = _native()
+    key, iv = os.urandom(32), os.urandom(12)
+    sealed = native.encrypt_aes_gcm(os.urandom(size), key, iv)
+    return lambda: native.decrypt_aes_gcm(sealed, key, iv)
+
+
+@benchmark(params={"iterations": PBKDF2_ITERATIONS})
+def derive_key_pbkdf2(iterations):
+    native = _native()
+    return lambda: native.derive_key_pbkdf2("correct horse battery staple", PBKDF2_SALT, iterations, 32)
+
+
+@benchmark(params={"iterations": PBKDF2_ITERATIONS})
+def hashlib_pbkdf2_hmac(iterations):
+    # Reference point for derive_key_pbkdf2: same password, salt, iterations and output length
+    password = "correct horse battery staple".encode("utf-8")
+    return lambda: hashlib.pbkdf2_hmac("sha256", password, PBKDF2_SALT, iterations, 32)
+
+
+@benchmark(params={"size": [64 * 1024 * 1024]}, items=lambda size: size, unit="B")
+def mask_pans(size):
+    native = _native()
+    line = (b"2026-10-17 04:46:12,345 - fintechx_desktop.ui.virtual_terminal - INFO - "
+            b"Virtual terminal submission simulated for Visa PAN 4111 1111 1111 1111, Amount: 12.5 USD\n")
+    text = line * (size // len(line))
+    return lambda: native.mask_pans(text)
+
+
+@benchmark(params={"rows": [1000000]}, items=lambda rows: rows, unit="PANs")
+def bin_lookup_batch(rows):
+    native = _native()
+    from fintechx_desktop.infrastructure import bin_ranges
+    table = native.BinTable.from_csv(bin_ranges.DEFAULT_BIN_TABLE_PATH)
+    pans = native.generate_pan_batch_array("5", 16, rows)
+    return lambda: table.lookup_batch(pans)
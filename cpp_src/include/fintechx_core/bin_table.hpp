@@ -0,0 +1,118 @@
+#ifndef FINTECHX_CORE_BIN_TABLE_HPP
+#define FINTECHX_CORE_BIN_TABLE_HPP
+
+#include <cstddef>
+#include <cstdint>
+#include <istream>
+#include <string>
+#include <vector>
+
+namespace fintechx_core {
+
+/**
+ * @brief Attributes shared by every PAN in a BIN range.
+ */
+struct BinInfo {
+    std::string scheme;
+    std::string issuer;
+    uint32_t length_mask = 0; // Bit n set when a PAN of n digits is valid for the range
+};
+
+/**
+ * @brief One row of a BIN range source: an inclusive prefix range and its attributes.
+ *
+ * `low` and `high` are digit prefixes of 1 to 8 digits. They are widened to 8-digit keys,
+ * `low` padded with zeros and `high` with nines, so "4" to "4" covers every PAN starting with 4.
+ */
+struct BinRange {
+    std::string low;
+    std::string high;
+    BinInfo info;
+};
+
+/**
+ * @brief Read-only BIN (IIN) range index for classifying PANs by scheme, issuer and length.
+ *
+ * Ranges are flattened into a sorted array of disjoint 8-digit intervals. Where source ranges
+ * overlap, the narrower one wins (a specific issuer range inside a scheme-wide range), and
+ * between equal widths the later row wins. A direct table over all 10^6 six-digit prefixes
+ * resolves most PANs with a single load; only prefixes that an interval boundary splits fall
+ * back to a binary search over the 8-digit intervals.
+ *
+ * Lookups never modify the table, so one instance may be shared by any number of threads.
+ */
+class BinTable {
+public:
+    static constexpr int32_t not_found = -1;
+    static constexpr size_t key_digits = 8;
+
+    explicit BinTable(const std::vector<BinRange>& ranges);
+
+    /**
+     * @brief Parses CSV rows of `low,high,scheme,issuer,lengths`.
+     *
+     * `lengths` lists the valid PAN lengths separated by ';', each a single length or an
+     * inclusive `min-max` span (e.g. `16;19` or `12-19`). Blank lines, lines starting with '#'
+     * and a header row (first field not numeric) are skipped.
+     *
+     * @throws std::invalid_argument naming the line of the first malformed row.
+     */
+    static BinTable from_csv(std::istream& in);
+
+    /// Opens and parses a CSV file; throws std::runtime_error if it cannot be read.
+    static BinTable from_csv_file(const std::string& path);
+
+    /**
+     * @brief Finds the range holding a PAN, or the single range holding every PAN with a prefix.
+     *
+     * Only the first 8 digits are read. Shorter input is a bare prefix: it matches only when
+     * one range covers every PAN starting with it (e.g. "3" spans Amex, Diners and JCB, and
+     * "4" spans any issuer rows nested inside Visa's, so neither matches).
+     *
+     * @return The attribute id for info(), or not_found.
+     */
+    int32_t lookup(const char* pan, size_t length) const;
+
+    /**
+     * @brief Classifies fixed-width PAN rows read in place from a packed buffer.
+     *
+     * The row layout and padding rules match luhn_check_batch.
+     *
+     * @param ids Output of `rows` attribute ids (not_found where no range matches).
+     * @param length_ok Output of `rows` flags; 1 when the range allows the row's length.
+     * @param threads Worker threads; 0 uses every core.
+     */
+    void lookup_batch(
+        const char* data,
+        size_t rows,
+        size_t row_stride,
+        size_t width,
+        const int64_t* lengths,
+        int32_t* ids,
+        uint8_t* length_ok,
+        unsigned threads = 0) const;
+
+    const BinInfo& info(int32_t id) const { return infos_.at(static_cast<size_t>(id)); }
+    size_t info_count() const { return infos_.size(); }
+    size_t interval_count() const { return intervals_.size(); }
+
+private:
+    struct Interval {
+        uint32_t low;
+        uint32_t high;
+        int32_t info;
+    };
+
+    int32_t find(uint32_t key) const;
+    int32_t find_span(uint32_t low, uint32_t high) const;
+
+    std::vector<Interval> intervals_;
+    std::vector<BinInfo> infos_;
+    // Per 6-digit prefix: 0 for no range, id + 1 when one range covers the whole prefix, or
+    // kSplitPrefix | index of the first interval that reaches into the prefix
+    std::vector<uint32_t> prefix_table_;
+};
+
+} // namespace fintechx_core
+
+#endif // FINTECHX_CORE_BIN_TABLE_HPP
@@ -1,12 +1,24 @@
 #ifndef FINTECHX_CORE_ENCRYPTION_UTILS_HPP
 #define FINTECHX_CORE_ENCRYPTION_UTILS_HPP
 
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <stdexcept>
 #include <string>
 #include <vector>
 #include <optional>
 
 namespace fintechx_core {
 
+/**
+ * @brief A read-only view of caller-owned bytes.
+ */
+struct ByteSpan {
+    const unsigned char* data;
+    size_t size;
+};
+
 /**
  * @brief Encrypts plaintext data using AES-256-GCM.
  *
@@ -44,6 +56,27 @@ std::optional<std::vector<unsigned char>> decrypt_aes_gcm(
     const std::vector<unsigned char>& aad = {}
 );
 
+/**
+ * @brief Encrypts with AES-256-GCM straight from caller-owned memory into a caller-owned buffer.
+ *
+ * Same semantics as encrypt_aes_gcm without any intermediate copies.
+ *
+ * @param out Destination of at least plaintext.size + 16 bytes; receives ciphertext followed by the tag.
+ * @return true on success, false on invalid key/IV sizes or an OpenSSL failure.
+ */
+bool encrypt_aes_gcm_into(ByteSpan plaintext, ByteSpan key, ByteSpan iv, ByteSpan aad, unsigned char* out);
+
+/**
+ * @brief Decrypts AES-256-GCM straight from caller-owned memory into a caller-owned buffer.
+ *
+ * Same semantics as decrypt_aes_gcm without any intermediate copies.
+ *
+ * @param out Destination of at least ciphertext_with_tag.size - 16 bytes. If authentication fails,
+ *            those bytes are zeroed.
+ * @return true if decryption and authentication succeed, false otherwise.
+ */
+bool decrypt_aes_gcm_into(ByteSpan ciphertext_with_tag, ByteSpan key, ByteSpan iv, ByteSpan aad, unsigned char* out);
+
 /**
  * @brief Generates a cryptographically secure random byte vector.
  *
@@ -73,6 +106,271 @@ std::vector<unsigned char> derive_key_pbkdf2(
     size_t key_length
 );
 
+/**
+ * @brief Derives a subkey from high-entropy key material using HKDF-SHA256 (RFC 5869).
+ *
+ * Use it to split one master key into independent keys for separate purposes, distinguished
+ * by `info`. Not a password KDF: `ikm` must already be uniformly random (e.g. a PBKDF2 output).
+ *
+ * @throws std::runtime_error if derivation fails.
+ */
+std::vector<unsigned char> derive_key_hkdf(
+    const std::vector<unsigned char>& ikm,
+    const std::vector<unsigned char>& salt,
+    const std::vector<unsigned char>& info,
+    size_t key_length
+);
+
+/**
+ * @brief Encrypts many messages under one key with AES-256-GCM.
+ *
+ * Each worker thread initialises a single cipher context with the key and only resets the IV
+ * per message. Does not touch the Python runtime, so callers may release the GIL around it.
+ *
+ * @param key The 256-bit (32 bytes) encryption key.
+ * @param plaintexts The messages to encrypt.
+ * @param ivs One 96-bit (12 bytes) IV per message. Each must be unique under the key.
+ * @param aads No AAD (empty), one AAD shared by every message, or one AAD per message.
+ * @param out Destination of at least sum(plaintext sizes) + 16 * count bytes. Message i is written as
+ *            ciphertext followed by its 16-byte tag, directly after message i - 1.
+ * @param threads Maximum number of worker threads (0 uses the hardware concurrency).
+ * @return true on success, false on invalid sizes or an OpenSSL failure.
+ */
+bool encrypt_aes_gcm_batch(
+    const std::vector<unsigned char>& key,
+    const std::vector<ByteSpan>& plaintexts,
+    const std::vector<ByteSpan>& ivs,
+    const std::vector<ByteSpan>& aads,
+    unsigned char* out,
+    unsigned threads = 0
+);
+
+/**
+ * @brief Decrypts many AES-256-GCM messages under one key.
+ *
+ * @param key The 256-bit (32 bytes) encryption key.
+ * @param ciphertexts_with_tag The messages to decrypt, each with its 16-byte tag appended.
+ * @param ivs One 96-bit (12 bytes) IV per message.
+ * @param aads No AAD (empty), one AAD shared by every message, or one AAD per message.
+ * @param out Destination of at least sum(ciphertext sizes) - 16 * count bytes, packed like the inputs
+ *            minus their tags. Messages shorter than a tag take no space.
+ * @param ok Receives one entry per message: 1 if it authenticated, 0 otherwise. Output bytes of
+ *           messages that failed authentication are zeroed.
+ * @param threads Maximum number of worker threads (0 uses the hardware concurrency).
+ * @return true if the batch ran, false on invalid sizes or an OpenSSL setup failure.
+ */
+bool decrypt_aes_gcm_batch(
+    const std::vector<unsigned char>& key,
+    const std::vector<ByteSpan>& ciphertexts_with_tag,
+    const std::vector<ByteSpan>& ivs,
+    const std::vector<ByteSpan>& aads,
+    unsigned char* out,
+    uint8_t* ok,
+    unsigned threads = 0
+);
+
+/**
+ * @brief Computes HMAC-SHA256 of many messages under one key, truncated to `out_len` bytes each.
+ *
+ * The keyed inner and outer hash states are computed once and copied per message, so each
+ * MAC costs two short SHA-256 runs. Output for message i is written to out[i * out_len].
+ *
+ * @param out_len Bytes kept per MAC (1 to 32).
+ * @param threads Worker threads to use; 0 picks the hardware concurrency.
+ * @return true on success, false if out_len is out of range or OpenSSL fails.
+ */
+bool hmac_sha256_batch(
+    const std::vector<unsigned char>& key,
+    const std::vector<ByteSpan>& messages,
+    size_t out_len,
+    unsigned char* out,
+    unsigned threads = 0
+);
+
+/**
+ * @brief AES-256-GCM cipher bound to one key, with IVs managed internally.
+ *
+ * The key schedule is expanded once into long-lived OpenSSL contexts and the raw key copy
+ * is wiped; the contexts' key material is cleansed on destruction. Every message gets a
+ * fresh IV:
+ *
+ *  - Random (default): 96 random bits per message. Encryption refuses to run once this
+ *    instance has used 2^32 IVs (NIST SP 800-38D). The budget is per instance: messages other
+ *    instances or processes encrypt under the same key count against the same NIST limit but
+ *    are not tracked here.
+ *  - Counter: IV = 4-byte prefix || 64-bit big-endian counter. The caller supplies the prefix
+ *    and the first counter value, and must guarantee that no other instance, now or in the
+ *    past, uses the same key with the same prefix over an overlapping counter range, e.g. by
+ *    persisting next_counter() and resuming from it. Nothing here can detect reuse across
+ *    instances, and a repeated IV under GCM reveals plaintext and the authentication key.
+ *
+ * Sealed messages are laid out as IV (12 bytes) || ciphertext || tag (16 bytes).
+ * Methods are safe to call from several threads.
+ */
+class AesGcmCipher {
+public:
+    enum class IvMode { Random, Counter };
+
+    /// Bytes a sealed message adds to its plaintext (IV + tag).
+    static constexpr size_t overhead = 12 + 16;
+
+    /**
+     * @param key The 256-bit (32 bytes) key. Taken by value and wiped once the contexts are set up.
+     * @param mode How IVs are produced.
+     * @param iv_prefix Counter mode only: the 4-byte IV prefix reserved for this instance.
+     * @param counter_start Counter mode only: the first counter value to use.
+     * @throws std::invalid_argument if the key is not 32 bytes, counter mode lacks a 4-byte prefix,
+     *         or random mode is given a prefix or counter.
+     * @throws std::runtime_error if OpenSSL fails to initialise.
+     */
+    explicit AesGcmCipher(std::vector<unsigned char> key, IvMode mode = IvMode::Random,
+                          ByteSpan iv_prefix = {nullptr, 0}, uint64_t counter_start = 0);
+    ~AesGcmCipher();
+
+    AesGcmCipher(const AesGcmCipher&) = delete;
+    AesGcmCipher& operator=(const AesGcmCipher&) = delete;
+
+    /**
+     * @brief Seals plaintext into `out`, which must hold plaintext.size + overhead bytes.
+     * @throws std::runtime_error if the IV budget is exhausted or OpenSSL fails.
+     */
+    void encrypt_into(ByteSpan plaintext, ByteSpan aad, unsigned char* out);
+
+    /**
+     * @brief Opens a sealed message into `out`, which must hold sealed.size - overhead bytes.
+     * @return false if the message is too short or fails authentication. On an authentication
+     *         failure the bytes written to `out` are zeroed.
+     */
+    bool decrypt_into(ByteSpan sealed, ByteSpan aad, unsigned char* out);
+
+    std::vector<unsigned char> encrypt(ByteSpan plaintext, ByteSpan aad = {nullptr, 0});
+    std::optional<std::vector<unsigned char>> decrypt(ByteSpan sealed, ByteSpan aad = {nullptr, 0});
+
+    /// Messages this instance can still encrypt before it refuses to (see the class notes on scope).
+    uint64_t messages_remaining() const;
+
+    /// Counter mode: the counter the next message will use; persist it to resume without reuse.
+    uint64_t next_counter() const;
+
+private:
+    struct Impl;
+    std::unique_ptr<Impl> impl_;
+};
+
+/**
+ * @brief Raised when an encrypted stream is tampered with, truncated, reordered or malformed.
+ */
+class GcmAuthenticationError : public std::runtime_error {
+public:
+    using std::runtime_error::runtime_error;
+};
+
+/**
+ * @brief Encrypts an unbounded byte stream as a sequence of independently authenticated AES-256-GCM frames.
+ *
+ * Stream format (all integers big-endian):
+ *
+ *     header:  magic "FXS1" (4) | chunk_size u32 (4) | stream_id (8 random bytes)
+ *     frame:   flags (1) | length u32 (4) | nonce (12) | ciphertext (length) | tag (16)
+ *
+ * Every frame but the last holds exactly chunk_size plaintext bytes; the last holds 0..chunk_size
+ * bytes and has flag 0x01 set. The nonce of frame i is stream_id || u32(i), and each frame's AAD is
+ * the 16-byte header followed by its flags byte. Reordered, dropped or spliced frames therefore fail
+ * authentication, and a stream cut at a frame boundary is detected by the missing final flag.
+ *
+ * Memory use is bounded by one chunk regardless of stream length.
+ */
+class GcmStreamEncryptor {
+public:
+    static constexpr size_t header_size = 16;
+    static constexpr size_t frame_overhead = 1 + 4 + 12 + 16;
+    static constexpr size_t default_chunk_size = 64 * 1024;
+    static constexpr size_t max_chunk_size = 16 * 1024 * 1024;
+
+    /**
+     * @param key The 256-bit (32 bytes) key. Taken by value and wiped once the context is set up.
+     * @param chunk_size Plaintext bytes per frame (1 byte to 16 MiB).
+     * @throws std::invalid_argument on a bad key or chunk size.
+     */
+    explicit GcmStreamEncryptor(std::vector<unsigned char> key, size_t chunk_size = default_chunk_size);
+    ~GcmStreamEncryptor();
+
+    GcmStreamEncryptor(const GcmStreamEncryptor&) = delete;
+    GcmStreamEncryptor& operator=(const GcmStreamEncryptor&) = delete;
+
+    /// Appends the header (first call only) and every frame completed by `data` to `out`.
+    void update(ByteSpan data, std::vector<unsigned char>& out);
+
+    /// Appends the final frame to `out`. No further calls are allowed.
+    void finalize(std::vector<unsigned char>& out);
+
+    size_t chunk_size() const;
+
+private:
+    void seal_frame(ByteSpan chunk, bool final, std::vector<unsigned char>& out);
+
+    struct Impl;
+    std::unique_ptr<Impl> impl_;
+};
+
+/**
+ * @brief Decrypts a stream produced by GcmStreamEncryptor.
+ *
+ * Plaintext is only released once its frame has authenticated. Callers must still treat the
+ * output as untrusted until finalize() returns, since a truncated stream is only detected there.
+ */
+class GcmStreamDecryptor {
+public:
+    /**
+     * @param key The 256-bit (32 bytes) key. Taken by value and wiped once the context is set up.
+     * @throws std::invalid_argument if the key is not 32 bytes.
+     */
+    explicit GcmStreamDecryptor(std::vector<unsigned char> key);
+    ~GcmStreamDecryptor();
+
+    GcmStreamDecryptor(const GcmStreamDecryptor&) = delete;
+    GcmStreamDecryptor& operator=(const GcmStreamDecryptor&) = delete;
+
+    /**
+     * @brief Appends the plaintext of every frame completed by `data` to `out`.
+     * @throws GcmAuthenticationError if a frame is malformed, out of order or fails authentication.
+     */
+    void update(ByteSpan data, std::vector<unsigned char>& out);
+
+    /**
+     * @brief Confirms the stream ended with its final frame.
+     * @throws GcmAuthenticationError if the stream is truncated.
+     */
+    void finalize();
+
+private:
+    size_t frame_size(const unsigned char* frame) const;
+    void open_frame(const unsigned char* frame, std::vector<unsigned char>& out);
+
+    struct Impl;
+    std::unique_ptr<Impl> impl_;
+};
+
+/**
+ * @brief Encrypts a file of any size with GcmStreamEncryptor in constant memory.
+ *
+ * Output is written to `dst` + ".part" and renamed to `dst` only on success.
+ *
+ * @throws std::runtime_error on I/O failure; std::invalid_argument on a bad key or chunk size.
+ */
+void encrypt_file(const std::string& src, const std::string& dst, std::vector<unsigned char> key,
+                  size_t chunk_size = GcmStreamEncryptor::default_chunk_size);
+
+/**
+ * @brief Decrypts a file produced by encrypt_file in constant memory.
+ *
+ * Output is written to `dst` + ".part" and renamed to `dst` only once the whole stream,
+ * including its final frame, has authenticated; on failure the partial output is removed.
+ *
+ * @throws GcmAuthenticationError if the file is tampered with or truncated; std::runtime_error on I/O failure.
+ */
+void decrypt_file(const std::string& src, const std::string& dst, std::vector<unsigned char> key);
+
 }
 
 #endif // FINTECHX_CORE_ENCRYPTION_UTILS_HPP
@@ -1,6 +1,9 @@
 #ifndef FINTECHX_CORE_PAN_UTILS_HPP
 #define FINTECHX_CORE_PAN_UTILS_HPP
 
+#include <cstddef>
+#include <cstdint>
+#include <map>
 #include <string>
 #include <vector>
 #include <optional>
@@ -15,6 +18,60 @@ namespace fintechx_core {
  */
 bool luhn_check(const std::string& pan);
 
+/**
+ * @brief Validates a batch of fixed-width PAN rows using the Luhn algorithm.
+ *
+ * Rows are read in place from a packed buffer, so no per-PAN strings are allocated.
+ * When no lengths are supplied, trailing NUL and space bytes are treated as padding
+ * (the layout of a NumPy `S19` array or a space-padded fixed-width file).
+ *
+ * @param data Pointer to the first byte of the first row.
+ * @param rows The number of rows in the buffer.
+ * @param row_stride The distance in bytes between the starts of consecutive rows.
+ * @param width The maximum number of bytes to read from each row.
+ * @param lengths Optional per-row PAN lengths (nullptr to detect padding). Lengths are clamped to width.
+ * @param results Output array of `rows` entries; set to 1 for a valid PAN, 0 otherwise.
+ */
+void luhn_check_batch(
+    const char* data,
+    size_t rows,
+    size_t row_stride,
+    size_t width,
+    const int64_t* lengths,
+    uint8_t* results
+);
+
+/**
+ * @brief Returns the name of the Luhn batch kernel selected for this CPU.
+ *
+ * @return "avx2", "ssse3" or "scalar".
+ */
+const char* luhn_batch_kernel();
+
+/**
+ * @brief Validates newline-delimited PANs read in place from a text buffer.
+ *
+ * Each line is one row, so blank or malformed lines yield `false` and row numbers stay aligned
+ * with line numbers. Trailing '\r' and space bytes are ignored. Unless `final` is set, a last
+ * line without a newline is left unconsumed so streaming callers can prepend it to the next block.
+ *
+ * @param data Pointer to the text.
+ * @param size The number of bytes available at `data`.
+ * @param final Whether `data` ends the stream (an unterminated last line is then validated too).
+ * @param max_rows Stop after this many rows.
+ * @param results Receives one entry per row (1 valid, 0 invalid), appended.
+ * @param line_offsets Optional; receives the byte offset of each row's first byte, appended.
+ * @return The number of bytes consumed.
+ */
+size_t luhn_check_lines(
+    const char* data,
+    size_t size,
+    bool final,
+    size_t max_rows,
+    std::vector<uint8_t>& results,
+    std::vector<uint64_t>* line_offsets = nullptr
+);
+
 /**
  * @brief Generates a single valid PAN based on a prefix and desired length.
  *
@@ -37,6 +94,178 @@ std::optional<std::string> generate_pan(const std::string& prefix, int length);
  */
 std::vector<std::string> generate_pan_batch(const std::string& prefix, int length, int count);
 
+/**
+ * @brief Generates a batch of valid PANs into a packed, caller-owned buffer.
+ *
+ * PANs are written back to back with no separators, `length` bytes each. Large batches are
+ * split across worker threads, each with its own RNG seeded once from the OS entropy source.
+ * Does not touch the Python runtime, so callers may release the GIL around it.
+ *
+ * @param prefix The starting digits for all PANs in the batch.
+ * @param length The total desired length for each PAN.
+ * @param count The number of PANs to generate.
+ * @param out Destination buffer of at least `count * length` bytes.
+ * @param threads Maximum number of worker threads (0 uses the hardware concurrency).
+ * @return true on success, false if prefix or length are invalid (nothing is written).
+ */
+bool generate_pan_batch_into(
+    const std::string& prefix,
+    int length,
+    size_t count,
+    char* out,
+    unsigned threads = 0
+);
+
+/**
+ * @brief Generates a batch of distinct valid PANs into a packed, caller-owned buffer.
+ *
+ * Account numbers (the digits between prefix and check digit) are drawn from a random keyed
+ * permutation of the account space, so PANs in a batch never repeat and no dedup set of the
+ * batch is kept. Only the caller's exclusions are held in memory, as 64-bit integers.
+ *
+ * @param prefix The starting digits for all PANs in the batch.
+ * @param length The total desired length for each PAN.
+ * @param count The number of PANs to generate.
+ * @param out Destination buffer of at least `count * length` bytes.
+ * @param exclude PANs that must not be generated. Entries with another prefix or length are ignored.
+ * @param threads Maximum number of worker threads (0 uses the hardware concurrency).
+ * @throws std::invalid_argument if prefix or length are invalid, or the account number exceeds 18 digits.
+ * @throws std::length_error if count exceeds the PANs left under the prefix and length.
+ */
+void generate_unique_pan_batch_into(
+    const std::string& prefix,
+    int length,
+    size_t count,
+    char* out,
+    const std::vector<std::string>& exclude = {},
+    unsigned threads = 0
+);
+
+/**
+ * @brief Valid/invalid row counts for one bucket of a PAN file report.
+ */
+struct PanScanStats {
+    uint64_t valid = 0;
+    uint64_t invalid = 0;
+};
+
+/**
+ * @brief Result of scanning a PAN file buffer with scan_pan_buffer.
+ */
+struct PanFileReport {
+    uint64_t rows = 0;
+    uint64_t valid = 0;
+    std::vector<uint64_t> invalid_rows;    ///< Zero-based row numbers of invalid rows (capped)
+    std::vector<uint64_t> invalid_offsets; ///< Byte offsets of the same rows
+    /// (IIN, PAN length) -> counts. Rows without a numeric IIN use an empty IIN string.
+    std::map<std::pair<std::string, int>, PanScanStats> breakdown;
+};
+
+/**
+ * @brief Validates every PAN in a newline- or fixed-width-delimited buffer across worker threads.
+ *
+ * Designed for memory-mapped files: rows are read in place, the buffer is split on row
+ * boundaries between workers, and no per-row strings are created. Does not touch the
+ * Python runtime, so callers may release the GIL around it.
+ *
+ * @param data Pointer to the file contents.
+ * @param size The number of bytes at `data`.
+ * @param record_width Fixed record size in bytes, or 0 for newline-delimited rows. Trailing
+ *        NUL, space, '\r' and '\n' bytes within a record are treated as padding.
+ * @param iin_digits Number of leading digits grouped as the IIN in the breakdown (1-8).
+ * @param max_invalid Maximum number of invalid rows whose positions are recorded.
+ * @param threads Maximum number of worker threads (0 uses the hardware concurrency).
+ * @return The aggregated report.
+ * @throws std::invalid_argument if iin_digits is out of range.
+ */
+PanFileReport scan_pan_buffer(
+    const char* data,
+    size_t size,
+    size_t record_width = 0,
+    size_t iin_digits = 6,
+    size_t max_invalid = 1000,
+    unsigned threads = 0
+);
+
+/**
+ * @brief Byte range [begin, end) of a PAN found in free text, including any separators.
+ */
+struct PanMatch {
+    size_t begin;
+    size_t end;
+};
+
+/**
+ * @brief Which digits of a detected PAN stay readable when it is masked.
+ */
+struct PanMaskOptions {
+    size_t keep_first = 0; ///< Leading digits left in clear (at most 6)
+    size_t keep_last = 4;  ///< Trailing digits left in clear (at most 4)
+    char mask_char = '*';
+};
+
+/**
+ * @brief Finds PANs in free text (log lines, messages, exception text) in a single pass.
+ *
+ * A PAN is a Luhn-valid run of 13-19 digits, not adjacent to another digit, whose digits may
+ * be grouped by single spaces or dashes ("4111 1111 1111 1111", "4111-1111-1111-1111").
+ * When a grouped run fails as a whole, every valid span of whole groups is found instead and
+ * overlapping spans are merged, so a PAN after an unrelated number ("ref 12 4111 1111 1111 1111")
+ * is still covered in full; the match may then include the neighbouring number.
+ * Ungrouped runs longer than 19 digits are treated as other identifiers and ignored.
+ *
+ * @param data Pointer to the text (any ASCII-compatible encoding, e.g. UTF-8).
+ * @param size The number of bytes at `data`.
+ * @param final Whether `data` ends the stream. Unless set, a digit run touching the end of the
+ *        buffer is left unconsumed so streaming callers can complete it with the next block.
+ * @param matches Receives the matches, appended in order.
+ * @return The number of bytes fully scanned (all of `size` when final is set).
+ */
+size_t find_pans(const char* data, size_t size, bool final, std::vector<PanMatch>& matches);
+
+/**
+ * @brief Masks the given find_pans matches of `data` in place, without scanning it again.
+ *
+ * @throws std::invalid_argument if the options keep more digits than allowed.
+ */
+void mask_matches(char* data, const std::vector<PanMatch>& matches, const PanMaskOptions& options = {});
+
+/**
+ * @brief Masks every PAN found by find_pans in place, keeping separators and the configured digits.
+ *
+ * @return The number of PANs masked.
+ * @throws std::invalid_argument if the options keep more digits than allowed.
+ */
+size_t mask_pans(char* data, size_t size, const PanMaskOptions& options = {});
+
+/**
+ * @brief Streaming PAN masker for text arriving in arbitrary blocks.
+ *
+ * Each block is scanned once; only a trailing digit run that may continue into the next block
+ * is held back, so a PAN split across blocks is still masked.
+ */
+class PanScrubber {
+public:
+    explicit PanScrubber(const PanMaskOptions& options = {});
+
+    /// Scrubs the next block, appending whatever output is ready to `out`.
+    void feed(const char* data, size_t size, std::string& out);
+
+    /// Flushes the held-back tail at the end of the stream.
+    void finish(std::string& out);
+
+    /// PANs masked so far.
+    uint64_t matches() const { return matches_; }
+
+private:
+    void emit(size_t consumed, std::string& out);
+
+    PanMaskOptions options_;
+    std::string pending_;
+    std::vector<PanMatch> found_;
+    uint64_t matches_ = 0;
+};
+
 }
 
 #endif // FINTECHX_CORE_PAN_UTILS_HPP
@@ -0,0 +1,304 @@
+#include "fintechx_core/bin_table.hpp"
+#include <algorithm>
+#include <fstream>
+#include <map>
+#include <stdexcept>
+#include <thread>
+
+namespace fintechx_core {
+
+namespace {
+
+constexpr uint32_t kKeySpace = 100000000;   // 10^8 eight-digit keys
+constexpr uint32_t kPrefixCount = 1000000;  // 10^6 six-digit prefixes
+constexpr uint32_t kKeysPerPrefix = kKeySpace / kPrefixCount;
+constexpr uint32_t kSplitPrefix = 0x80000000u;
+constexpr uint32_t kMaxPanLength = 31;
+constexpr size_t kMinRowsPerWorker = 1 << 16;
+
+// Widens a 1-8 digit prefix to an 8-digit key, padding with `fill`
+uint32_t widen_prefix(const std::string& prefix, char fill) {
+    if (prefix.empty() || prefix.size() > BinTable::key_digits) {
+        throw std::invalid_argument("BIN prefixes must have 1 to 8 digits: '" + prefix + "'");
+    }
+    uint32_t key = 0;
+    for (size_t i = 0; i < BinTable::key_digits; ++i) {
+        char c = i < prefix.size() ? prefix[i] : fill;
+        if (c < '0' || c > '9') {
+            throw std::invalid_argument("BIN prefixes must be numeric: '" + prefix + "'");
+        }
+        key = key * 10 + static_cast<uint32_t>(c - '0');
+    }
+    return key;
+}
+
+std::string trim(const std::string& s) {
+    size_t begin = s.find_first_not_of(" \t\r\"");
+    if (begin == std::string::npos) {
+        return std::string();
+    }
+    size_t end = s.find_last_not_of(" \t\r\"");
+    return s.substr(begin, end - begin + 1);
+}
+
+std::vector<std::string> split(const std::string& s, char sep) {
+    std::vector<std::string> fields;
+    size_t start = 0;
+    while (true) {
+        size_t pos = s.find(sep, start);
+        fields.push_back(trim(s.substr(start, pos == std::string::npos ? std::string::npos : pos - start)));
+        if (pos == std::string::npos) {
+            return fields;
+        }
+        start = pos + 1;
+    }
+}
+
+uint32_t parse_length(const std::string& s) {
+    if (s.empty() || s.size() > 2 || !std::all_of(s.begin(), s.end(), [](char c) { return c >= '0' && c <= '9'; })) {
+        throw std::invalid_argument("invalid PAN length '" + s + "'");
+    }
+    uint32_t n = static_cast<uint32_t>(std::stoul(s));
+    if (n == 0 || n > kMaxPanLength) {
+        throw std::invalid_argument("PAN length out of range: " + s);
+    }
+    return n;
+}
+
+// "16", "16;19" or "12-19" -> bit mask of allowed lengths
+uint32_t parse_length_mask(const std::string& field) {
+    uint32_t mask = 0;
+    for (const std::string& part : split(field, ';')) {
+        size_t dash = part.find('-');
+        uint32_t lo = parse_length(trim(part.substr(0, dash)));
+        uint32_t hi = dash == std::string::npos ? lo : parse_length(trim(part.substr(dash + 1)));
+        if (hi < lo) {
+            throw std::invalid_argument("empty PAN length span '" + part + "'");
+        }
+        for (uint32_t n = lo; n <= hi; ++n) {
+            mask |= 1u << n;
+        }
+    }
+    return mask;
+}
+
+// 8-digit key of a PAN: its first 8 bytes, zero-padded when shorter. Returns false on a non-digit.
+inline bool pan_key(const char* pan, size_t length, uint32_t& key) {
+    uint32_t k = 0;
+    unsigned bad = 0;
+    for (size_t i = 0; i < BinTable::key_digits; ++i) {
+        unsigned d = i < length ? static_cast<unsigned char>(pan[i] - '0') : 0;
+        bad |= d > 9;
+        k = k * 10 + d;
+    }
+    key = k;
+    return !bad;
+}
+
+// Strips trailing padding exactly as luhn_check_batch does
+inline size_t row_length(const char* row, size_t width, const int64_t* lengths, size_t r) {
+    if (lengths) {
+        int64_t len = lengths[r];
+        return len <= 0 ? 0 : std::min(static_cast<size_t>(len), width);
+    }
+    size_t n = width;
+    while (n > 0 && (row[n - 1] == '\0' || row[n - 1] == ' ')) {
+        --n;
+    }
+    return n;
+}
+
+} // namespace
+
+BinTable::BinTable(const std::vector<BinRange>& ranges) {
+    struct Painted {
+        uint32_t low;
+        uint32_t high;
+        size_t row;
+    };
+    std::vector<Painted> order;
+    order.reserve(ranges.size());
+    for (size_t i = 0; i < ranges.size(); ++i) {
+        uint32_t low = widen_prefix(ranges[i].low, '0');
+        uint32_t high = widen_prefix(ranges[i].high, '9');
+        if (high < low) {
+            throw std::invalid_argument("BIN range ends before it starts: " + ranges[i].low + "-" + ranges[i].high);
+        }
+        order.push_back({low, high, i});
+        infos_.push_back(ranges[i].info);
+    }
+
+    // Paint widest ranges first so narrower ones overwrite them; stable keeps row order among equals
+    std::stable_sort(order.begin(), order.end(), [](const Painted& a, const Painted& b) {
+        return (a.high - a.low) > (b.high - b.low);
+    });
+
+    // Piecewise-constant map over the key space: segment start -> range row (or not_found)
+    std::map<uint32_t, int32_t> segments{{0, not_found}, {kKeySpace, not_found}};
+    for (const Painted& p : order) {
+        auto after = std::prev(segments.upper_bound(p.high + 1));
+        if (after->first != p.high + 1) {
+            segments.emplace(p.high + 1, after->second);
+        }
+        segments.erase(segments.upper_bound(p.low), segments.find(p.high + 1));
+        segments[p.low] = static_cast<int32_t>(p.row);
+    }
+
+    for (auto it = segments.begin(); std::next(it) != segments.end(); ++it) {
+        if (it->second == not_found) {
+            continue;
+        }
+        uint32_t high = std::next(it)->first - 1;
+        if (!intervals_.empty() && intervals_.back().info == it->second && intervals_.back().high + 1 == it->first) {
+            intervals_.back().high = high;
+        } else {
+            intervals_.push_back({it->first, high, it->second});
+        }
+    }
+
+    prefix_table_.assign(kPrefixCount, 0);
+    size_t next = 0;
+    for (uint32_t prefix = 0; prefix < kPrefixCount; ++prefix) {
+        uint32_t first = prefix * kKeysPerPrefix;
+        uint32_t last = first + kKeysPerPrefix - 1;
+        while (next < intervals_.size() && intervals_[next].high < first) {
+            ++next;
+        }
+        if (next == intervals_.size() || intervals_[next].low > last) {
+            continue;
+        }
+        const Interval& iv = intervals_[next];
+        if (iv.low <= first && iv.high >= last) {
+            prefix_table_[prefix] = static_cast<uint32_t>(iv.info) + 1;
+        } else {
+            prefix_table_[prefix] = kSplitPrefix | static_cast<uint32_t>(next);
+        }
+    }
+}
+
+BinTable BinTable::from_csv(std::istream& in) {
+    std::vector<BinRange> ranges;
+    std::string line;
+    size_t line_no = 0;
+    while (std::getline(in, line)) {
+        ++line_no;
+        std::string stripped = trim(line);
+        if (stripped.empty() || stripped[0] == '#') {
+            continue;
+        }
+        std::vector<std::string> fields = split(line, ',');
+        if (ranges.empty() && !fields[0].empty() && (fields[0][0] < '0' || fields[0][0] > '9')) {
+            continue; // Header row
+        }
+        try {
+            if (fields.size() != 5) {
+                throw std::invalid_argument("expected 5 fields (low,high,scheme,issuer,lengths), got " +
+                                            std::to_string(fields.size()));
+            }
+            BinRange range{fields[0], fields[1], {fields[2], fields[3], parse_length_mask(fields[4])}};
+            widen_prefix(range.low, '0');
+            widen_prefix(range.high, '9');
+            ranges.push_back(std::move(range));
+        } catch (const std::invalid_argument& e) {
+            throw std::invalid_argument("BIN table line " + std::to_string(line_no) + ": " + e.what());
+        }
+    }
+    return BinTable(ranges);
+}
+
+BinTable BinTable::from_csv_file(const std::string& path) {
+    std::ifstream in(path);
+    if (!in) {
+        throw std::runtime_error("cannot open BIN table: " + path);
+    }
+    return from_csv(in);
+}
+
+int32_t BinTable::find(uint32_t key) const {
+    uint32_t slot = prefix_table_[key / kKeysPerPrefix];
+    if (!(slot & kSplitPrefix)) {
+        return static_cast<int32_t>(slot) - 1;
+    }
+    // Boundary inside this prefix: binary search the (few) intervals that start at or after `slot`
+    size_t first = slot & ~kSplitPrefix;
+    size_t last = std::min(intervals_.size(), first + kKeysPerPrefix);
+    auto begin = intervals_.begin() + first;
+    auto end = std::upper_bound(begin, intervals_.begin() + last, key,
+                                [](uint32_t k, const Interval& iv) { return k < iv.low; });
+    if (end == begin) {
+        return not_found;
+    }
+    const Interval& iv = *std::prev(end);
+    return key <= iv.high ? iv.info : not_found;
+}
+
+// The range covering all of [low, high], if a single interval does
+int32_t BinTable::find_span(uint32_t low, uint32_t high) const {
+    auto end = std::upper_bound(intervals_.begin(), intervals_.end(), low,
+                                [](uint32_t k, const Interval& iv) { return k < iv.low; });
+    if (end == intervals_.begin()) {
+        return not_found;
+    }
+    const Interval& iv = *std::prev(end);
+    return high <= iv.high ? iv.info : not_found;
+}
+
+int32_t BinTable::lookup(const char* pan, size_t length) const {
+    uint32_t key;
+    if (length == 0 || !pan_key(pan, length, key)) {
+        return not_found;
+    }
+    if (length >= key_digits) {
+        return find(key);
+    }
+    // A bare prefix stands for every key from prefix000... to prefix999...
+    uint32_t span = 1;
+    for (size_t i = length; i < key_digits; ++i) {
+        span *= 10;
+    }
+    return find_span(key, key + span - 1);
+}
+
+void BinTable::lookup_batch(
+    const char* data,
+    size_t rows,
+    size_t row_stride,
+    size_t width,
+    const int64_t* lengths,
+    int32_t* ids,
+    uint8_t* length_ok,
+    unsigned threads) const {
+    auto classify = [&](size_t begin, size_t end) {
+        for (size_t r = begin; r < end; ++r) {
+            const char* row = data + r * row_stride;
+            size_t n = row_length(row, width, lengths, r);
+            int32_t id = lookup(row, n);
+            ids[r] = id;
+            length_ok[r] = id != not_found && n <= kMaxPanLength && ((infos_[id].length_mask >> n) & 1u);
+        }
+    };
+
+    if (threads == 0) {
+        threads = std::max(1u, std::thread::hardware_concurrency());
+    }
+    size_t workers = std::min<size_t>(threads, std::max<size_t>(1, rows / kMinRowsPerWorker));
+    if (workers <= 1) {
+        classify(0, rows);
+        return;
+    }
+
+    std::vector<std::thread> pool;
+    pool.reserve(workers - 1);
+    size_t per_worker = (rows + workers - 1) / workers;
+    for (size_t w = 1; w < workers; ++w) {
+        size_t begin = std::min(rows, w * per_worker);
+        size_t end = std::min(rows, begin + per_worker);
+        pool.emplace_back([&classify, begin, end] { classify(begin, end); });
+    }
+    classify(0, std::min(rows, per_worker));
+    for (auto& worker : pool) {
+        worker.join();
+    }
+}
+
+} // namespace fintechx_core
@@ -2,30 +2,46 @@
 #include <pybind11/stl.h> // Needed for automatic type conversion std::vector <-> list/tuple
 #include <pybind11/stl_bind.h> // Needed for binding std::vector
 #include <pybind11/functional.h> // Needed for std::optional
+#include <pybind11/numpy.h> // Needed for returning NumPy arrays from batch routines
+#include <algorithm>
+#include <cstring>
 #include <optional>
+#include <stdexcept>
+#include <string_view>
 
 #include "fintechx_core/pan_utils.hpp"
 #include "fintechx_core/encryption_utils.hpp"
+#include "fintechx_core/bin_table.hpp"
 
 namespace py = pybind11;
 
 // Helper to convert std::vector<unsigned char> to Python bytes and vice-versa
 // Pybind11 usually handles std::vector<char> or std::string correctly, but
 // std::vector<unsigned char> might need explicit handling for bytes.
+// Any contiguous read-only buffer is accepted on input; it is copied into the vector, so
+// hot paths take fintechx_core::ByteSpan instead.
 namespace pybind11 { namespace detail {
     template <> struct type_caster<std::vector<unsigned char>> {
     public:
-        PYBIND11_TYPE_CASTER(std::vector<unsigned char>, _("bytes"));
+        PYBIND11_TYPE_CASTER(std::vector<unsigned char>, _("Buffer"));
 
         // Python -> C++ conversion
         bool load(handle src, bool convert) {
-            if (!isinstance<bytes>(src)) {
+            if (isinstance<bytes>(src)) {
+                const char* buffer = PYBIND11_BYTES_AS_STRING(src.ptr());
+                size_t length = PYBIND11_BYTES_SIZE(src.ptr());
+                value.assign(buffer, buffer + length);
+                return true;
+            }
+            if (isinstance<str>(src) || !PyObject_CheckBuffer(src.ptr())) {
+                return false;
+            }
+            buffer_info info = reinterpret_borrow<buffer>(src).request();
+            if (!PyBuffer_IsContiguous(info.view(), 'C')) {
                 return false;
             }
-            auto b = reinterpret_borrow<bytes>(src);
-            const char* buffer = PYBIND11_BYTES_AS_STRING(b.ptr());
-            size_t length = PYBIND11_BYTES_SIZE(b.ptr());
-            value.assign(buffer, buffer + length);
+            const auto* data = static_cast<const unsigned char*>(info.ptr);
+            value.assign(data, data + info.size * info.itemsize);
             return true;
         }
 
@@ -34,8 +50,817 @@ namespace pybind11 { namespace detail {
             return py::bytes(reinterpret_cast<const char*>(src.data()), src.size()).release();
         }
     };
+
+    // Zero-copy view of any contiguous buffer (bytes, bytearray, memoryview, NumPy, mmap).
+    // The caster owns the buffer_info, which pins the memory for the duration of the call.
+    template <> struct type_caster<fintechx_core::ByteSpan> {
+    public:
+        PYBIND11_TYPE_CASTER(fintechx_core::ByteSpan, _("Buffer"));
+
+        bool load(handle src, bool convert) {
+            if (isinstance<str>(src) || !PyObject_CheckBuffer(src.ptr())) {
+                return false;
+            }
+            info_ = reinterpret_borrow<buffer>(src).request();
+            if (!PyBuffer_IsContiguous(info_.view(), 'C')) {
+                return false;
+            }
+            value = {static_cast<const unsigned char*>(info_.ptr), static_cast<size_t>(info_.size * info_.itemsize)};
+            return true;
+        }
+
+        static handle cast(const fintechx_core::ByteSpan& src, return_value_policy, handle) {
+            return py::bytes(reinterpret_cast<const char*>(src.data), src.size).release();
+        }
+
+    private:
+        buffer_info info_;
+    };
 }} // namespace pybind11::detail
 
+// Fixed-width PAN rows described by a buffer-protocol object. Accepted layouts:
+//   * 1-D fixed-width bytes array (NumPy 'S19'): one row per element
+//   * 2-D uint8/char array (rows x width): one row per line, C-contiguous columns
+//   * 1-D byte buffer (bytes, bytearray, mmap, memoryview) plus an explicit `width`
+// The caller keeps `info` alive for as long as the rows are read.
+struct PanRows {
+    const char* data = nullptr;
+    size_t rows = 0;
+    size_t row_stride = 0;
+    size_t width = 0;
+    py::array_t<int64_t, py::array::c_style | py::array::forcecast> length_array;
+    const int64_t* lengths = nullptr;
+};
+
+static PanRows pan_rows(const py::buffer_info& info, const py::object& lengths, py::ssize_t width) {
+    PanRows result;
+
+    if (info.ndim == 1 && info.itemsize > 1) {
+        result.rows = static_cast<size_t>(info.shape[0]);
+        result.row_stride = static_cast<size_t>(info.strides[0]);
+        result.width = static_cast<size_t>(info.itemsize);
+    } else if (info.ndim == 2 && info.itemsize == 1) {
+        if (info.strides[1] != 1) {
+            throw std::invalid_argument("2-D PAN buffers must be contiguous along each row");
+        }
+        result.rows = static_cast<size_t>(info.shape[0]);
+        result.row_stride = static_cast<size_t>(info.strides[0]);
+        result.width = static_cast<size_t>(info.shape[1]);
+    } else if (info.ndim == 1 && info.itemsize == 1) {
+        if (width <= 0) {
+            throw std::invalid_argument("width is required for flat byte buffers");
+        }
+        if (info.strides[0] != 1 || info.shape[0] % width != 0) {
+            throw std::invalid_argument("flat byte buffer size must be a multiple of width");
+        }
+        result.rows = static_cast<size_t>(info.shape[0] / width);
+        result.row_stride = static_cast<size_t>(width);
+        result.width = static_cast<size_t>(width);
+    } else {
+        throw std::invalid_argument("unsupported buffer layout for PAN batch");
+    }
+
+    if (width > 0 && static_cast<size_t>(width) < result.width) {
+        result.width = static_cast<size_t>(width);
+    }
+
+    if (!lengths.is_none()) {
+        result.length_array = py::array_t<int64_t, py::array::c_style | py::array::forcecast>::ensure(lengths);
+        if (!result.length_array || result.length_array.ndim() != 1 ||
+            static_cast<size_t>(result.length_array.shape(0)) != result.rows) {
+            throw std::invalid_argument("lengths must be a 1-D array with one entry per row");
+        }
+        result.lengths = result.length_array.data();
+    }
+
+    result.data = static_cast<const char*>(info.ptr);
+    return result;
+}
+
+// Validates packed PAN rows straight out of any buffer-protocol object (see pan_rows for layouts)
+static py::array_t<bool> luhn_check_batch_py(py::buffer data, py::object lengths, py::ssize_t width) {
+    py::buffer_info info = data.request();
+    PanRows batch = pan_rows(info, lengths, width);
+
+    py::array_t<bool> result(static_cast<py::ssize_t>(batch.rows));
+    auto* out = reinterpret_cast<uint8_t*>(result.mutable_data());
+
+    {
+        py::gil_scoped_release release;
+        fintechx_core::luhn_check_batch(batch.data, batch.rows, batch.row_stride, batch.width, batch.lengths, out);
+    }
+    return result;
+}
+
+// --- PAN detection in free text ---
+
+static fintechx_core::PanMaskOptions pan_mask_options(size_t keep_first, size_t keep_last, const std::string& mask) {
+    if (mask.size() != 1 || static_cast<unsigned char>(mask[0]) > 0x7f) {
+        throw std::invalid_argument("mask must be a single ASCII character");
+    }
+    return {keep_first, keep_last, mask[0]};
+}
+
+static py::list find_pans_py(fintechx_core::ByteSpan data) {
+    std::vector<fintechx_core::PanMatch> matches;
+    {
+        py::gil_scoped_release release;
+        fintechx_core::find_pans(reinterpret_cast<const char*>(data.data), data.size, true, matches);
+    }
+    py::list result;
+    for (const auto& match : matches) {
+        result.append(py::make_tuple(match.begin, match.end));
+    }
+    return result;
+}
+
+// Masks PANs in a str (via its UTF-8 form) or bytes-like object; returns str for str and bytes
+// otherwise. When nothing is found a str or bytes input is returned itself, so the common case
+// copies nothing.
+static py::object mask_pans_py(const py::object& data, size_t keep_first, size_t keep_last, const std::string& mask) {
+    fintechx_core::PanMaskOptions options = pan_mask_options(keep_first, keep_last, mask);
+
+    bool is_text = py::isinstance<py::str>(data);
+    const char* text = nullptr;
+    size_t size = 0;
+    py::buffer_info info;
+    if (is_text) {
+        Py_ssize_t length = 0;
+        text = PyUnicode_AsUTF8AndSize(data.ptr(), &length);
+        if (!text) {
+            throw py::error_already_set();
+        }
+        size = static_cast<size_t>(length);
+    } else {
+        info = py::reinterpret_borrow<py::buffer>(data).request();
+        if (!PyBuffer_IsContiguous(info.view(), 'C')) {
+            throw std::invalid_argument("mask_pans requires a contiguous buffer");
+        }
+        text = static_cast<const char*>(info.ptr);
+        size = static_cast<size_t>(info.size * info.itemsize);
+    }
+
+    std::vector<fintechx_core::PanMatch> matches;
+    std::string masked;
+    {
+        py::gil_scoped_release release;
+        fintechx_core::find_pans(text, size, true, matches);
+        if (!matches.empty()) {
+            masked.assign(text, size);
+            fintechx_core::mask_matches(masked.data(), matches, options);
+        }
+    }
+    if (matches.empty()) {
+        if (is_text || PyBytes_CheckExact(data.ptr())) {
+            return data;
+        }
+        return py::bytes(text, size);
+    }
+    if (is_text) {
+        return py::str(masked.data(), masked.size());
+    }
+    return py::bytes(masked.data(), masked.size());
+}
+
+static py::bytes pan_scrubber_feed_py(fintechx_core::PanScrubber& scrubber, fintechx_core::ByteSpan data) {
+    std::string out;
+    {
+        py::gil_scoped_release release;
+        out.reserve(data.size);
+        scrubber.feed(reinterpret_cast<const char*>(data.data), data.size, out);
+    }
+    return py::bytes(out.data(), out.size());
+}
+
+static py::bytes pan_scrubber_finish_py(fintechx_core::PanScrubber& scrubber) {
+    std::string out;
+    scrubber.finish(out);
+    return py::bytes(out.data(), out.size());
+}
+
+// --- BIN table ---
+
+static py::dict bin_info_dict(const fintechx_core::BinInfo& info) {
+    py::list lengths;
+    for (int n = 0; n < 32; ++n) {
+        if ((info.length_mask >> n) & 1u) {
+            lengths.append(n);
+        }
+    }
+    py::dict result;
+    result["scheme"] = info.scheme;
+    result["issuer"] = info.issuer;
+    result["lengths"] = lengths;
+    return result;
+}
+
+// Rows given as (low, high, scheme, issuer, lengths) with lengths an iterable of ints
+static fintechx_core::BinTable bin_table_from_rows(const py::iterable& rows) {
+    std::vector<fintechx_core::BinRange> ranges;
+    for (auto item : rows) {
+        auto row = py::cast<py::tuple>(item);
+        if (row.size() != 5) {
+            throw std::invalid_argument("BIN rows must be (low, high, scheme, issuer, lengths)");
+        }
+        uint32_t mask = 0;
+        for (auto length : row[4]) {
+            int n = py::cast<int>(length);
+            if (n <= 0 || n > 31) {
+                throw std::invalid_argument("PAN lengths must be between 1 and 31");
+            }
+            mask |= 1u << n;
+        }
+        ranges.push_back({py::cast<std::string>(row[0]), py::cast<std::string>(row[1]),
+                          {py::cast<std::string>(row[2]), py::cast<std::string>(row[3]), mask}});
+    }
+    return fintechx_core::BinTable(ranges);
+}
+
+static py::object bin_table_lookup_py(const fintechx_core::BinTable& table, const std::string& pan) {
+    int32_t id = table.lookup(pan.data(), pan.size());
+    if (id == fintechx_core::BinTable::not_found) {
+        return py::none();
+    }
+    return bin_info_dict(table.info(id));
+}
+
+// Returns (ids, length_ok): int32 attribute ids (-1 for no range) and a bool mask of allowed lengths
+static py::tuple bin_table_lookup_batch_py(const fintechx_core::BinTable& table, py::buffer data,
+                                           py::object lengths, py::ssize_t width, unsigned threads) {
+    py::buffer_info info = data.request();
+    PanRows batch = pan_rows(info, lengths, width);
+
+    py::array_t<int32_t> ids(static_cast<py::ssize_t>(batch.rows));
+    py::array_t<bool> length_ok(static_cast<py::ssize_t>(batch.rows));
+    int32_t* ids_out = ids.mutable_data();
+    auto* ok_out = reinterpret_cast<uint8_t*>(length_ok.mutable_data());
+
+    {
+        py::gil_scoped_release release;
+        table.lookup_batch(batch.data, batch.rows, batch.row_stride, batch.width, batch.lengths,
+                           ids_out, ok_out, threads);
+    }
+    return py::make_tuple(ids, length_ok);
+}
+
+// Converts an optional iterable of PAN strings into the exclusion list for unique generation
+static std::vector<std::string> exclusion_list(const py::object& exclude) {
+    std::vector<std::string> result;
+    if (exclude.is_none()) {
+        return result;
+    }
+    for (auto item : exclude) {
+        result.push_back(py::cast<std::string>(item));
+    }
+    return result;
+}
+
+// Fills `out` with `count` packed PANs with the GIL released, or raises ValueError
+static void generate_pan_batch_checked(const std::string& prefix, int length, size_t count, char* out,
+                                       unsigned threads, bool unique, const py::object& exclude) {
+    if (!unique && !exclude.is_none()) {
+        throw std::invalid_argument("exclude requires unique=True");
+    }
+    if (unique) {
+        std::vector<std::string> excluded = exclusion_list(exclude);
+        py::gil_scoped_release release;
+        fintechx_core::generate_unique_pan_batch_into(prefix, length, count, out, excluded, threads);
+        return;
+    }
+
+    bool ok;
+    {
+        py::gil_scoped_release release;
+        ok = fintechx_core::generate_pan_batch_into(prefix, length, count, out, threads);
+    }
+    if (!ok) {
+        throw std::invalid_argument("prefix must be digits and shorter than length");
+    }
+}
+
+static py::object generate_pan_batch_py(const std::string& prefix, int length, int count,
+                                        bool unique, const py::object& exclude) {
+    if (!unique) {
+        if (!exclude.is_none()) {
+            throw std::invalid_argument("exclude requires unique=True");
+        }
+        return py::cast(fintechx_core::generate_pan_batch(prefix, length, count));
+    }
+    if (length <= 0 || count <= 0) {
+        return py::list();
+    }
+
+    std::vector<char> packed(static_cast<size_t>(length) * static_cast<size_t>(count));
+    generate_pan_batch_checked(prefix, length, static_cast<size_t>(count), packed.data(), 0, true, exclude);
+
+    py::list batch(count);
+    for (int i = 0; i < count; ++i) {
+        batch[i] = py::str(packed.data() + static_cast<size_t>(i) * length, static_cast<size_t>(length));
+    }
+    return std::move(batch);
+}
+
+static py::bytes generate_pan_batch_bytes_py(const std::string& prefix, int length, size_t count,
+                                             unsigned threads, bool unique, const py::object& exclude) {
+    if (length <= 0) {
+        throw std::invalid_argument("length must be positive");
+    }
+    size_t size = count * static_cast<size_t>(length);
+    // Allocate the bytes object up front and generate straight into its storage
+    py::bytes result(nullptr, size);
+    generate_pan_batch_checked(prefix, length, count, PYBIND11_BYTES_AS_STRING(result.ptr()), threads, unique, exclude);
+    return result;
+}
+
+static py::array generate_pan_batch_array_py(const std::string& prefix, int length, size_t count,
+                                             unsigned threads, bool unique, const py::object& exclude) {
+    if (length <= 0) {
+        throw std::invalid_argument("length must be positive");
+    }
+    py::array result(py::dtype("S" + std::to_string(length)), std::vector<py::ssize_t>{static_cast<py::ssize_t>(count)});
+    generate_pan_batch_checked(prefix, length, count, static_cast<char*>(result.mutable_data()), threads, unique, exclude);
+    return result;
+}
+
+// Scans a PAN file buffer (typically an mmap) and returns the report as plain Python objects
+static py::dict scan_pan_buffer_py(py::buffer data, size_t width, size_t iin_digits, size_t max_invalid, unsigned threads) {
+    py::buffer_info info = data.request();
+    if (info.itemsize != 1 || (info.ndim == 1 && info.strides[0] != 1) || info.ndim > 1) {
+        throw std::invalid_argument("scan_pan_buffer requires a contiguous byte buffer");
+    }
+
+    fintechx_core::PanFileReport report;
+    {
+        py::gil_scoped_release release;
+        report = fintechx_core::scan_pan_buffer(static_cast<const char*>(info.ptr), static_cast<size_t>(info.size),
+                                                width, iin_digits, max_invalid, threads);
+    }
+
+    py::list breakdown;
+    for (const auto& [key, stats] : report.breakdown) {
+        py::dict entry;
+        entry["iin"] = key.first;
+        entry["length"] = key.second;
+        entry["valid"] = stats.valid;
+        entry["invalid"] = stats.invalid;
+        breakdown.append(entry);
+    }
+
+    py::dict result;
+    result["rows"] = report.rows;
+    result["valid"] = report.valid;
+    result["invalid"] = report.rows - report.valid;
+    result["invalid_rows"] = report.invalid_rows;
+    result["invalid_offsets"] = report.invalid_offsets;
+    result["breakdown"] = breakdown;
+    return result;
+}
+
+// --- Batch AES-GCM helpers ---
+
+// Views into the Python buffers of one batch argument. The buffer_info objects keep the
+// underlying memory pinned while the GIL is released.
+struct SpanBatch {
+    std::vector<py::buffer_info> buffers;
+    std::vector<fintechx_core::ByteSpan> spans;
+};
+
+static fintechx_core::ByteSpan contiguous_span(const py::buffer_info& info) {
+    if (!PyBuffer_IsContiguous(info.view(), 'C')) {
+        throw std::invalid_argument("batch items must be contiguous byte buffers");
+    }
+    return {static_cast<const unsigned char*>(info.ptr), static_cast<size_t>(info.size * info.itemsize)};
+}
+
+// A sequence of bytes-like objects, one span each
+static SpanBatch spans_from_sequence(const py::handle& items) {
+    SpanBatch batch;
+    auto sequence = py::reinterpret_borrow<py::sequence>(items);
+    batch.buffers.reserve(sequence.size());
+    batch.spans.reserve(sequence.size());
+    for (auto item : sequence) {
+        batch.buffers.push_back(py::reinterpret_borrow<py::buffer>(item).request());
+        batch.spans.push_back(contiguous_span(batch.buffers.back()));
+    }
+    return batch;
+}
+
+// One packed buffer sliced by `offsets` (count + 1 increasing byte offsets)
+static SpanBatch spans_from_packed(const py::handle& data, const py::object& offsets) {
+    SpanBatch batch;
+    batch.buffers.push_back(py::reinterpret_borrow<py::buffer>(data).request());
+    fintechx_core::ByteSpan whole = contiguous_span(batch.buffers.back());
+
+    auto bounds = py::array_t<int64_t, py::array::c_style | py::array::forcecast>::ensure(offsets);
+    if (!bounds || bounds.ndim() != 1 || bounds.shape(0) < 1) {
+        throw std::invalid_argument("offsets must be a 1-D array of count + 1 byte offsets");
+    }
+    const int64_t* b = bounds.data();
+    for (py::ssize_t i = 0; i + 1 < bounds.shape(0); ++i) {
+        if (b[i] < 0 || b[i + 1] < b[i] || static_cast<size_t>(b[i + 1]) > whole.size) {
+            throw std::invalid_argument("offsets must be increasing and within the buffer");
+        }
+        batch.spans.push_back({whole.data + b[i], static_cast<size_t>(b[i + 1] - b[i])});
+    }
+    return batch;
+}
+
+// One packed buffer of `count` fixed-size items
+static SpanBatch spans_from_fixed(const py::handle& data, size_t item_size, size_t count) {
+    SpanBatch batch;
+    batch.buffers.push_back(py::reinterpret_borrow<py::buffer>(data).request());
+    fintechx_core::ByteSpan whole = contiguous_span(batch.buffers.back());
+    if (whole.size != item_size * count) {
+        throw std::invalid_argument("packed buffer must hold exactly " + std::to_string(count) + " items of " +
+                                    std::to_string(item_size) + " bytes");
+    }
+    for (size_t i = 0; i < count; ++i) {
+        batch.spans.push_back({whole.data + i * item_size, item_size});
+    }
+    return batch;
+}
+
+// Messages: a sequence of bytes-like objects, or one packed buffer plus offsets
+static SpanBatch message_spans(const py::object& messages, const py::object& offsets) {
+    if (!offsets.is_none()) {
+        return spans_from_packed(messages, offsets);
+    }
+    if (py::isinstance<py::buffer>(messages)) {
+        throw std::invalid_argument("a packed message buffer requires offsets");
+    }
+    return spans_from_sequence(messages);
+}
+
+// IVs: a packed buffer of count * 12 bytes, or a sequence of 12-byte objects
+static SpanBatch iv_spans(const py::object& ivs, size_t count) {
+    return py::isinstance<py::buffer>(ivs) ? spans_from_fixed(ivs, 12, count) : spans_from_sequence(ivs);
+}
+
+// AADs: none, one bytes-like object shared by every message, or a sequence
+static SpanBatch aad_spans(const py::object& aads) {
+    if (aads.is_none()) {
+        return SpanBatch{};
+    }
+    if (py::isinstance<py::buffer>(aads)) {
+        SpanBatch batch;
+        batch.buffers.push_back(py::reinterpret_borrow<py::buffer>(aads).request());
+        batch.spans.push_back(contiguous_span(batch.buffers.back()));
+        return batch;
+    }
+    return spans_from_sequence(aads);
+}
+
+static py::tuple encrypt_aes_gcm_batch_py(const py::object& plaintexts, const std::vector<unsigned char>& key,
+                                          const py::object& ivs, const py::object& aads,
+                                          const py::object& offsets, unsigned threads) {
+    SpanBatch messages = message_spans(plaintexts, offsets);
+    const size_t count = messages.spans.size();
+
+    py::object iv_source = ivs;
+    if (ivs.is_none()) {
+        std::vector<unsigned char> random_ivs = fintechx_core::generate_random_bytes(count * 12);
+        iv_source = py::bytes(reinterpret_cast<const char*>(random_ivs.data()), random_ivs.size());
+    }
+    SpanBatch iv_batch = iv_spans(iv_source, count);
+    SpanBatch aad_batch = aad_spans(aads);
+    if (iv_batch.spans.size() != count || (aad_batch.spans.size() > 1 && aad_batch.spans.size() != count)) {
+        throw std::invalid_argument("ivs and aads must have one entry per message");
+    }
+
+    py::array_t<int64_t> out_offsets(static_cast<py::ssize_t>(count + 1));
+    int64_t* o = out_offsets.mutable_data();
+    o[0] = 0;
+    for (size_t i = 0; i < count; ++i) {
+        o[i + 1] = o[i] + static_cast<int64_t>(messages.spans[i].size + 16);
+    }
+
+    py::bytes out(nullptr, static_cast<size_t>(o[count]));
+    auto* out_ptr = reinterpret_cast<unsigned char*>(PYBIND11_BYTES_AS_STRING(out.ptr()));
+    bool ok;
+    {
+        py::gil_scoped_release release;
+        ok = fintechx_core::encrypt_aes_gcm_batch(key, messages.spans, iv_batch.spans, aad_batch.spans, out_ptr, threads);
+    }
+    if (!ok) {
+        throw std::runtime_error("AES-GCM batch encryption failed (check key and IV sizes)");
+    }
+
+    std::string packed_ivs;
+    packed_ivs.reserve(count * 12);
+    for (const auto& iv : iv_batch.spans) {
+        packed_ivs.append(reinterpret_cast<const char*>(iv.data), iv.size);
+    }
+    return py::make_tuple(out, out_offsets, py::bytes(packed_ivs));
+}
+
+static py::tuple decrypt_aes_gcm_batch_py(const py::object& ciphertexts, const std::vector<unsigned char>& key,
+                                          const py::object& ivs, const py::object& aads,
+                                          const py::object& offsets, unsigned threads) {
+    SpanBatch messages = message_spans(ciphertexts, offsets);
+    const size_t count = messages.spans.size();
+    SpanBatch iv_batch = iv_spans(ivs, count);
+    SpanBatch aad_batch = aad_spans(aads);
+    if (iv_batch.spans.size() != count || (aad_batch.spans.size() > 1 && aad_batch.spans.size() != count)) {
+        throw std::invalid_argument("ivs and aads must have one entry per message");
+    }
+
+    py::array_t<int64_t> out_offsets(static_cast<py::ssize_t>(count + 1));
+    int64_t* o = out_offsets.mutable_data();
+    o[0] = 0;
+    for (size_t i = 0; i < count; ++i) {
+        size_t size = messages.spans[i].size;
+        o[i + 1] = o[i] + static_cast<int64_t>(size >= 16 ? size - 16 : 0);
+    }
+
+    py::bytes out(nullptr, static_cast<size_t>(o[count]));
+    auto* out_ptr = reinterpret_cast<unsigned char*>(PYBIND11_BYTES_AS_STRING(out.ptr()));
+    py::array_t<bool> ok_mask(static_cast<py::ssize_t>(count));
+    auto* ok_ptr = reinterpret_cast<uint8_t*>(ok_mask.mutable_data());
+    bool ran;
+    {
+        py::gil_scoped_release release;
+        ran = fintechx_core::decrypt_aes_gcm_batch(key, messages.spans, iv_batch.spans, aad_batch.spans, out_ptr, ok_ptr, threads);
+    }
+    if (!ran) {
+        throw std::runtime_error("AES-GCM batch decryption failed (check key and IV sizes)");
+    }
+    return py::make_tuple(out, out_offsets, ok_mask);
+}
+
+static py::bytes hmac_sha256_batch_py(const py::object& messages, const std::vector<unsigned char>& key,
+                                      size_t out_len, const py::object& offsets, unsigned threads) {
+    SpanBatch batch = message_spans(messages, offsets);
+    py::bytes out(nullptr, batch.spans.size() * out_len);
+    auto* out_ptr = reinterpret_cast<unsigned char*>(PYBIND11_BYTES_AS_STRING(out.ptr()));
+    bool ok;
+    {
+        py::gil_scoped_release release;
+        ok = fintechx_core::hmac_sha256_batch(key, batch.spans, out_len, out_ptr, threads);
+    }
+    if (!ok) {
+        throw std::invalid_argument("HMAC batch failed (out_len must be 1 to 32)");
+    }
+    return out;
+}
+
+static fintechx_core::AesGcmCipher::IvMode iv_mode_from_name(const std::string& name) {
+    if (name == "random") {
+        return fintechx_core::AesGcmCipher::IvMode::Random;
+    }
+    if (name == "counter") {
+        return fintechx_core::AesGcmCipher::IvMode::Counter;
+    }
+    throw std::invalid_argument("iv_mode must be 'random' or 'counter'");
+}
+
+// A bytes-like argument that may be None (an empty span). The caller's `info` pins the buffer, so
+// it must outlive every use of the span, including across gil_scoped_release. (An
+// std::optional<ByteSpan> parameter would not: its inner caster releases the buffer on load.)
+static fintechx_core::ByteSpan span_or_empty(const py::object& data, py::buffer_info& info) {
+    if (data.is_none()) {
+        return {nullptr, 0};
+    }
+    if (py::isinstance<py::str>(data) || !py::isinstance<py::buffer>(data)) {
+        throw py::type_error("expected a bytes-like object or None");
+    }
+    info = py::reinterpret_borrow<py::buffer>(data).request();
+    if (!PyBuffer_IsContiguous(info.view(), 'C')) {
+        throw std::invalid_argument("buffer must be C-contiguous");
+    }
+    return {static_cast<const unsigned char*>(info.ptr), static_cast<size_t>(info.size * info.itemsize)};
+}
+
+static py::bytes aes_gcm_encrypt_py(fintechx_core::AesGcmCipher& cipher, fintechx_core::ByteSpan plaintext,
+                                    const py::object& aad) {
+    py::buffer_info aad_info;
+    fintechx_core::ByteSpan aad_span = span_or_empty(aad, aad_info);
+    py::bytes sealed(nullptr, plaintext.size + fintechx_core::AesGcmCipher::overhead);
+    auto* out = reinterpret_cast<unsigned char*>(PYBIND11_BYTES_AS_STRING(sealed.ptr()));
+    {
+        py::gil_scoped_release release;
+        cipher.encrypt_into(plaintext, aad_span, out);
+    }
+    return sealed;
+}
+
+static py::object aes_gcm_decrypt_py(fintechx_core::AesGcmCipher& cipher, fintechx_core::ByteSpan sealed,
+                                     const py::object& aad) {
+    if (sealed.size < fintechx_core::AesGcmCipher::overhead) {
+        return py::none();
+    }
+    py::buffer_info aad_info;
+    fintechx_core::ByteSpan aad_span = span_or_empty(aad, aad_info);
+
+    py::bytes plaintext(nullptr, sealed.size - fintechx_core::AesGcmCipher::overhead);
+    auto* out = reinterpret_cast<unsigned char*>(PYBIND11_BYTES_AS_STRING(plaintext.ptr()));
+    bool ok;
+    {
+        py::gil_scoped_release release;
+        ok = cipher.decrypt_into(sealed, aad_span, out);
+    }
+    if (!ok) {
+        return py::none();
+    }
+    return std::move(plaintext);
+}
+
+// --- Single-message AES-GCM ---
+// Inputs are viewed in place and results are written straight into the returned bytes
+// object (or a caller-provided writable buffer), so large blobs are never copied.
+
+static py::object encrypt_aes_gcm_py(fintechx_core::ByteSpan plaintext, fintechx_core::ByteSpan key,
+                                     fintechx_core::ByteSpan iv, fintechx_core::ByteSpan aad) {
+    py::bytes ciphertext(nullptr, plaintext.size + 16);
+    auto* out = reinterpret_cast<unsigned char*>(PYBIND11_BYTES_AS_STRING(ciphertext.ptr()));
+    bool ok;
+    {
+        py::gil_scoped_release release;
+        ok = fintechx_core::encrypt_aes_gcm_into(plaintext, key, iv, aad, out);
+    }
+    if (!ok) {
+        return py::none();
+    }
+    return std::move(ciphertext);
+}
+
+static py::object decrypt_aes_gcm_py(fintechx_core::ByteSpan ciphertext_with_tag, fintechx_core::ByteSpan key,
+                                     fintechx_core::ByteSpan iv, fintechx_core::ByteSpan aad) {
+    py::bytes plaintext(nullptr, ciphertext_with_tag.size >= 16 ? ciphertext_with_tag.size - 16 : 0);
+    auto* out = reinterpret_cast<unsigned char*>(PYBIND11_BYTES_AS_STRING(plaintext.ptr()));
+    bool ok;
+    {
+        py::gil_scoped_release release;
+        ok = fintechx_core::decrypt_aes_gcm_into(ciphertext_with_tag, key, iv, aad, out);
+    }
+    if (!ok) {
+        return py::none();
+    }
+    return std::move(plaintext);
+}
+
+// Requests a writable view of `out` that can hold at least `needed` bytes
+static unsigned char* writable_output(const py::buffer& out, py::buffer_info& info, size_t needed) {
+    info = out.request(true);
+    if (!PyBuffer_IsContiguous(info.view(), 'C')) {
+        throw std::invalid_argument("out must be a contiguous writable buffer");
+    }
+    if (static_cast<size_t>(info.size * info.itemsize) < needed) {
+        throw std::invalid_argument("out is too small: need " + std::to_string(needed) + " bytes");
+    }
+    return static_cast<unsigned char*>(info.ptr);
+}
+
+static py::object encrypt_into_py(const py::buffer& out, fintechx_core::ByteSpan plaintext, fintechx_core::ByteSpan key,
+                                  fintechx_core::ByteSpan iv, fintechx_core::ByteSpan aad) {
+    py::buffer_info out_info;
+    unsigned char* dest = writable_output(out, out_info, plaintext.size + 16);
+    bool ok;
+    {
+        py::gil_scoped_release release;
+        ok = fintechx_core::encrypt_aes_gcm_into(plaintext, key, iv, aad, dest);
+    }
+    if (!ok) {
+        return py::none();
+    }
+    return py::int_(plaintext.size + 16);
+}
+
+static py::object decrypt_into_py(const py::buffer& out, fintechx_core::ByteSpan ciphertext_with_tag,
+                                  fintechx_core::ByteSpan key, fintechx_core::ByteSpan iv, fintechx_core::ByteSpan aad) {
+    size_t plaintext_size = ciphertext_with_tag.size >= 16 ? ciphertext_with_tag.size - 16 : 0;
+    py::buffer_info out_info;
+    unsigned char* dest = writable_output(out, out_info, plaintext_size);
+    bool ok;
+    {
+        py::gil_scoped_release release;
+        ok = fintechx_core::decrypt_aes_gcm_into(ciphertext_with_tag, key, iv, aad, dest);
+    }
+    if (!ok) {
+        return py::none();
+    }
+    return py::int_(plaintext_size);
+}
+
+// Iterator behind iter_generate_pans: yields bytes blocks of up to `chunk` PANs,
+// each PAN followed by `sep`, until `total` PANs have been produced (forever if total < 0).
+class PanGenerationStream {
+public:
+    PanGenerationStream(std::string prefix, int length, size_t chunk, long long total, std::string sep, unsigned threads)
+        : prefix_(std::move(prefix)), length_(length), chunk_(chunk), remaining_(total), sep_(std::move(sep)), threads_(threads) {
+        if (length_ <= 0 || prefix_.size() >= static_cast<size_t>(length_) ||
+            !std::all_of(prefix_.begin(), prefix_.end(), [](unsigned char c) { return c >= '0' && c <= '9'; })) {
+            throw std::invalid_argument("prefix must be digits and shorter than length");
+        }
+        if (chunk_ == 0) {
+            throw std::invalid_argument("chunk must be positive");
+        }
+    }
+
+    py::bytes next() {
+        size_t rows = chunk_;
+        if (remaining_ >= 0) {
+            rows = std::min<size_t>(rows, static_cast<size_t>(remaining_));
+        }
+        if (rows == 0) {
+            throw py::stop_iteration();
+        }
+
+        const size_t row_length = static_cast<size_t>(length_);
+        const size_t out_row = row_length + sep_.size();
+        py::bytes block(nullptr, rows * out_row);
+        char* out = PYBIND11_BYTES_AS_STRING(block.ptr());
+        {
+            py::gil_scoped_release release;
+            if (sep_.empty()) {
+                fintechx_core::generate_pan_batch_into(prefix_, length_, rows, out, threads_);
+            } else {
+                // Generate packed into reusable scratch, then interleave separators
+                scratch_.resize(rows * row_length);
+                fintechx_core::generate_pan_batch_into(prefix_, length_, rows, scratch_.data(), threads_);
+                for (size_t i = 0; i < rows; ++i) {
+                    std::memcpy(out + i * out_row, scratch_.data() + i * row_length, row_length);
+                    std::memcpy(out + i * out_row + row_length, sep_.data(), sep_.size());
+                }
+            }
+        }
+        if (remaining_ >= 0) {
+            remaining_ -= static_cast<long long>(rows);
+        }
+        return block;
+    }
+
+private:
+    std::string prefix_;
+    int length_;
+    size_t chunk_;
+    long long remaining_;
+    std::string sep_;
+    unsigned threads_;
+    std::vector<char> scratch_;
+};
+
+// Iterator behind iter_validate: reads a binary file-like object in blocks and yields a
+// NumPy bool mask per `chunk` lines. Only one block plus a partial line is held at a time.
+class LuhnLineStream {
+public:
+    LuhnLineStream(py::object file, size_t chunk, size_t block_size)
+        : file_(std::move(file)), chunk_(chunk), block_size_(block_size) {
+        if (chunk_ == 0 || block_size_ == 0) {
+            throw std::invalid_argument("chunk and block_size must be positive");
+        }
+        read_ = file_.attr("read");
+    }
+
+    py::array_t<bool> next() {
+        results_.clear();
+        while (results_.size() < chunk_) {
+            if (pos_ < buffer_.size() || eof_) {
+                size_t consumed;
+                {
+                    py::gil_scoped_release release;
+                    consumed = fintechx_core::luhn_check_lines(buffer_.data() + pos_, buffer_.size() - pos_, eof_,
+                                                               chunk_ - results_.size(), results_);
+                }
+                pos_ += consumed;
+                if (results_.size() == chunk_ || eof_) {
+                    break;
+                }
+            }
+
+            py::object block = read_(block_size_);
+            if (!py::isinstance<py::bytes>(block)) {
+                throw py::type_error("iter_validate requires a binary file object (read() must return bytes)");
+            }
+            std::string_view view(PYBIND11_BYTES_AS_STRING(block.ptr()), static_cast<size_t>(PYBIND11_BYTES_SIZE(block.ptr())));
+            // Only the carried-over partial line is moved
+            buffer_.erase(0, pos_);
+            pos_ = 0;
+            if (view.empty()) {
+                eof_ = true;
+            } else {
+                buffer_.append(view.data(), view.size());
+            }
+        }
+
+        if (results_.empty()) {
+            throw py::stop_iteration();
+        }
+        py::array_t<bool> mask(static_cast<py::ssize_t>(results_.size()));
+        std::memcpy(mask.mutable_data(), results_.data(), results_.size());
+        return mask;
+    }
+
+private:
+    py::object file_;
+    py::object read_;
+    size_t chunk_;
+    size_t block_size_;
+    std::string buffer_;
+    size_t pos_ = 0;
+    bool eof_ = false;
+    std::vector<uint8_t> results_;
+};
+
 PYBIND11_MODULE(fintechx_native, m) {
     m.doc() = "Native C++ core modules for FinTechX Desktop (PAN Utils, Encryption)"; // Optional module docstring
 
@@ -44,30 +869,253 @@ PYBIND11_MODULE(fintechx_native, m) {
           "Validates a PAN using the Luhn algorithm.",
           py::arg("pan"));
 
+    m.def("luhn_check_batch", &luhn_check_batch_py,
+          "Validates packed fixed-width PAN rows from a buffer (NumPy S/uint8 array, bytes, mmap). Returns a bool mask.",
+          py::arg("data"), py::arg("lengths") = py::none(), py::arg("width") = 0);
+
+    m.def("luhn_batch_kernel", &fintechx_core::luhn_batch_kernel,
+          "Returns the Luhn batch kernel selected for this CPU (avx2, ssse3 or scalar).");
+
     m.def("generate_pan", &fintechx_core::generate_pan, 
           "Generates a single valid PAN based on prefix and length.",
           py::arg("prefix"), py::arg("length"));
 
-    m.def("generate_pan_batch", &fintechx_core::generate_pan_batch, 
-          "Generates a batch of valid PANs.",
-          py::arg("prefix"), py::arg("length"), py::arg("count"));
+    m.def("generate_pan_batch", &generate_pan_batch_py,
+          "Generates a batch of valid PANs. With unique=True the PANs are distinct and avoid `exclude`; "
+          "raises ValueError if the prefix and length cannot hold `count` of them.",
+          py::arg("prefix"), py::arg("length"), py::arg("count"),
+          py::kw_only(), py::arg("unique") = false, py::arg("exclude") = py::none());
+
+    m.def("generate_pan_batch_bytes", &generate_pan_batch_bytes_py,
+          "Generates a batch of valid PANs as one packed bytes object (count * length bytes, no separators).",
+          py::arg("prefix"), py::arg("length"), py::arg("count"), py::arg("threads") = 0,
+          py::kw_only(), py::arg("unique") = false, py::arg("exclude") = py::none());
+
+    m.def("generate_pan_batch_array", &generate_pan_batch_array_py,
+          "Generates a batch of valid PANs as a NumPy S{length} array.",
+          py::arg("prefix"), py::arg("length"), py::arg("count"), py::arg("threads") = 0,
+          py::kw_only(), py::arg("unique") = false, py::arg("exclude") = py::none());
+
+    m.def("scan_pan_buffer", &scan_pan_buffer_py,
+          "Validates every PAN in a newline- or fixed-width-delimited buffer (e.g. an mmap) across all cores. "
+          "Returns counts, invalid row numbers/offsets and a per-(IIN, length) breakdown.",
+          py::arg("data"), py::arg("width") = 0, py::arg("iin_digits") = 6, py::arg("max_invalid") = 1000,
+          py::arg("threads") = 0);
+
+    py::class_<PanGenerationStream>(m, "PanGenerationStream")
+        .def("__iter__", [](PanGenerationStream& self) -> PanGenerationStream& { return self; })
+        .def("__next__", &PanGenerationStream::next);
+
+    m.def("iter_generate_pans",
+          [](const std::string& prefix, int length, size_t chunk, py::object total, const py::bytes& sep, unsigned threads) {
+              long long limit = total.is_none() ? -1 : total.cast<long long>();
+              return PanGenerationStream(prefix, length, chunk, limit, std::string(sep), threads);
+          },
+          "Returns an iterator of bytes blocks, each holding up to `chunk` PANs terminated by `sep`. "
+          "Runs until `total` PANs are produced, or forever if total is None.",
+          py::arg("prefix"), py::arg("length"), py::arg("chunk") = 65536, py::arg("total") = py::none(),
+          py::arg("sep") = py::bytes("\n"), py::arg("threads") = 0);
+
+    py::class_<LuhnLineStream>(m, "LuhnLineStream")
+        .def("__iter__", [](LuhnLineStream& self) -> LuhnLineStream& { return self; })
+        .def("__next__", &LuhnLineStream::next);
+
+    m.def("iter_validate",
+          [](py::object file, size_t chunk, size_t block_size) {
+              return LuhnLineStream(std::move(file), chunk, block_size);
+          },
+          "Returns an iterator over a binary file of newline-delimited PANs, yielding one bool mask per `chunk` lines.",
+          py::arg("file"), py::arg("chunk") = 65536, py::arg("block_size") = 1 << 20);
+
+    m.def("find_pans", &find_pans_py,
+          "Returns (start, end) byte offsets of every Luhn-valid 13-19 digit PAN in a text buffer, "
+          "including PANs grouped with spaces or dashes.",
+          py::arg("data"));
+
+    m.def("mask_pans", &mask_pans_py,
+          "Masks every PAN in a str or bytes-like object, keeping separators and the first `keep_first` (<= 6) "
+          "and last `keep_last` (<= 4) digits. Returns str for str input and bytes for any other; a str or "
+          "bytes input is returned itself if nothing was found.",
+          py::arg("data"), py::arg("keep_first") = 0, py::arg("keep_last") = 4, py::arg("mask") = "*");
+
+    py::class_<fintechx_core::PanScrubber>(m, "PanScrubber",
+        "Streaming PAN masker: feed() blocks of text and write what it returns, then finish(). "
+        "PANs split across blocks are still masked.")
+        .def(py::init([](size_t keep_first, size_t keep_last, const std::string& mask) {
+                 return fintechx_core::PanScrubber(pan_mask_options(keep_first, keep_last, mask));
+             }),
+             py::arg("keep_first") = 0, py::arg("keep_last") = 4, py::arg("mask") = "*")
+        .def("feed", &pan_scrubber_feed_py,
+             "Scrubs the next block and returns the output that is ready (a trailing digit run is held back).",
+             py::arg("data"))
+        .def("finish", &pan_scrubber_finish_py, "Returns the scrubbed remainder at the end of the stream.")
+        .def_property_readonly("matches", &fintechx_core::PanScrubber::matches, "PANs masked so far.");
+
+    // --- BIN Table Bindings ---
+    py::class_<fintechx_core::BinTable>(m, "BinTable",
+        "Read-only BIN range index mapping PANs to scheme, issuer and allowed lengths. Safe to share across threads.")
+        .def(py::init(&bin_table_from_rows),
+             "Builds a table from (low, high, scheme, issuer, lengths) rows; narrower ranges win where they overlap.",
+             py::arg("rows"))
+        .def_static("from_csv", &fintechx_core::BinTable::from_csv_file,
+                    "Loads low,high,scheme,issuer,lengths rows from a CSV file (lengths like '16;19' or '12-19').",
+                    py::arg("path"), py::call_guard<py::gil_scoped_release>())
+        .def("lookup", &bin_table_lookup_py,
+             "Returns {'scheme', 'issuer', 'lengths'} for the range holding a PAN, or None. A prefix of "
+             "under 8 digits matches only when one range covers every PAN starting with it.",
+             py::arg("pan"))
+        .def("lookup_id", [](const fintechx_core::BinTable& table, const std::string& pan) {
+                 return table.lookup(pan.data(), pan.size());
+             },
+             "Returns the attribute id for a PAN (or prefix), or -1.", py::arg("pan"))
+        .def("lookup_batch", &bin_table_lookup_batch_py,
+             "Classifies packed fixed-width PAN rows (same layouts as luhn_check_batch) with the GIL released. "
+             "Returns (ids, length_ok): int32 attribute ids (-1 for no range) and a bool mask of allowed lengths.",
+             py::arg("data"), py::arg("lengths") = py::none(), py::arg("width") = 0, py::arg("threads") = 0)
+        .def("info", [](const fintechx_core::BinTable& table, int32_t id) {
+                 if (id < 0 || static_cast<size_t>(id) >= table.info_count()) {
+                     throw py::index_error("BIN attribute id out of range");
+                 }
+                 return bin_info_dict(table.info(id));
+             },
+             "Returns {'scheme', 'issuer', 'lengths'} for an attribute id from lookup_batch.", py::arg("id"))
+        .def("__len__", &fintechx_core::BinTable::interval_count);
 
     // --- Encryption Utils Bindings --- 
-    m.def("encrypt_aes_gcm", &fintechx_core::encrypt_aes_gcm, 
-          "Encrypts plaintext using AES-256-GCM. Returns ciphertext + tag.",
-          py::arg("plaintext"), py::arg("key"), py::arg("iv"), py::arg("aad") = std::vector<unsigned char>{});
+    m.def("encrypt_aes_gcm", &encrypt_aes_gcm_py,
+          "Encrypts plaintext using AES-256-GCM. Returns ciphertext + tag. Inputs may be any contiguous buffer.",
+          py::arg("plaintext"), py::arg("key"), py::arg("iv"), py::arg("aad") = py::bytes());
+
+    m.def("decrypt_aes_gcm", &decrypt_aes_gcm_py,
+          "Decrypts AES-256-GCM ciphertext. Expects ciphertext + tag. Returns plaintext or None on failure.",
+          py::arg("ciphertext_with_tag"), py::arg("key"), py::arg("iv"), py::arg("aad") = py::bytes());
 
-    m.def("decrypt_aes_gcm", &fintechx_core::decrypt_aes_gcm, 
-          "Decrypts AES-256-GCM ciphertext. Expects ciphertext + tag. Returns plaintext or nullopt on failure.",
-          py::arg("ciphertext_with_tag"), py::arg("key"), py::arg("iv"), py::arg("aad") = std::vector<unsigned char>{});
+    m.def("encrypt_into", &encrypt_into_py,
+          "Encrypts plaintext using AES-256-GCM into the writable buffer `out` (len(plaintext) + 16 bytes). "
+          "Returns the number of bytes written, or None on failure.",
+          py::arg("out"), py::arg("plaintext"), py::arg("key"), py::arg("iv"), py::arg("aad") = py::bytes());
+
+    m.def("decrypt_into", &decrypt_into_py,
+          "Decrypts AES-256-GCM ciphertext + tag into the writable buffer `out` (len(ciphertext_with_tag) - 16 bytes). "
+          "Returns the number of bytes written, or None on failure (if authentication fails, those bytes of `out` are zeroed).",
+          py::arg("out"), py::arg("ciphertext_with_tag"), py::arg("key"), py::arg("iv"), py::arg("aad") = py::bytes());
+
+    m.def("encrypt_aes_gcm_batch", &encrypt_aes_gcm_batch_py,
+          "Encrypts many messages under one key with AES-256-GCM, reusing one cipher context per thread. "
+          "`plaintexts` is a sequence of bytes-like objects, or one packed buffer with `offsets`. `ivs` is a "
+          "packed count * 12 byte buffer or a sequence (random IVs if None); `aads` is None, one shared "
+          "bytes-like object, or a sequence. Returns (ciphertexts_with_tags, offsets, ivs), all packed.",
+          py::arg("plaintexts"), py::arg("key"), py::arg("ivs") = py::none(), py::arg("aads") = py::none(),
+          py::arg("offsets") = py::none(), py::arg("threads") = 0);
+
+    m.def("decrypt_aes_gcm_batch", &decrypt_aes_gcm_batch_py,
+          "Decrypts many AES-256-GCM messages (ciphertext + tag) under one key. Arguments mirror "
+          "encrypt_aes_gcm_batch. Returns (plaintexts, offsets, ok) where ok is a bool mask of messages "
+          "that authenticated; bytes of failed messages are zeroed.",
+          py::arg("ciphertexts_with_tag"), py::arg("key"), py::arg("ivs"), py::arg("aads") = py::none(),
+          py::arg("offsets") = py::none(), py::arg("threads") = 0);
+
+    m.def("hmac_sha256_batch", &hmac_sha256_batch_py,
+          "HMAC-SHA256 of many messages under one key, each truncated to `out_len` bytes. `messages` is a "
+          "sequence of bytes-like objects, or one packed buffer with `offsets`. Returns the MACs packed "
+          "back to back (count * out_len bytes).",
+          py::arg("messages"), py::arg("key"), py::arg("out_len") = 32, py::arg("offsets") = py::none(),
+          py::arg("threads") = 0);
+
+    py::class_<fintechx_core::AesGcmCipher>(m, "AesGcm",
+        "AES-256-GCM bound to one key, with internally managed IVs. Sealed messages are IV (12) || ciphertext || tag (16).")
+        .def(py::init([](std::vector<unsigned char> key, const std::string& iv_mode,
+                         const py::object& iv_prefix, uint64_t counter_start) {
+                 py::buffer_info prefix_info;
+                 return std::make_unique<fintechx_core::AesGcmCipher>(std::move(key), iv_mode_from_name(iv_mode),
+                                                                      span_or_empty(iv_prefix, prefix_info),
+                                                                      counter_start);
+             }),
+             "Expands `key` (32 bytes) once. `iv_mode` is 'random' (default) or 'counter'. Counter mode "
+             "needs a 4-byte `iv_prefix` and a `counter_start` that no other use of the key has covered "
+             "with the same prefix; persist `next_counter` and resume from it, since repeating an IV "
+             "breaks GCM.",
+             py::arg("key"), py::arg("iv_mode") = "random", py::arg("iv_prefix") = py::none(),
+             py::arg("counter_start") = 0)
+        .def("encrypt", &aes_gcm_encrypt_py,
+             "Seals plaintext under a fresh IV. Raises RuntimeError once this instance's IV budget is exhausted.",
+             py::arg("plaintext"), py::arg("aad") = py::none())
+        .def("decrypt", &aes_gcm_decrypt_py,
+             "Opens a sealed message. Returns None if it is malformed or fails authentication.",
+             py::arg("sealed"), py::arg("aad") = py::none())
+        .def_property_readonly("messages_remaining", &fintechx_core::AesGcmCipher::messages_remaining,
+             "Messages this instance can still encrypt before refusing. Only this instance's messages "
+             "are counted, not those other instances encrypt under the same key.")
+        .def_property_readonly("next_counter", &fintechx_core::AesGcmCipher::next_counter,
+             "Counter mode: the counter the next message will use (0 in random mode).")
+        .def_property_readonly_static("overhead", [](py::object) { return fintechx_core::AesGcmCipher::overhead; },
+             "Bytes a sealed message adds to its plaintext.");
+
+    py::register_exception<fintechx_core::GcmAuthenticationError>(m, "AuthenticationError", PyExc_ValueError);
+
+    py::class_<fintechx_core::GcmStreamEncryptor>(m, "GcmStreamEncryptor",
+        "Chunked AES-256-GCM stream encryption (FXS1 frame format, see encryption_utils.hpp). "
+        "Concatenate everything update() and finalize() return.")
+        .def(py::init<std::vector<unsigned char>, size_t>(),
+             py::arg("key"), py::arg("chunk_size") = fintechx_core::GcmStreamEncryptor::default_chunk_size)
+        .def("update", [](fintechx_core::GcmStreamEncryptor& self, fintechx_core::ByteSpan data) {
+                 std::vector<unsigned char> out;
+                 {
+                     py::gil_scoped_release release;
+                     self.update(data, out);
+                 }
+                 return py::bytes(reinterpret_cast<const char*>(out.data()), out.size());
+             },
+             "Returns the header (first call) and every frame completed by `data`.", py::arg("data"))
+        .def("finalize", [](fintechx_core::GcmStreamEncryptor& self) {
+                 std::vector<unsigned char> out;
+                 self.finalize(out);
+                 return py::bytes(reinterpret_cast<const char*>(out.data()), out.size());
+             },
+             "Returns the final frame, which marks the end of the stream.")
+        .def_property_readonly("chunk_size", &fintechx_core::GcmStreamEncryptor::chunk_size);
+
+    py::class_<fintechx_core::GcmStreamDecryptor>(m, "GcmStreamDecryptor",
+        "Chunked AES-256-GCM stream decryption. Raises AuthenticationError on tampering; "
+        "finalize() must be called to detect truncation.")
+        .def(py::init<std::vector<unsigned char>>(), py::arg("key"))
+        .def("update", [](fintechx_core::GcmStreamDecryptor& self, fintechx_core::ByteSpan data) {
+                 std::vector<unsigned char> out;
+                 {
+                     py::gil_scoped_release release;
+                     self.update(data, out);
+                 }
+                 return py::bytes(reinterpret_cast<const char*>(out.data()), out.size());
+             },
+             "Returns the plaintext of every frame completed and authenticated by `data`.", py::arg("data"))
+        .def("finalize", &fintechx_core::GcmStreamDecryptor::finalize,
+             "Raises AuthenticationError if the stream ended without its final frame.");
+
+    m.def("encrypt_file", &fintechx_core::encrypt_file,
+          "Encrypts the file at `src` into `dst` in constant memory using the chunked stream format.",
+          py::arg("src"), py::arg("dst"), py::arg("key"),
+          py::arg("chunk_size") = fintechx_core::GcmStreamEncryptor::default_chunk_size,
+          py::call_guard<py::gil_scoped_release>());
+
+    m.def("decrypt_file", &fintechx_core::decrypt_file,
+          "Decrypts a chunked stream file at `src` into `dst`. `dst` only appears once the whole file has "
+          "authenticated; raises AuthenticationError on tampering or truncation.",
+          py::arg("src"), py::arg("dst"), py::arg("key"),
+          py::call_guard<py::gil_scoped_release>());
 
     m.def("generate_random_bytes", &fintechx_core::generate_random_bytes, 
           "Generates cryptographically secure random bytes.",
           py::arg("length"));
 
     m.def("derive_key_pbkdf2", &fintechx_core::derive_key_pbkdf2, 
-          "Derives a key from a password using PBKDF2-HMAC-SHA256.",
-          py::arg("password"), py::arg("salt"), py::arg("iterations"), py::arg("key_length"));
+          "Derives a key from a password using PBKDF2-HMAC-SHA256. Releases the GIL while it runs, "
+          "so calls from several threads derive in parallel.",
+          py::arg("password"), py::arg("salt"), py::arg("iterations"), py::arg("key_length"),
+          py::call_guard<py::gil_scoped_release>());
+
+    m.def("derive_key_hkdf", &fintechx_core::derive_key_hkdf,
+          "Derives a subkey from uniformly random key material with HKDF-SHA256, separated by `info`.",
+          py::arg("ikm"), py::arg("salt"), py::arg("info"), py::arg("key_length"));
 
     // Optional: Add version info
 #ifdef VERSION_INFO
@@ -2,9 +2,17 @@
 #include <openssl/evp.h>
 #include <openssl/rand.h>
 #include <openssl/err.h>
+#include <openssl/crypto.h>
+#include <openssl/kdf.h>
+#include <cstdio>
 #include <stdexcept>
 #include <vector>
 #include <iostream> // For error reporting during development
+#include <algorithm>
+#include <climits>
+#include <cstring>
+#include <mutex>
+#include <thread>
 
 namespace fintechx_core {
 
@@ -20,177 +28,186 @@ void handle_openssl_errors() {
     // throw std::runtime_error("OpenSSL error occurred");
 }
 
-std::optional<std::vector<unsigned char>> encrypt_aes_gcm(
-    const std::vector<unsigned char>& plaintext,
-    const std::vector<unsigned char>& key,
-    const std::vector<unsigned char>& iv,
-    const std::vector<unsigned char>& aad
-) {
-    // Basic validation
-    if (key.size() != 32 || iv.size() != 12) { // AES-256 key = 32 bytes, GCM recommended IV = 12 bytes
-        std::cerr << "Error: Invalid key or IV size." << std::endl;
-        return std::nullopt;
-    }
+namespace {
 
-    std::vector<unsigned char> ciphertext(plaintext.size()); // Ciphertext can be same size as plaintext for GCM
-    std::vector<unsigned char> tag(16); // GCM tag is typically 16 bytes
-    int len = 0;
-    int ciphertext_len = 0;
+constexpr size_t kGcmKeySize = 32;
+constexpr size_t kGcmIvSize = 12;
+constexpr size_t kGcmTagSize = 16;
 
-    EVP_CIPHER_CTX *ctx = EVP_CIPHER_CTX_new();
-    if (!ctx) {
-        handle_openssl_errors();
-        return std::nullopt;
-    }
+// Items per worker below which a batch stays on the calling thread
+constexpr size_t kMinGcmItemsPerWorker = 4096;
 
-    // Initialize encryption operation.
-    if (1 != EVP_EncryptInit_ex(ctx, EVP_aes_256_gcm(), NULL, NULL, NULL)) {
-        handle_openssl_errors();
-        EVP_CIPHER_CTX_free(ctx);
-        return std::nullopt;
-    }
+// EVP_*Update lengths are int; larger inputs (e.g. mapped files) are fed in pieces of at most this
+constexpr size_t kMaxUpdateSize = static_cast<size_t>(INT_MAX) & ~size_t{15};
 
-    // Set IV length (important for GCM)
-    if (1 != EVP_CIPHER_CTX_ctrl(ctx, EVP_CTRL_GCM_SET_IVLEN, iv.size(), NULL)) {
-         handle_openssl_errors();
-         EVP_CIPHER_CTX_free(ctx);
-         return std::nullopt;
-    }
+using CipherUpdateFn = int (*)(EVP_CIPHER_CTX*, unsigned char*, int*, const unsigned char*, int);
 
-    // Initialize key and IV
-    if (1 != EVP_EncryptInit_ex(ctx, NULL, NULL, key.data(), iv.data())) {
-        handle_openssl_errors();
-        EVP_CIPHER_CTX_free(ctx);
-        return std::nullopt;
+// Runs `update` over all of `in`, writing to `out` (nullptr for AAD); adds the bytes written to `written`
+bool update_all(CipherUpdateFn update, EVP_CIPHER_CTX* ctx, unsigned char* out, const unsigned char* in,
+                size_t size, size_t& written) {
+    while (size > 0) {
+        int piece = static_cast<int>(std::min(size, kMaxUpdateSize));
+        int len = 0;
+        if (1 != update(ctx, out ? out + written : nullptr, &len, in, piece)) {
+            return false;
+        }
+        if (out) {
+            written += static_cast<size_t>(len);
+        }
+        in += piece;
+        size -= static_cast<size_t>(piece);
     }
+    return true;
+}
 
-    // Provide AAD data if available
-    if (!aad.empty()) {
-        if (1 != EVP_EncryptUpdate(ctx, NULL, &len, aad.data(), aad.size())) {
+// Owns one EVP_CIPHER_CTX with the key schedule already expanded. Per-message calls only
+// reset the IV, so the key is set up once per context instead of once per message.
+class GcmContext {
+public:
+    GcmContext(const unsigned char* key, bool encrypt) : ctx_(EVP_CIPHER_CTX_new()) {
+        bool ok = ctx_ != nullptr;
+        if (ok && encrypt) {
+            ok = 1 == EVP_EncryptInit_ex(ctx_, EVP_aes_256_gcm(), NULL, NULL, NULL) &&
+                 1 == EVP_CIPHER_CTX_ctrl(ctx_, EVP_CTRL_GCM_SET_IVLEN, kGcmIvSize, NULL) &&
+                 1 == EVP_EncryptInit_ex(ctx_, NULL, NULL, key, NULL);
+        } else if (ok) {
+            ok = 1 == EVP_DecryptInit_ex(ctx_, EVP_aes_256_gcm(), NULL, NULL, NULL) &&
+                 1 == EVP_CIPHER_CTX_ctrl(ctx_, EVP_CTRL_GCM_SET_IVLEN, kGcmIvSize, NULL) &&
+                 1 == EVP_DecryptInit_ex(ctx_, NULL, NULL, key, NULL);
+        }
+        if (!ok) {
             handle_openssl_errors();
-            EVP_CIPHER_CTX_free(ctx);
-            return std::nullopt;
+            EVP_CIPHER_CTX_free(ctx_);
+            ctx_ = nullptr;
         }
     }
 
-    // Encrypt plaintext
-    if (1 != EVP_EncryptUpdate(ctx, ciphertext.data(), &len, plaintext.data(), plaintext.size())) {
-        handle_openssl_errors();
-        EVP_CIPHER_CTX_free(ctx);
-        return std::nullopt;
+    ~GcmContext() {
+        EVP_CIPHER_CTX_free(ctx_);
     }
-    ciphertext_len = len;
 
-    // Finalize encryption (handles padding, not needed for GCM but required call)
-    if (1 != EVP_EncryptFinal_ex(ctx, ciphertext.data() + len, &len)) {
-        handle_openssl_errors();
-        EVP_CIPHER_CTX_free(ctx);
-        return std::nullopt;
+    GcmContext(const GcmContext&) = delete;
+    GcmContext& operator=(const GcmContext&) = delete;
+
+    bool ok() const {
+        return ctx_ != nullptr;
     }
-    ciphertext_len += len;
 
-    // Get the authentication tag
-    if (1 != EVP_CIPHER_CTX_ctrl(ctx, EVP_CTRL_GCM_GET_TAG, tag.size(), tag.data())) {
-        handle_openssl_errors();
-        EVP_CIPHER_CTX_free(ctx);
-        return std::nullopt;
+    // Writes ciphertext followed by the 16-byte tag to `out`
+    bool seal(ByteSpan plaintext, const unsigned char* iv, ByteSpan aad, unsigned char* out) {
+        size_t len = 0;
+        if (1 != EVP_EncryptInit_ex(ctx_, NULL, NULL, NULL, iv)) {
+            return false;
+        }
+        if (!update_all(EVP_EncryptUpdate, ctx_, nullptr, aad.data, aad.size, len) ||
+            !update_all(EVP_EncryptUpdate, ctx_, out, plaintext.data, plaintext.size, len)) {
+            return false;
+        }
+        int final_len = 0;
+        if (1 != EVP_EncryptFinal_ex(ctx_, out + len, &final_len)) {
+            return false;
+        }
+        return 1 == EVP_CIPHER_CTX_ctrl(ctx_, EVP_CTRL_GCM_GET_TAG, kGcmTagSize, out + len + final_len);
     }
 
-    EVP_CIPHER_CTX_free(ctx);
+    // Reads ciphertext followed by the 16-byte tag; returns false if authentication fails
+    bool open(ByteSpan ciphertext_with_tag, const unsigned char* iv, ByteSpan aad, unsigned char* out) {
+        if (ciphertext_with_tag.size < kGcmTagSize) {
+            return false;
+        }
+        size_t ciphertext_len = ciphertext_with_tag.size - kGcmTagSize;
+        size_t len = 0;
+        if (1 != EVP_DecryptInit_ex(ctx_, NULL, NULL, NULL, iv)) {
+            return false;
+        }
+        if (!update_all(EVP_DecryptUpdate, ctx_, nullptr, aad.data, aad.size, len) ||
+            !update_all(EVP_DecryptUpdate, ctx_, out, ciphertext_with_tag.data, ciphertext_len, len)) {
+            return false;
+        }
+        // OpenSSL takes a non-const tag pointer but does not modify it
+        unsigned char* tag = const_cast<unsigned char*>(ciphertext_with_tag.data + ciphertext_len);
+        if (1 != EVP_CIPHER_CTX_ctrl(ctx_, EVP_CTRL_GCM_SET_TAG, kGcmTagSize, tag)) {
+            return false;
+        }
+        int final_len = 0;
+        return EVP_DecryptFinal_ex(ctx_, out + len, &final_len) > 0;
+    }
 
-    // Append tag to ciphertext
-    ciphertext.resize(ciphertext_len); // Adjust size if padding occurred (shouldn't for GCM)
-    ciphertext.insert(ciphertext.end(), tag.begin(), tag.end());
+private:
+    EVP_CIPHER_CTX* ctx_;
+};
 
-    return ciphertext;
-}
+} // namespace
 
-std::optional<std::vector<unsigned char>> decrypt_aes_gcm(
-    const std::vector<unsigned char>& ciphertext_with_tag,
-    const std::vector<unsigned char>& key,
-    const std::vector<unsigned char>& iv,
-    const std::vector<unsigned char>& aad
-) {
+bool encrypt_aes_gcm_into(ByteSpan plaintext, ByteSpan key, ByteSpan iv, ByteSpan aad, unsigned char* out) {
     // Basic validation
-    if (key.size() != 32 || iv.size() != 12 || ciphertext_with_tag.size() < 16) { // 16 bytes for the tag
-        std::cerr << "Error: Invalid key, IV, or ciphertext size." << std::endl;
-        return std::nullopt;
+    if (key.size != kGcmKeySize || iv.size != kGcmIvSize) { // AES-256 key = 32 bytes, GCM recommended IV = 12 bytes
+        std::cerr << "Error: Invalid key or IV size." << std::endl;
+        return false;
     }
 
-    size_t ciphertext_len = ciphertext_with_tag.size() - 16;
-    std::vector<unsigned char> ciphertext(ciphertext_with_tag.begin(), ciphertext_with_tag.begin() + ciphertext_len);
-    std::vector<unsigned char> tag(ciphertext_with_tag.end() - 16, ciphertext_with_tag.end());
-    std::vector<unsigned char> plaintext(ciphertext_len); // Max possible size
-    int len = 0;
-    int plaintext_len = 0;
-
-    EVP_CIPHER_CTX *ctx = EVP_CIPHER_CTX_new();
-    if (!ctx) {
-        handle_openssl_errors();
-        return std::nullopt;
+    GcmContext ctx(key.data, true);
+    if (!ctx.ok()) {
+        return false;
     }
-
-    // Initialize decryption operation
-    if (!EVP_DecryptInit_ex(ctx, EVP_aes_256_gcm(), NULL, NULL, NULL)) {
+    if (!ctx.seal(plaintext, iv.data, aad, out)) {
         handle_openssl_errors();
-        EVP_CIPHER_CTX_free(ctx);
-        return std::nullopt;
+        return false;
     }
+    return true;
+}
 
-    // Set IV length
-    if (!EVP_CIPHER_CTX_ctrl(ctx, EVP_CTRL_GCM_SET_IVLEN, iv.size(), NULL)) {
-        handle_openssl_errors();
-        EVP_CIPHER_CTX_free(ctx);
-        return std::nullopt;
+bool decrypt_aes_gcm_into(ByteSpan ciphertext_with_tag, ByteSpan key, ByteSpan iv, ByteSpan aad, unsigned char* out) {
+    // Basic validation
+    if (key.size != kGcmKeySize || iv.size != kGcmIvSize || ciphertext_with_tag.size < kGcmTagSize) {
+        std::cerr << "Error: Invalid key, IV, or ciphertext size." << std::endl;
+        return false;
     }
 
-    // Initialize key and IV
-    if (!EVP_DecryptInit_ex(ctx, NULL, NULL, key.data(), iv.data())) {
-        handle_openssl_errors();
-        EVP_CIPHER_CTX_free(ctx);
-        return std::nullopt;
+    GcmContext ctx(key.data, false);
+    if (!ctx.ok()) {
+        return false;
     }
-
-    // Provide AAD data if available
-    if (!aad.empty()) {
-        if (!EVP_DecryptUpdate(ctx, NULL, &len, aad.data(), aad.size())) {
-            handle_openssl_errors();
-            EVP_CIPHER_CTX_free(ctx);
-            return std::nullopt;
-        }
+    // Finalising verifies the tag; failure means tampering or the wrong key/IV/AAD
+    if (!ctx.open(ciphertext_with_tag, iv.data, aad, out)) {
+        handle_openssl_errors(); // Log the specific error if possible
+        std::cerr << "Error: AES-GCM decryption failed (likely tag mismatch)." << std::endl;
+        // `out` may be a caller's buffer that outlives this call; leave no unauthenticated plaintext in it
+        OPENSSL_cleanse(out, ciphertext_with_tag.size - kGcmTagSize);
+        return false;
     }
+    return true;
+}
 
-    // Decrypt ciphertext
-    if (!EVP_DecryptUpdate(ctx, plaintext.data(), &len, ciphertext.data(), ciphertext.size())) {
-        handle_openssl_errors();
-        EVP_CIPHER_CTX_free(ctx);
-        return std::nullopt;
-    }
-    plaintext_len = len;
+static ByteSpan as_span(const std::vector<unsigned char>& bytes) {
+    return ByteSpan{bytes.data(), bytes.size()};
+}
 
-    // Set expected tag value
-    if (!EVP_CIPHER_CTX_ctrl(ctx, EVP_CTRL_GCM_SET_TAG, tag.size(), tag.data())) {
-        handle_openssl_errors();
-        EVP_CIPHER_CTX_free(ctx);
+std::optional<std::vector<unsigned char>> encrypt_aes_gcm(
+    const std::vector<unsigned char>& plaintext,
+    const std::vector<unsigned char>& key,
+    const std::vector<unsigned char>& iv,
+    const std::vector<unsigned char>& aad
+) {
+    // Ciphertext is the same size as the plaintext for GCM, followed by the 16-byte tag
+    std::vector<unsigned char> ciphertext(plaintext.size() + kGcmTagSize);
+    if (!encrypt_aes_gcm_into(as_span(plaintext), as_span(key), as_span(iv), as_span(aad), ciphertext.data())) {
         return std::nullopt;
     }
+    return ciphertext;
+}
 
-    // Finalize decryption - crucial step that verifies the tag
-    int ret = EVP_DecryptFinal_ex(ctx, plaintext.data() + len, &len);
-
-    EVP_CIPHER_CTX_free(ctx);
-
-    if (ret > 0) {
-        // Success: Tag verified
-        plaintext_len += len;
-        plaintext.resize(plaintext_len);
-        return plaintext;
-    } else {
-        // Failure: Tag verification failed or other error
-        handle_openssl_errors(); // Log the specific error if possible
-        std::cerr << "Error: AES-GCM decryption failed (likely tag mismatch)." << std::endl;
+std::optional<std::vector<unsigned char>> decrypt_aes_gcm(
+    const std::vector<unsigned char>& ciphertext_with_tag,
+    const std::vector<unsigned char>& key,
+    const std::vector<unsigned char>& iv,
+    const std::vector<unsigned char>& aad
+) {
+    std::vector<unsigned char> plaintext(ciphertext_with_tag.size() >= kGcmTagSize ? ciphertext_with_tag.size() - kGcmTagSize : 0);
+    if (!decrypt_aes_gcm_into(as_span(ciphertext_with_tag), as_span(key), as_span(iv), as_span(aad), plaintext.data())) {
         return std::nullopt;
     }
+    return plaintext;
 }
 
 std::vector<unsigned char> generate_random_bytes(size_t length) {
@@ -227,5 +244,703 @@ std::vector<unsigned char> derive_key_pbkdf2(
     return derived_key;
 }
 
+std::vector<unsigned char> derive_key_hkdf(
+    const std::vector<unsigned char>& ikm,
+    const std::vector<unsigned char>& salt,
+    const std::vector<unsigned char>& info,
+    size_t key_length
+) {
+    std::vector<unsigned char> derived_key(key_length);
+    std::unique_ptr<EVP_PKEY_CTX, decltype(&EVP_PKEY_CTX_free)> ctx(
+        EVP_PKEY_CTX_new_id(EVP_PKEY_HKDF, nullptr), EVP_PKEY_CTX_free);
+    size_t out_len = key_length;
+    if (!ctx ||
+        EVP_PKEY_derive_init(ctx.get()) <= 0 ||
+        EVP_PKEY_CTX_set_hkdf_md(ctx.get(), EVP_sha256()) <= 0 ||
+        EVP_PKEY_CTX_set1_hkdf_salt(ctx.get(), salt.data(), static_cast<int>(salt.size())) <= 0 ||
+        EVP_PKEY_CTX_set1_hkdf_key(ctx.get(), ikm.data(), static_cast<int>(ikm.size())) <= 0 ||
+        EVP_PKEY_CTX_add1_hkdf_info(ctx.get(), info.data(), static_cast<int>(info.size())) <= 0 ||
+        EVP_PKEY_derive(ctx.get(), derived_key.data(), &out_len) <= 0 ||
+        out_len != key_length) {
+        handle_openssl_errors();
+        throw std::runtime_error("HKDF key derivation failed.");
+    }
+    return derived_key;
+}
+
+namespace {
+
+bool valid_batch_shape(const std::vector<unsigned char>& key, size_t count, const std::vector<ByteSpan>& ivs,
+                       const std::vector<ByteSpan>& aads) {
+    if (key.size() != kGcmKeySize || ivs.size() != count || (aads.size() != 0 && aads.size() != 1 && aads.size() != count)) {
+        return false;
+    }
+    return std::all_of(ivs.begin(), ivs.end(), [](const ByteSpan& iv) { return iv.size == kGcmIvSize; });
 }
 
+inline ByteSpan aad_for(const std::vector<ByteSpan>& aads, size_t i) {
+    if (aads.empty()) {
+        return ByteSpan{nullptr, 0};
+    }
+    return aads.size() == 1 ? aads[0] : aads[i];
+}
+
+// Runs fn(begin, end) over [0, count) on up to `threads` workers; returns false if any worker did
+template <typename Fn>
+bool run_gcm_workers(size_t count, unsigned threads, Fn&& fn) {
+    if (threads == 0) {
+        threads = std::max(1u, std::thread::hardware_concurrency());
+    }
+    size_t workers = std::min<size_t>(threads, std::max<size_t>(1, count / kMinGcmItemsPerWorker));
+    if (workers <= 1) {
+        return fn(size_t{0}, count);
+    }
+
+    std::vector<std::thread> pool;
+    std::vector<char> results(workers, 0);
+    size_t per_worker = (count + workers - 1) / workers;
+    for (size_t w = 1; w < workers; ++w) {
+        size_t begin = std::min(count, w * per_worker);
+        size_t end = std::min(count, begin + per_worker);
+        pool.emplace_back([&fn, &results, w, begin, end] { results[w] = fn(begin, end) ? 1 : 0; });
+    }
+    results[0] = fn(size_t{0}, std::min(count, per_worker)) ? 1 : 0;
+    for (auto& worker : pool) {
+        worker.join();
+    }
+    return std::all_of(results.begin(), results.end(), [](char ok) { return ok != 0; });
+}
+
+} // namespace
+
+bool encrypt_aes_gcm_batch(
+    const std::vector<unsigned char>& key,
+    const std::vector<ByteSpan>& plaintexts,
+    const std::vector<ByteSpan>& ivs,
+    const std::vector<ByteSpan>& aads,
+    unsigned char* out,
+    unsigned threads
+) {
+    const size_t count = plaintexts.size();
+    if (!valid_batch_shape(key, count, ivs, aads)) {
+        std::cerr << "Error: Invalid key, IV or AAD shape for batch encryption." << std::endl;
+        return false;
+    }
+
+    // Item i starts after all earlier ciphertexts and their tags
+    std::vector<size_t> out_offsets(count + 1, 0);
+    for (size_t i = 0; i < count; ++i) {
+        out_offsets[i + 1] = out_offsets[i] + plaintexts[i].size + kGcmTagSize;
+    }
+
+    return run_gcm_workers(count, threads, [&](size_t begin, size_t end) {
+        GcmContext ctx(key.data(), true);
+        if (!ctx.ok()) {
+            return false;
+        }
+        for (size_t i = begin; i < end; ++i) {
+            if (!ctx.seal(plaintexts[i], ivs[i].data, aad_for(aads, i), out + out_offsets[i])) {
+                handle_openssl_errors();
+                return false;
+            }
+        }
+        return true;
+    });
+}
+
+bool decrypt_aes_gcm_batch(
+    const std::vector<unsigned char>& key,
+    const std::vector<ByteSpan>& ciphertexts_with_tag,
+    const std::vector<ByteSpan>& ivs,
+    const std::vector<ByteSpan>& aads,
+    unsigned char* out,
+    uint8_t* ok,
+    unsigned threads
+) {
+    const size_t count = ciphertexts_with_tag.size();
+    if (!valid_batch_shape(key, count, ivs, aads)) {
+        std::cerr << "Error: Invalid key, IV or AAD shape for batch decryption." << std::endl;
+        return false;
+    }
+
+    // Item i starts after all earlier plaintexts; items shorter than a tag produce nothing
+    std::vector<size_t> out_offsets(count + 1, 0);
+    for (size_t i = 0; i < count; ++i) {
+        size_t size = ciphertexts_with_tag[i].size;
+        out_offsets[i + 1] = out_offsets[i] + (size >= kGcmTagSize ? size - kGcmTagSize : 0);
+    }
+
+    return run_gcm_workers(count, threads, [&](size_t begin, size_t end) {
+        GcmContext ctx(key.data(), false);
+        if (!ctx.ok()) {
+            return false;
+        }
+        for (size_t i = begin; i < end; ++i) {
+            ok[i] = ctx.open(ciphertexts_with_tag[i], ivs[i].data, aad_for(aads, i), out + out_offsets[i]) ? 1 : 0;
+            if (!ok[i]) {
+                // A failed tag leaves an OpenSSL error queued; drop it so it is not reported later
+                ERR_clear_error();
+                // Never hand back plaintext that did not authenticate
+                OPENSSL_cleanse(out + out_offsets[i], out_offsets[i + 1] - out_offsets[i]);
+            }
+        }
+        return true;
+    });
+}
+
+// --- Batch HMAC ---
+
+namespace {
+
+constexpr size_t kSha256BlockSize = 64;
+constexpr size_t kSha256DigestSize = 32;
+
+using MdCtxPtr = std::unique_ptr<EVP_MD_CTX, decltype(&EVP_MD_CTX_free)>;
+
+MdCtxPtr new_md_ctx() {
+    return MdCtxPtr(EVP_MD_CTX_new(), EVP_MD_CTX_free);
+}
+
+// SHA-256 states after absorbing (key ^ ipad) and (key ^ opad); every HMAC under the key
+// starts from copies of these
+struct HmacKeyState {
+    MdCtxPtr inner = new_md_ctx();
+    MdCtxPtr outer = new_md_ctx();
+
+    bool init(const std::vector<unsigned char>& key) {
+        unsigned char block[kSha256BlockSize] = {};
+        if (key.size() > kSha256BlockSize) {
+            unsigned int n = 0;
+            if (1 != EVP_Digest(key.data(), key.size(), block, &n, EVP_sha256(), nullptr)) {
+                return false;
+            }
+        } else {
+            std::memcpy(block, key.data(), key.size());
+        }
+        unsigned char ipad[kSha256BlockSize];
+        unsigned char opad[kSha256BlockSize];
+        for (size_t i = 0; i < kSha256BlockSize; ++i) {
+            ipad[i] = block[i] ^ 0x36;
+            opad[i] = block[i] ^ 0x5c;
+        }
+        bool ok = inner && outer &&
+                  1 == EVP_DigestInit_ex(inner.get(), EVP_sha256(), nullptr) &&
+                  1 == EVP_DigestUpdate(inner.get(), ipad, sizeof(ipad)) &&
+                  1 == EVP_DigestInit_ex(outer.get(), EVP_sha256(), nullptr) &&
+                  1 == EVP_DigestUpdate(outer.get(), opad, sizeof(opad));
+        OPENSSL_cleanse(block, sizeof(block));
+        OPENSSL_cleanse(ipad, sizeof(ipad));
+        OPENSSL_cleanse(opad, sizeof(opad));
+        return ok;
+    }
+};
+
+} // namespace
+
+bool hmac_sha256_batch(
+    const std::vector<unsigned char>& key,
+    const std::vector<ByteSpan>& messages,
+    size_t out_len,
+    unsigned char* out,
+    unsigned threads
+) {
+    if (out_len == 0 || out_len > kSha256DigestSize) {
+        std::cerr << "Error: HMAC output length must be 1 to 32 bytes." << std::endl;
+        return false;
+    }
+    HmacKeyState state;
+    if (!state.init(key)) {
+        handle_openssl_errors();
+        return false;
+    }
+
+    return run_gcm_workers(messages.size(), threads, [&](size_t begin, size_t end) {
+        MdCtxPtr ctx = new_md_ctx();
+        if (!ctx) {
+            return false;
+        }
+        unsigned char digest[kSha256DigestSize];
+        unsigned int n = 0;
+        for (size_t i = begin; i < end; ++i) {
+            if (1 != EVP_MD_CTX_copy_ex(ctx.get(), state.inner.get()) ||
+                1 != EVP_DigestUpdate(ctx.get(), messages[i].data, messages[i].size) ||
+                1 != EVP_DigestFinal_ex(ctx.get(), digest, &n) ||
+                1 != EVP_MD_CTX_copy_ex(ctx.get(), state.outer.get()) ||
+                1 != EVP_DigestUpdate(ctx.get(), digest, sizeof(digest)) ||
+                1 != EVP_DigestFinal_ex(ctx.get(), digest, &n)) {
+                handle_openssl_errors();
+                return false;
+            }
+            std::memcpy(out + i * out_len, digest, out_len);
+        }
+        return true;
+    });
+}
+
+// --- AesGcmCipher ---
+
+namespace {
+
+// NIST SP 800-38D caps random 96-bit IVs at 2^32 messages per key. Counter IVs cannot
+// repeat within one prefix, so their budget only guards against wrap-around.
+constexpr uint64_t kRandomIvBudget = uint64_t{1} << 32;
+constexpr uint64_t kCounterIvBudget = uint64_t{1} << 48;
+constexpr size_t kIvPrefixSize = 4;
+
+} // namespace
+
+struct AesGcmCipher::Impl {
+    Impl(const unsigned char* key, IvMode mode)
+        : encryptor(key, true), decryptor(key, false), mode(mode),
+          budget(mode == IvMode::Counter ? kCounterIvBudget : kRandomIvBudget) {}
+
+    GcmContext encryptor;
+    GcmContext decryptor;
+    IvMode mode;
+    uint64_t budget;
+    uint64_t used = 0; // Counter mode: the next counter value
+    unsigned char iv_prefix[kIvPrefixSize] = {};
+    std::mutex encrypt_mutex;
+    std::mutex decrypt_mutex;
+};
+
+AesGcmCipher::AesGcmCipher(std::vector<unsigned char> key, IvMode mode, ByteSpan iv_prefix, uint64_t counter_start) {
+    const char* error = nullptr;
+    if (key.size() != kGcmKeySize) {
+        error = "AES-256-GCM key must be 32 bytes";
+    } else if (mode == IvMode::Counter && iv_prefix.size != kIvPrefixSize) {
+        error = "counter IV mode needs a 4-byte IV prefix unique to this key";
+    } else if (mode == IvMode::Counter && counter_start >= kCounterIvBudget) {
+        error = "counter start is beyond the IV budget";
+    } else if (mode == IvMode::Random && (iv_prefix.size != 0 || counter_start != 0)) {
+        error = "IV prefix and counter start only apply to counter IV mode";
+    }
+    if (error) {
+        OPENSSL_cleanse(key.data(), key.size());
+        throw std::invalid_argument(error);
+    }
+    impl_ = std::make_unique<Impl>(key.data(), mode);
+    // The contexts hold the expanded key from here on; wipe our copy of the raw key
+    OPENSSL_cleanse(key.data(), key.size());
+
+    if (!impl_->encryptor.ok() || !impl_->decryptor.ok()) {
+        throw std::runtime_error("Failed to initialise AES-256-GCM context");
+    }
+    if (mode == IvMode::Counter) {
+        std::memcpy(impl_->iv_prefix, iv_prefix.data, kIvPrefixSize);
+        impl_->used = counter_start;
+    }
+}
+
+// Contexts are freed (and their key schedules cleansed by OpenSSL) by GcmContext's destructor
+AesGcmCipher::~AesGcmCipher() = default;
+
+void AesGcmCipher::encrypt_into(ByteSpan plaintext, ByteSpan aad, unsigned char* out) {
+    std::lock_guard<std::mutex> lock(impl_->encrypt_mutex);
+    if (impl_->used >= impl_->budget) {
+        throw std::runtime_error("IV budget of this cipher is exhausted; rotate the key");
+    }
+
+    unsigned char* iv = out;
+    if (impl_->mode == IvMode::Counter) {
+        // Caller-reserved 32-bit prefix || 64-bit big-endian message counter
+        std::memcpy(iv, impl_->iv_prefix, sizeof(impl_->iv_prefix));
+        uint64_t counter = impl_->used;
+        for (int i = 11; i >= 4; --i) {
+            iv[i] = static_cast<unsigned char>(counter & 0xFF);
+            counter >>= 8;
+        }
+    } else if (1 != RAND_bytes(iv, kGcmIvSize)) {
+        handle_openssl_errors();
+        throw std::runtime_error("Failed to generate IV");
+    }
+    ++impl_->used;
+
+    if (!impl_->encryptor.seal(plaintext, iv, aad, out + kGcmIvSize)) {
+        handle_openssl_errors();
+        throw std::runtime_error("AES-GCM encryption failed");
+    }
+}
+
+bool AesGcmCipher::decrypt_into(ByteSpan sealed, ByteSpan aad, unsigned char* out) {
+    if (sealed.size < overhead) {
+        return false;
+    }
+    std::lock_guard<std::mutex> lock(impl_->decrypt_mutex);
+    ByteSpan ciphertext_with_tag{sealed.data + kGcmIvSize, sealed.size - kGcmIvSize};
+    if (!impl_->decryptor.open(ciphertext_with_tag, sealed.data, aad, out)) {
+        ERR_clear_error();
+        OPENSSL_cleanse(out, sealed.size - overhead); // No unauthenticated plaintext left behind
+        return false;
+    }
+    return true;
+}
+
+std::vector<unsigned char> AesGcmCipher::encrypt(ByteSpan plaintext, ByteSpan aad) {
+    std::vector<unsigned char> sealed(plaintext.size + overhead);
+    encrypt_into(plaintext, aad, sealed.data());
+    return sealed;
+}
+
+std::optional<std::vector<unsigned char>> AesGcmCipher::decrypt(ByteSpan sealed, ByteSpan aad) {
+    if (sealed.size < overhead) {
+        return std::nullopt;
+    }
+    std::vector<unsigned char> plaintext(sealed.size - overhead);
+    if (!decrypt_into(sealed, aad, plaintext.data())) {
+        return std::nullopt;
+    }
+    return plaintext;
+}
+
+uint64_t AesGcmCipher::messages_remaining() const {
+    std::lock_guard<std::mutex> lock(impl_->encrypt_mutex);
+    return impl_->budget - impl_->used;
+}
+
+uint64_t AesGcmCipher::next_counter() const {
+    std::lock_guard<std::mutex> lock(impl_->encrypt_mutex);
+    return impl_->mode == IvMode::Counter ? impl_->used : 0;
+}
+
+// --- Chunked streaming AES-GCM ---
+
+namespace {
+
+constexpr unsigned char kStreamMagic[4] = {'F', 'X', 'S', '1'};
+constexpr size_t kStreamIdSize = 8;
+constexpr size_t kFrameHeaderSize = 1 + 4 + kGcmIvSize; // flags, length, nonce
+constexpr unsigned char kFinalFrameFlag = 0x01;
+
+void put_u32_be(unsigned char* out, uint32_t value) {
+    out[0] = static_cast<unsigned char>(value >> 24);
+    out[1] = static_cast<unsigned char>(value >> 16);
+    out[2] = static_cast<unsigned char>(value >> 8);
+    out[3] = static_cast<unsigned char>(value);
+}
+
+uint32_t get_u32_be(const unsigned char* in) {
+    return (uint32_t{in[0]} << 24) | (uint32_t{in[1]} << 16) | (uint32_t{in[2]} << 8) | uint32_t{in[3]};
+}
+
+// Nonce for frame `index`: stream id || big-endian frame index
+void frame_nonce(const unsigned char* stream_id, uint32_t index, unsigned char* nonce) {
+    std::memcpy(nonce, stream_id, kStreamIdSize);
+    put_u32_be(nonce + kStreamIdSize, index);
+}
+
+// AAD for a frame: the stream header followed by the frame's flags byte
+void frame_aad(const unsigned char* header, unsigned char flags, unsigned char* aad) {
+    std::memcpy(aad, header, GcmStreamEncryptor::header_size);
+    aad[GcmStreamEncryptor::header_size] = flags;
+}
+
+} // namespace
+
+struct GcmStreamEncryptor::Impl {
+    explicit Impl(const unsigned char* key) : ctx(key, true) {}
+
+    GcmContext ctx;
+    size_t chunk_size = 0;
+    unsigned char header[header_size] = {};
+    bool header_written = false;
+    bool finalized = false;
+    uint32_t next_index = 0;
+    std::vector<unsigned char> pending;
+};
+
+GcmStreamEncryptor::GcmStreamEncryptor(std::vector<unsigned char> key, size_t chunk_size) {
+    if (key.size() != kGcmKeySize || chunk_size == 0 || chunk_size > max_chunk_size) {
+        OPENSSL_cleanse(key.data(), key.size());
+        throw std::invalid_argument("stream encryption needs a 32-byte key and a chunk size of 1 byte to 16 MiB");
+    }
+    impl_ = std::make_unique<Impl>(key.data());
+    OPENSSL_cleanse(key.data(), key.size());
+    if (!impl_->ctx.ok()) {
+        throw std::runtime_error("Failed to initialise AES-256-GCM context");
+    }
+
+    impl_->chunk_size = chunk_size;
+    std::memcpy(impl_->header, kStreamMagic, sizeof(kStreamMagic));
+    put_u32_be(impl_->header + 4, static_cast<uint32_t>(chunk_size));
+    if (1 != RAND_bytes(impl_->header + 8, kStreamIdSize)) {
+        handle_openssl_errors();
+        throw std::runtime_error("Failed to generate stream id");
+    }
+    impl_->pending.reserve(chunk_size);
+}
+
+GcmStreamEncryptor::~GcmStreamEncryptor() = default;
+
+void GcmStreamEncryptor::seal_frame(ByteSpan chunk, bool final, std::vector<unsigned char>& out) {
+    if (impl_->next_index == UINT32_MAX) {
+        throw std::length_error("stream exceeds the maximum number of frames");
+    }
+    unsigned char flags = final ? kFinalFrameFlag : 0x00;
+    unsigned char aad[header_size + 1];
+    frame_aad(impl_->header, flags, aad);
+
+    size_t start = out.size();
+    out.resize(start + kFrameHeaderSize + chunk.size + kGcmTagSize);
+    unsigned char* frame = out.data() + start;
+    frame[0] = flags;
+    put_u32_be(frame + 1, static_cast<uint32_t>(chunk.size));
+    frame_nonce(impl_->header + 8, impl_->next_index++, frame + 5);
+
+    if (!impl_->ctx.seal(chunk, frame + 5, ByteSpan{aad, sizeof(aad)}, frame + kFrameHeaderSize)) {
+        handle_openssl_errors();
+        throw std::runtime_error("AES-GCM stream encryption failed");
+    }
+}
+
+void GcmStreamEncryptor::update(ByteSpan data, std::vector<unsigned char>& out) {
+    if (impl_->finalized) {
+        throw std::logic_error("update() called after finalize()");
+    }
+    if (!impl_->header_written) {
+        out.insert(out.end(), impl_->header, impl_->header + header_size);
+        impl_->header_written = true;
+    }
+
+    const size_t chunk_size = impl_->chunk_size;
+    size_t pos = 0;
+    // A chunk is only sealed once a byte beyond it exists, so the last chunk is always
+    // the one finalize() marks as final
+    if (!impl_->pending.empty()) {
+        size_t take = std::min(chunk_size - impl_->pending.size(), data.size);
+        impl_->pending.insert(impl_->pending.end(), data.data, data.data + take);
+        pos = take;
+        if (pos == data.size) {
+            return;
+        }
+        seal_frame(ByteSpan{impl_->pending.data(), impl_->pending.size()}, false, out);
+        impl_->pending.clear();
+    }
+    // Whole chunks are sealed straight from the caller's buffer
+    while (data.size - pos > chunk_size) {
+        seal_frame(ByteSpan{data.data + pos, chunk_size}, false, out);
+        pos += chunk_size;
+    }
+    impl_->pending.assign(data.data + pos, data.data + data.size);
+}
+
+void GcmStreamEncryptor::finalize(std::vector<unsigned char>& out) {
+    if (impl_->finalized) {
+        throw std::logic_error("finalize() called twice");
+    }
+    if (!impl_->header_written) {
+        out.insert(out.end(), impl_->header, impl_->header + header_size);
+        impl_->header_written = true;
+    }
+    seal_frame(ByteSpan{impl_->pending.data(), impl_->pending.size()}, true, out);
+    OPENSSL_cleanse(impl_->pending.data(), impl_->pending.size());
+    impl_->pending.clear();
+    impl_->finalized = true;
+}
+
+size_t GcmStreamEncryptor::chunk_size() const {
+    return impl_->chunk_size;
+}
+
+struct GcmStreamDecryptor::Impl {
+    explicit Impl(const unsigned char* key) : ctx(key, false) {}
+
+    GcmContext ctx;
+    unsigned char header[GcmStreamEncryptor::header_size] = {};
+    size_t header_bytes = 0;
+    size_t chunk_size = 0;
+    bool seen_final = false;
+    uint32_t next_index = 0;
+    std::vector<unsigned char> pending;
+};
+
+GcmStreamDecryptor::GcmStreamDecryptor(std::vector<unsigned char> key) {
+    if (key.size() != kGcmKeySize) {
+        OPENSSL_cleanse(key.data(), key.size());
+        throw std::invalid_argument("AES-256-GCM key must be 32 bytes");
+    }
+    impl_ = std::make_unique<Impl>(key.data());
+    OPENSSL_cleanse(key.data(), key.size());
+    if (!impl_->ctx.ok()) {
+        throw std::runtime_error("Failed to initialise AES-256-GCM context");
+    }
+}
+
+GcmStreamDecryptor::~GcmStreamDecryptor() = default;
+
+// Size of the frame starting at `frame` (at least kFrameHeaderSize bytes), validated against the stream
+size_t GcmStreamDecryptor::frame_size(const unsigned char* frame) const {
+    unsigned char flags = frame[0];
+    size_t length = get_u32_be(frame + 1);
+    if ((flags & ~kFinalFrameFlag) != 0 || length > impl_->chunk_size ||
+        (!(flags & kFinalFrameFlag) && length != impl_->chunk_size)) {
+        throw GcmAuthenticationError("malformed stream frame");
+    }
+    return kFrameHeaderSize + length + kGcmTagSize;
+}
+
+void GcmStreamDecryptor::open_frame(const unsigned char* frame, std::vector<unsigned char>& out) {
+    if (impl_->seen_final) {
+        throw GcmAuthenticationError("data after the final stream frame");
+    }
+    unsigned char flags = frame[0];
+    size_t length = get_u32_be(frame + 1);
+
+    // The nonce is carried in the frame but must be the one this position in the stream expects
+    unsigned char expected_nonce[kGcmIvSize];
+    frame_nonce(impl_->header + 8, impl_->next_index, expected_nonce);
+    if (CRYPTO_memcmp(expected_nonce, frame + 5, kGcmIvSize) != 0) {
+        throw GcmAuthenticationError("stream frame out of order or from another stream");
+    }
+
+    unsigned char aad[GcmStreamEncryptor::header_size + 1];
+    frame_aad(impl_->header, flags, aad);
+
+    size_t start = out.size();
+    out.resize(start + length);
+    if (!impl_->ctx.open(ByteSpan{frame + kFrameHeaderSize, length + kGcmTagSize}, frame + 5,
+                         ByteSpan{aad, sizeof(aad)}, out.data() + start)) {
+        ERR_clear_error();
+        OPENSSL_cleanse(out.data() + start, length);
+        out.resize(start);
+        throw GcmAuthenticationError("stream frame failed authentication");
+    }
+    ++impl_->next_index;
+    impl_->seen_final = (flags & kFinalFrameFlag) != 0;
+}
+
+void GcmStreamDecryptor::update(ByteSpan data, std::vector<unsigned char>& out) {
+    size_t pos = 0;
+
+    if (impl_->header_bytes < GcmStreamEncryptor::header_size) {
+        size_t take = std::min(GcmStreamEncryptor::header_size - impl_->header_bytes, data.size);
+        std::memcpy(impl_->header + impl_->header_bytes, data.data, take);
+        impl_->header_bytes += take;
+        pos = take;
+        if (impl_->header_bytes < GcmStreamEncryptor::header_size) {
+            return;
+        }
+        if (std::memcmp(impl_->header, kStreamMagic, sizeof(kStreamMagic)) != 0) {
+            throw GcmAuthenticationError("not an encrypted stream (bad magic)");
+        }
+        impl_->chunk_size = get_u32_be(impl_->header + 4);
+        if (impl_->chunk_size == 0 || impl_->chunk_size > GcmStreamEncryptor::max_chunk_size) {
+            throw GcmAuthenticationError("malformed stream header");
+        }
+    }
+
+    // Finish a frame that straddled the previous call
+    if (!impl_->pending.empty()) {
+        while (pos < data.size) {
+            size_t needed = impl_->pending.size() < kFrameHeaderSize
+                ? kFrameHeaderSize - impl_->pending.size()
+                : frame_size(impl_->pending.data()) - impl_->pending.size();
+            size_t take = std::min(needed, data.size - pos);
+            impl_->pending.insert(impl_->pending.end(), data.data + pos, data.data + pos + take);
+            pos += take;
+            if (impl_->pending.size() >= kFrameHeaderSize && impl_->pending.size() == frame_size(impl_->pending.data())) {
+                open_frame(impl_->pending.data(), out);
+                impl_->pending.clear();
+                break;
+            }
+        }
+        if (!impl_->pending.empty()) {
+            return;
+        }
+    }
+
+    // Frames wholly inside the caller's buffer are opened in place
+    while (data.size - pos >= kFrameHeaderSize) {
+        size_t size = frame_size(data.data + pos);
+        if (data.size - pos < size) {
+            break;
+        }
+        open_frame(data.data + pos, out);
+        pos += size;
+    }
+    impl_->pending.assign(data.data + pos, data.data + data.size);
+}
+
+void GcmStreamDecryptor::finalize() {
+    if (!impl_->seen_final || !impl_->pending.empty()) {
+        throw GcmAuthenticationError("stream is truncated (no final frame)");
+    }
+}
+
+namespace {
+
+constexpr size_t kFileReadSize = 1 << 20;
+
+struct FileCloser {
+    void operator()(std::FILE* f) const {
+        if (f) {
+            std::fclose(f);
+        }
+    }
+};
+using FilePtr = std::unique_ptr<std::FILE, FileCloser>;
+
+FilePtr open_file(const std::string& path, const char* mode) {
+    FilePtr file(std::fopen(path.c_str(), mode));
+    if (!file) {
+        throw std::runtime_error("Cannot open " + path);
+    }
+    return file;
+}
+
+void write_all(std::FILE* file, const std::vector<unsigned char>& data, const std::string& path) {
+    if (!data.empty() && std::fwrite(data.data(), 1, data.size(), file) != data.size()) {
+        throw std::runtime_error("Failed writing " + path);
+    }
+}
+
+// Streams `src` through `step(block, out)` into `dst`, via a temporary file renamed on success
+template <typename Step, typename Finish>
+void transform_file(const std::string& src, const std::string& dst, Step&& step, Finish&& finish) {
+    const std::string tmp = dst + ".part";
+    try {
+        FilePtr in = open_file(src, "rb");
+        FilePtr out = open_file(tmp, "wb");
+        std::vector<unsigned char> block(kFileReadSize);
+        std::vector<unsigned char> output;
+        size_t n;
+        while ((n = std::fread(block.data(), 1, block.size(), in.get())) > 0) {
+            output.clear();
+            step(ByteSpan{block.data(), n}, output);
+            write_all(out.get(), output, tmp);
+        }
+        if (std::ferror(in.get())) {
+            throw std::runtime_error("Failed reading " + src);
+        }
+        output.clear();
+        finish(output);
+        write_all(out.get(), output, tmp);
+        if (std::fclose(out.release()) != 0) {
+            throw std::runtime_error("Failed writing " + tmp);
+        }
+        if (std::rename(tmp.c_str(), dst.c_str()) != 0) {
+            throw std::runtime_error("Cannot rename " + tmp + " to " + dst);
+        }
+    } catch (...) {
+        std::remove(tmp.c_str());
+        throw;
+    }
+}
+
+} // namespace
+
+void encrypt_file(const std::string& src, const std::string& dst, std::vector<unsigned char> key, size_t chunk_size) {
+    GcmStreamEncryptor encryptor(std::move(key), chunk_size);
+    transform_file(src, dst,
+                   [&](ByteSpan block, std::vector<unsigned char>& out) { encryptor.update(block, out); },
+                   [&](std::vector<unsigned char>& out) { encryptor.finalize(out); });
+}
+
+void decrypt_file(const std::string& src, const std::string& dst, std::vector<unsigned char> key) {
+    GcmStreamDecryptor decryptor(std::move(key));
+    transform_file(src, dst,
+                   [&](ByteSpan block, std::vector<unsigned char>& out) { decryptor.update(block, out); },
+                   [&](std::vector<unsigned char>&) { decryptor.finalize(); });
+}
+
+}
@@ -4,108 +4,981 @@
 #include <random>
 #include <stdexcept>
 #include <vector>
-#include <chrono>
+#include <cstdint>
+#include <cstring>
+#include <functional>
+#include <unordered_map>
+#include <mutex>
+#include <thread>
+#include <unordered_set>
+
+// SSSE3/AVX2 Luhn kernels are compiled with per-function target attributes and picked at runtime
+#if (defined(__x86_64__) || defined(__i386__)) && (defined(__GNUC__) || defined(__clang__))
+#define FINTECHX_LUHN_X86_SIMD 1
+#include <immintrin.h>
+#endif
 
 namespace fintechx_core {
 
+// --- Luhn kernels ---
+//
+// Every kernel works from a precomputed weight table indexed by the raw byte, so the
+// per-digit work is a load and an add: no alternate flag, multiply or conditional subtract.
+// Non-digit bytes weigh zero and are flagged separately.
+
+namespace {
+
+// kLuhnWeight[doubled][byte]: contribution of a digit byte to the Luhn sum
+struct LuhnWeightTable {
+    uint8_t weight[2][256];
+
+    constexpr LuhnWeightTable() : weight{} {
+        for (int d = 0; d < 10; ++d) {
+            weight[0]['0' + d] = static_cast<uint8_t>(d);
+            weight[1]['0' + d] = static_cast<uint8_t>(d < 5 ? d * 2 : d * 2 - 9);
+        }
+    }
+};
+
+constexpr LuhnWeightTable kLuhnWeight{};
+
+inline unsigned is_not_digit(char c) {
+    return static_cast<unsigned char>(c - '0') > 9;
+}
+
+// Luhn-weighted sum of digits[0..n). `shift` is 1 when the rightmost digit is doubled
+// (computing a check digit) and 0 when it is the check digit itself (validating).
+inline unsigned luhn_sum(const char* digits, size_t n, unsigned shift, unsigned& bad) {
+    unsigned sum = 0;
+    for (size_t i = 0; i < n; ++i) {
+        unsigned char c = static_cast<unsigned char>(digits[i]);
+        bad |= is_not_digit(digits[i]);
+        sum += kLuhnWeight.weight[(n - 1 - i + shift) & 1][c];
+    }
+    return sum;
+}
+
+inline bool luhn_valid_scalar(const char* digits, size_t n) {
+    if (n == 0) {
+        return false;
+    }
+    unsigned bad = 0;
+    unsigned sum = luhn_sum(digits, n, 0, bad);
+    return !bad && (sum % 10 == 0);
+}
+
+// Strips trailing padding (NUL for NumPy 'S' arrays, space for fixed-width files)
+inline size_t row_length(const char* row, size_t width, const int64_t* lengths, size_t r) {
+    if (lengths) {
+        int64_t len = lengths[r];
+        return len <= 0 ? 0 : std::min(static_cast<size_t>(len), width);
+    }
+    size_t n = width;
+    while (n > 0 && (row[n - 1] == '\0' || row[n - 1] == ' ')) {
+        --n;
+    }
+    return n;
+}
+
+void luhn_batch_scalar(const char* data, size_t rows, size_t row_stride, size_t width,
+                       const int64_t* lengths, uint8_t* results) {
+    for (size_t r = 0; r < rows; ++r) {
+        const char* row = data + r * row_stride;
+        results[r] = luhn_valid_scalar(row, row_length(row, width, lengths, r)) ? 1 : 0;
+    }
+}
+
+#ifdef FINTECHX_LUHN_X86_SIMD
+
+// Lane masks for a 16-byte window. Index n < 16 is a PAN of n digits loaded from its
+// first byte; index 16 is a full window right-aligned on the check digit.
+struct LuhnLaneMasks {
+    alignas(16) uint8_t valid[17][16];
+    alignas(16) uint8_t doubled[17][16];
+
+    constexpr LuhnLaneMasks() : valid{}, doubled{} {
+        for (int n = 0; n <= 16; ++n) {
+            for (int j = 0; j < 16; ++j) {
+                int in_pan = j < n || n == 16;
+                int from_right = (n == 16 ? 15 : n - 1) - j;
+                valid[n][j] = in_pan ? 0xFF : 0x00;
+                doubled[n][j] = (in_pan && (from_right & 1)) ? 0xFF : 0x00;
+            }
+        }
+    }
+};
+
+constexpr LuhnLaneMasks kLuhnLaneMasks{};
+
+inline size_t window_index(size_t n) {
+    return n < 16 ? n : 16;
+}
+
+// Weighted digit sums of one or two 16-byte windows, as 64-bit partial sums from psadbw.
+// `bad` collects any lane holding a non-digit.
+__attribute__((target("ssse3")))
+inline __m128i luhn_window_sse(__m128i bytes, __m128i valid, __m128i doubled, __m128i& bad) {
+    const __m128i nine = _mm_set1_epi8(9);
+    const __m128i lut = _mm_setr_epi8(0, 2, 4, 6, 8, 1, 3, 5, 7, 9, 0, 0, 0, 0, 0, 0);
+    __m128i d = _mm_and_si128(_mm_sub_epi8(bytes, _mm_set1_epi8('0')), valid);
+    bad = _mm_or_si128(bad, _mm_xor_si128(_mm_max_epu8(d, nine), nine));
+    __m128i twice = _mm_shuffle_epi8(lut, d);
+    d = _mm_or_si128(_mm_and_si128(doubled, twice), _mm_andnot_si128(doubled, d));
+    return _mm_sad_epu8(d, _mm_setzero_si128());
+}
+
+__attribute__((target("avx2")))
+inline __m256i luhn_window_avx2(__m256i bytes, __m256i valid, __m256i doubled, __m256i& bad) {
+    const __m256i nine = _mm256_set1_epi8(9);
+    const __m256i lut = _mm256_setr_epi8(0, 2, 4, 6, 8, 1, 3, 5, 7, 9, 0, 0, 0, 0, 0, 0,
+                                         0, 2, 4, 6, 8, 1, 3, 5, 7, 9, 0, 0, 0, 0, 0, 0);
+    __m256i d = _mm256_and_si256(_mm256_sub_epi8(bytes, _mm256_set1_epi8('0')), valid);
+    bad = _mm256_or_si256(bad, _mm256_xor_si256(_mm256_max_epu8(d, nine), nine));
+    __m256i twice = _mm256_shuffle_epi8(lut, d);
+    d = _mm256_or_si256(_mm256_and_si256(doubled, twice), _mm256_andnot_si256(doubled, d));
+    return _mm256_sad_epu8(d, _mm256_setzero_si256());
+}
+
+// Validates one row with 16-byte windows. Requires row[0..max(n, 16)) to be readable.
+__attribute__((target("ssse3")))
+bool luhn_row_ssse3(const char* row, size_t n) {
+    if (n == 0) {
+        return false;
+    }
+
+    __m128i bad = _mm_setzero_si128();
+    __m128i acc = _mm_setzero_si128();
+    unsigned scalar_bad = 0;
+    unsigned sum = 0;
+
+    if (n < 16) {
+        __m128i bytes = _mm_loadu_si128(reinterpret_cast<const __m128i*>(row));
+        acc = luhn_window_sse(bytes,
+                              _mm_load_si128(reinterpret_cast<const __m128i*>(kLuhnLaneMasks.valid[n])),
+                              _mm_load_si128(reinterpret_cast<const __m128i*>(kLuhnLaneMasks.doubled[n])),
+                              bad);
+    } else {
+        const __m128i valid = _mm_load_si128(reinterpret_cast<const __m128i*>(kLuhnLaneMasks.valid[16]));
+        const __m128i doubled = _mm_load_si128(reinterpret_cast<const __m128i*>(kLuhnLaneMasks.doubled[16]));
+        size_t end = n;
+        // Windows are multiples of 16 digits from the right, so they share one parity pattern
+        while (end >= 16) {
+            __m128i bytes = _mm_loadu_si128(reinterpret_cast<const __m128i*>(row + end - 16));
+            acc = _mm_add_epi64(acc, luhn_window_sse(bytes, valid, doubled, bad));
+            end -= 16;
+        }
+        sum = luhn_sum(row, end, static_cast<unsigned>((n - end) & 1), scalar_bad);
+    }
+
+    sum += static_cast<unsigned>(_mm_cvtsi128_si64(acc) + _mm_cvtsi128_si64(_mm_unpackhi_epi64(acc, acc)));
+    bool all_digits = _mm_movemask_epi8(_mm_cmpeq_epi8(bad, _mm_setzero_si128())) == 0xFFFF;
+    return all_digits && !scalar_bad && (sum % 10 == 0);
+}
+
+__attribute__((target("ssse3")))
+void luhn_batch_ssse3(const char* data, size_t rows, size_t row_stride, size_t width,
+                      const int64_t* lengths, uint8_t* results) {
+    for (size_t r = 0; r < rows; ++r) {
+        const char* row = data + r * row_stride;
+        results[r] = luhn_row_ssse3(row, row_length(row, width, lengths, r)) ? 1 : 0;
+    }
+}
+
+// Two rows per 256-bit register. Rows longer than one window go through the SSSE3 kernel.
+__attribute__((target("avx2")))
+void luhn_batch_avx2(const char* data, size_t rows, size_t row_stride, size_t width,
+                     const int64_t* lengths, uint8_t* results) {
+    size_t r = 0;
+    for (; r + 1 < rows; r += 2) {
+        const char* row_a = data + r * row_stride;
+        const char* row_b = row_a + row_stride;
+        size_t n_a = row_length(row_a, width, lengths, r);
+        size_t n_b = row_length(row_b, width, lengths, r + 1);
+
+        if (n_a == 0 || n_b == 0 || n_a > 16 || n_b > 16) {
+            results[r] = luhn_row_ssse3(row_a, n_a) ? 1 : 0;
+            results[r + 1] = luhn_row_ssse3(row_b, n_b) ? 1 : 0;
+            continue;
+        }
+
+        size_t w_a = window_index(n_a);
+        size_t w_b = window_index(n_b);
+        // A full 16-digit row loads from its first byte, which is its right-aligned window
+        __m256i bytes = _mm256_inserti128_si256(
+            _mm256_castsi128_si256(_mm_loadu_si128(reinterpret_cast<const __m128i*>(row_a))),
+            _mm_loadu_si128(reinterpret_cast<const __m128i*>(row_b)), 1);
+        __m256i valid = _mm256_inserti128_si256(
+            _mm256_castsi128_si256(_mm_load_si128(reinterpret_cast<const __m128i*>(kLuhnLaneMasks.valid[w_a]))),
+            _mm_load_si128(reinterpret_cast<const __m128i*>(kLuhnLaneMasks.valid[w_b])), 1);
+        __m256i doubled = _mm256_inserti128_si256(
+            _mm256_castsi128_si256(_mm_load_si128(reinterpret_cast<const __m128i*>(kLuhnLaneMasks.doubled[w_a]))),
+            _mm_load_si128(reinterpret_cast<const __m128i*>(kLuhnLaneMasks.doubled[w_b])), 1);
+
+        __m256i bad = _mm256_setzero_si256();
+        __m256i sums = luhn_window_avx2(bytes, valid, doubled, bad);
+        unsigned bad_mask = static_cast<unsigned>(
+            _mm256_movemask_epi8(_mm256_cmpeq_epi8(bad, _mm256_setzero_si256())));
+
+        alignas(32) uint64_t lanes[4];
+        _mm256_store_si256(reinterpret_cast<__m256i*>(lanes), sums);
+        results[r] = ((bad_mask & 0xFFFFu) == 0xFFFFu && (lanes[0] + lanes[1]) % 10 == 0) ? 1 : 0;
+        results[r + 1] = ((bad_mask >> 16) == 0xFFFFu && (lanes[2] + lanes[3]) % 10 == 0) ? 1 : 0;
+    }
+    for (; r < rows; ++r) {
+        const char* row = data + r * row_stride;
+        results[r] = luhn_row_ssse3(row, row_length(row, width, lengths, r)) ? 1 : 0;
+    }
+}
+
+#endif // FINTECHX_LUHN_X86_SIMD
+
+using LuhnBatchKernel = void (*)(const char*, size_t, size_t, size_t, const int64_t*, uint8_t*);
+using LuhnRowKernel = bool (*)(const char*, size_t);
+
+struct LuhnDispatch {
+    LuhnBatchKernel kernel;
+    // Single-row kernel; requires 16 readable bytes from the row start unless it is the scalar one
+    LuhnRowKernel row;
+    bool row_needs_window;
+    const char* name;
+};
+
+// Picks the widest kernel the running CPU supports, once per process
+const LuhnDispatch& luhn_dispatch() {
+    static const LuhnDispatch dispatch = [] {
+#ifdef FINTECHX_LUHN_X86_SIMD
+        __builtin_cpu_init();
+        if (__builtin_cpu_supports("avx2")) {
+            return LuhnDispatch{luhn_batch_avx2, luhn_row_ssse3, true, "avx2"};
+        }
+        if (__builtin_cpu_supports("ssse3")) {
+            return LuhnDispatch{luhn_batch_ssse3, luhn_row_ssse3, true, "ssse3"};
+        }
+#endif
+        return LuhnDispatch{luhn_batch_scalar, luhn_valid_scalar, false, "scalar"};
+    }();
+    return dispatch;
+}
+
+} // namespace
+
 // Helper function to check if a string contains only digits
 bool is_digits(const std::string &str) {
-    return std::all_of(str.begin(), str.end(), ::isdigit);
+    return std::all_of(str.begin(), str.end(), [](unsigned char c) { return c >= '0' && c <= '9'; });
 }
 
 // Luhn algorithm implementation
 bool luhn_check(const std::string& pan) {
-    if (pan.empty() || !is_digits(pan)) {
-        return false;
+    return luhn_valid_scalar(pan.data(), pan.size());
+}
+
+void luhn_check_batch(
+    const char* data,
+    size_t rows,
+    size_t row_stride,
+    size_t width,
+    const int64_t* lengths,
+    uint8_t* results
+) {
+    // SIMD kernels load 16 bytes from the start of each row
+    if (width < 16) {
+        luhn_batch_scalar(data, rows, row_stride, width, lengths, results);
+        return;
     }
+    luhn_dispatch().kernel(data, rows, row_stride, width, lengths, results);
+}
 
-    int sum = 0;
-    int nDigits = pan.length();
-    bool alternate = false;
+const char* luhn_batch_kernel() {
+    return luhn_dispatch().name;
+}
 
-    for (int i = nDigits - 1; i >= 0; i--) {
-        int digit = pan[i] - '0';
+size_t luhn_check_lines(
+    const char* data,
+    size_t size,
+    bool final,
+    size_t max_rows,
+    std::vector<uint8_t>& results,
+    std::vector<uint64_t>* line_offsets
+) {
+    const LuhnDispatch& dispatch = luhn_dispatch();
+    const char* end = data + size;
+    size_t pos = 0;
+    size_t rows = 0;
 
-        if (alternate) {
-            digit *= 2;
-            if (digit > 9) {
-                digit -= 9;
-            }
+    while (pos < size && rows < max_rows) {
+        const char* line = data + pos;
+        const char* newline = static_cast<const char*>(std::memchr(line, '\n', size - pos));
+        if (!newline && !final) {
+            break; // Partial last line: leave it for the caller to carry over
+        }
+        const char* line_end = newline ? newline : end;
+
+        size_t n = static_cast<size_t>(line_end - line);
+        while (n > 0 && (line[n - 1] == '\r' || line[n - 1] == ' ')) {
+            --n;
         }
-        sum += digit;
-        alternate = !alternate;
+
+        bool valid = (dispatch.row_needs_window && line + 16 > end) ? luhn_valid_scalar(line, n)
+                                                                     : dispatch.row(line, n);
+        results.push_back(valid ? 1 : 0);
+        if (line_offsets) {
+            line_offsets->push_back(pos);
+        }
+        ++rows;
+        pos = static_cast<size_t>(line_end - data) + (newline ? 1 : 0);
     }
-    return (sum % 10 == 0);
+    return pos;
 }
 
 // Helper function to calculate Luhn check digit
+char calculate_luhn_check_digit(const char* partial_pan, size_t n) {
+    unsigned bad = 0;
+    unsigned sum = luhn_sum(partial_pan, n, 1, bad);
+    return static_cast<char>('0' + (10 - sum % 10) % 10);
+}
+
 char calculate_luhn_check_digit(const std::string& partial_pan) {
-    std::string pan_with_zero = partial_pan + '0';
-    int sum = 0;
-    int nDigits = pan_with_zero.length();
-    bool alternate = false; // Start alternating from the rightmost digit (which is the placeholder '0')
-
-    for (int i = nDigits - 1; i >= 0; i--) {
-        int digit = pan_with_zero[i] - '0';
-
-        if (alternate) {
-            digit *= 2;
-            if (digit > 9) {
-                digit -= 9;
+    return calculate_luhn_check_digit(partial_pan.data(), partial_pan.size());
+}
+
+namespace {
+
+// Rows per worker below which spawning threads costs more than it saves
+constexpr size_t kMinRowsPerWorker = 1 << 16;
+
+// Largest account-number width (digits between prefix and check digit) the unique mode encodes in 64 bits
+constexpr size_t kMaxUniqueAccountDigits = 18;
+
+// Emits uniformly distributed decimal digits, 18 per 64-bit draw.
+// Draws at or above 18 * 10^18 are rejected so every digit stays unbiased.
+class DigitSource {
+public:
+    explicit DigitSource(std::seed_seq& seq) : engine_(seq) {}
+
+    void fill(char* out, size_t n) {
+        for (size_t i = 0; i < n; ++i) {
+            if (available_ == 0) {
+                refill();
             }
+            out[i] = static_cast<char>('0' + pending_ % 10);
+            pending_ /= 10;
+            --available_;
         }
-        sum += digit;
-        alternate = !alternate;
     }
 
-    int check_digit = (sum % 10 == 0) ? 0 : (10 - (sum % 10));
-    return check_digit + '0';
+private:
+    static constexpr uint64_t kDigitsPerDraw = 18;
+    static constexpr uint64_t kPow18 = 1000000000000000000ULL;
+    static constexpr uint64_t kRejectAbove = 18 * kPow18;
+
+    void refill() {
+        uint64_t draw;
+        do {
+            draw = engine_();
+        } while (draw >= kRejectAbove);
+        pending_ = draw % kPow18;
+        available_ = kDigitsPerDraw;
+    }
+
+    std::mt19937_64 engine_;
+    uint64_t pending_ = 0;
+    size_t available_ = 0;
+};
+
+// Seeds from the OS entropy source; `stream` keeps concurrently seeded workers apart
+DigitSource make_digit_source(unsigned stream) {
+    std::random_device rd;
+    std::seed_seq seq{rd(), rd(), rd(), rd(), stream};
+    return DigitSource(seq);
 }
 
+// Keyed bijection on [0, space): a balanced Feistel network over the smallest even
+// power of two covering the space, cycle-walked back into range. Consecutive indices
+// map to unrelated account numbers, and distinct indices never collide, so uniqueness
+// needs no per-PAN bookkeeping.
+class AccountNumberPermutation {
+public:
+    explicit AccountNumberPermutation(uint64_t space) : space_(space) {
+        unsigned bits = 0;
+        while (bits < 64 && (uint64_t{1} << bits) < space) {
+            ++bits;
+        }
+        half_bits_ = std::max(1u, (bits + 1) / 2);
+        half_mask_ = (uint64_t{1} << half_bits_) - 1;
+
+        std::random_device rd;
+        for (auto& key : keys_) {
+            key = (static_cast<uint64_t>(rd()) << 32) ^ rd();
+        }
+    }
+
+    uint64_t operator()(uint64_t index) const {
+        uint64_t value = index;
+        do {
+            value = encrypt(value);
+        } while (value >= space_);
+        return value;
+    }
+
+private:
+    static constexpr int kRounds = 4;
+
+    // splitmix64 finaliser as the round function
+    static uint64_t mix(uint64_t x) {
+        x += 0x9E3779B97F4A7C15ULL;
+        x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ULL;
+        x = (x ^ (x >> 27)) * 0x94D049BB133111EBULL;
+        return x ^ (x >> 31);
+    }
+
+    uint64_t encrypt(uint64_t value) const {
+        uint64_t left = (value >> half_bits_) & half_mask_;
+        uint64_t right = value & half_mask_;
+        for (uint64_t key : keys_) {
+            uint64_t next = left ^ (mix(right ^ key) & half_mask_);
+            left = right;
+            right = next;
+        }
+        return (left << half_bits_) | right;
+    }
+
+    uint64_t space_;
+    unsigned half_bits_;
+    uint64_t half_mask_;
+    uint64_t keys_[kRounds];
+};
+
+bool is_valid_generation_request(const std::string& prefix, int length) {
+    return length > 0 && prefix.length() < static_cast<size_t>(length) && is_digits(prefix);
+}
+
+// Writes one PAN of `length` digits: prefix, random body, Luhn check digit
+void fill_pan(char* row, const std::string& prefix, size_t length, DigitSource& digits) {
+    std::memcpy(row, prefix.data(), prefix.size());
+    digits.fill(row + prefix.size(), length - prefix.size() - 1);
+    row[length - 1] = calculate_luhn_check_digit(row, length - 1);
+}
+
+// Writes one PAN whose account-number digits are `account`, zero-padded
+void fill_pan_from_account(char* row, const std::string& prefix, size_t length, uint64_t account) {
+    std::memcpy(row, prefix.data(), prefix.size());
+    for (size_t i = length - 1; i-- > prefix.size();) {
+        row[i] = static_cast<char>('0' + account % 10);
+        account /= 10;
+    }
+    row[length - 1] = calculate_luhn_check_digit(row, length - 1);
+}
+
+// Runs fn(begin, end, stream) over [0, count), split across up to `threads` workers
+template <typename Fn>
+void for_each_row_range(size_t count, unsigned threads, Fn&& fn) {
+    if (threads == 0) {
+        threads = std::max(1u, std::thread::hardware_concurrency());
+    }
+    size_t workers = std::min<size_t>(threads, std::max<size_t>(1, count / kMinRowsPerWorker));
+
+    if (workers <= 1) {
+        fn(size_t{0}, count, 0u);
+        return;
+    }
+
+    std::vector<std::thread> pool;
+    pool.reserve(workers - 1);
+    size_t per_worker = (count + workers - 1) / workers;
+    for (size_t w = 1; w < workers; ++w) {
+        size_t begin = std::min(count, w * per_worker);
+        size_t end = std::min(count, begin + per_worker);
+        pool.emplace_back([&fn, begin, end, w] { fn(begin, end, static_cast<unsigned>(w)); });
+    }
+    fn(size_t{0}, std::min(count, per_worker), 0u);
+    for (auto& worker : pool) {
+        worker.join();
+    }
+}
+
+} // namespace
+
 std::optional<std::string> generate_pan(const std::string& prefix, int length) {
-    if (length <= 0 || prefix.length() >= static_cast<size_t>(length) || !is_digits(prefix)) {
+    if (!is_valid_generation_request(prefix, length)) {
         return std::nullopt; // Invalid input
     }
 
-    // Seed the random number generator properly
-    unsigned seed = std::chrono::system_clock::now().time_since_epoch().count();
-    std::mt19937 generator(seed);
-    std::uniform_int_distribution<int> distribution(0, 9);
+    // Seeded once per thread, so PANs generated in the same clock tick still differ
+    thread_local DigitSource digits = make_digit_source(0);
 
-    std::string partial_pan = prefix;
-    int remaining_digits = length - prefix.length() - 1; // -1 for the check digit
+    std::string pan(static_cast<size_t>(length), '0');
+    fill_pan(&pan[0], prefix, pan.size(), digits);
+    return pan;
+}
 
-    if (remaining_digits < 0) {
-         return std::nullopt; // Prefix itself is already too long or exactly length-1
+bool generate_pan_batch_into(const std::string& prefix, int length, size_t count, char* out, unsigned threads) {
+    if (!is_valid_generation_request(prefix, length)) {
+        return false;
     }
 
-    for (int i = 0; i < remaining_digits; ++i) {
-        partial_pan += std::to_string(distribution(generator));
+    const size_t row_length = static_cast<size_t>(length);
+    for_each_row_range(count, threads, [&](size_t begin, size_t end, unsigned stream) {
+        DigitSource digits = make_digit_source(stream);
+        for (size_t i = begin; i < end; ++i) {
+            fill_pan(out + i * row_length, prefix, row_length, digits);
+        }
+    });
+    return true;
+}
+
+void generate_unique_pan_batch_into(
+    const std::string& prefix,
+    int length,
+    size_t count,
+    char* out,
+    const std::vector<std::string>& exclude,
+    unsigned threads
+) {
+    if (!is_valid_generation_request(prefix, length)) {
+        throw std::invalid_argument("prefix must be digits and shorter than length");
     }
 
-    char check_digit = calculate_luhn_check_digit(partial_pan);
-    return partial_pan + check_digit;
+    const size_t row_length = static_cast<size_t>(length);
+    const size_t account_digits = row_length - prefix.size() - 1;
+    if (account_digits > kMaxUniqueAccountDigits) {
+        throw std::invalid_argument("unique generation supports at most 18 digits between prefix and check digit");
+    }
+
+    uint64_t space = 1;
+    for (size_t i = 0; i < account_digits; ++i) {
+        space *= 10;
+    }
+
+    // Only exclusions under this prefix and length can collide; keep them as integers
+    std::unordered_set<uint64_t> excluded;
+    excluded.reserve(exclude.size());
+    for (const auto& pan : exclude) {
+        if (pan.size() != row_length || pan.compare(0, prefix.size(), prefix) != 0 || !is_digits(pan)) {
+            continue;
+        }
+        uint64_t account = 0;
+        for (size_t i = prefix.size(); i < row_length - 1; ++i) {
+            account = account * 10 + static_cast<uint64_t>(pan[i] - '0');
+        }
+        excluded.insert(account);
+    }
+
+    if (count > space - excluded.size()) {
+        throw std::length_error("requested count exceeds the " + std::to_string(space - excluded.size()) +
+                                " unique PANs left under this prefix and length");
+    }
+
+    const AccountNumberPermutation permutation(space);
+
+    if (excluded.empty()) {
+        for_each_row_range(count, threads, [&](size_t begin, size_t end, unsigned) {
+            for (size_t i = begin; i < end; ++i) {
+                fill_pan_from_account(out + i * row_length, prefix, row_length, permutation(i));
+            }
+        });
+        return;
+    }
+
+    // Permutation indices [0, count) fill their own rows in parallel; rows whose account
+    // number is excluded are refilled afterwards from indices count, count + 1, ...
+    std::mutex holes_mutex;
+    std::vector<size_t> holes;
+    for_each_row_range(count, threads, [&](size_t begin, size_t end, unsigned) {
+        std::vector<size_t> local_holes;
+        for (size_t i = begin; i < end; ++i) {
+            uint64_t account = permutation(i);
+            if (excluded.count(account)) {
+                local_holes.push_back(i);
+            } else {
+                fill_pan_from_account(out + i * row_length, prefix, row_length, account);
+            }
+        }
+        std::lock_guard<std::mutex> lock(holes_mutex);
+        holes.insert(holes.end(), local_holes.begin(), local_holes.end());
+    });
+
+    uint64_t next_index = count;
+    for (size_t row : holes) {
+        uint64_t account;
+        do {
+            account = permutation(next_index++);
+        } while (excluded.count(account));
+        fill_pan_from_account(out + row * row_length, prefix, row_length, account);
+    }
 }
 
 std::vector<std::string> generate_pan_batch(const std::string& prefix, int length, int count) {
     std::vector<std::string> batch;
-    if (count <= 0 || length <= 0 || prefix.length() >= static_cast<size_t>(length) || !is_digits(prefix)) {
+    if (count <= 0 || !is_valid_generation_request(prefix, length)) {
         return batch; // Return empty vector for invalid input
     }
 
+    const size_t row_length = static_cast<size_t>(length);
+    std::vector<char> packed(row_length * static_cast<size_t>(count));
+    generate_pan_batch_into(prefix, length, static_cast<size_t>(count), packed.data());
+
     batch.reserve(count);
     for (int i = 0; i < count; ++i) {
-        std::optional<std::string> pan = generate_pan(prefix, length);
-        if (pan) {
-            batch.push_back(*pan);
+        batch.emplace_back(packed.data() + static_cast<size_t>(i) * row_length, row_length);
+    }
+    return batch;
+}
+
+namespace {
+
+// Bytes per worker below which a file scan stays on the calling thread
+constexpr size_t kMinBytesPerWorker = 4 << 20;
+
+// Breakdown key: IIN value and PAN length packed into one integer so workers avoid
+// per-row string allocation. Rows too short for an IIN, or with a non-digit in it,
+// share kMalformedIin.
+constexpr uint64_t kMalformedIin = ~uint64_t{0} >> 8;
+
+inline uint64_t breakdown_key(uint64_t iin, size_t length) {
+    return (iin << 8) | std::min<size_t>(length, 255);
+}
+
+struct ScanPartial {
+    uint64_t rows = 0;
+    uint64_t valid = 0;
+    std::vector<uint64_t> invalid_rows;
+    std::vector<uint64_t> invalid_offsets;
+    std::unordered_map<uint64_t, PanScanStats> breakdown;
+    // Card files usually hold long runs of one IIN; remember the last bucket to skip the hash lookup
+    uint64_t last_key = ~uint64_t{0};
+    PanScanStats* last_stats = nullptr;
+};
+
+void scan_row(const char* row, size_t n, uint64_t offset, const char* end, size_t iin_digits,
+              size_t max_invalid, const LuhnDispatch& dispatch, ScanPartial& part) {
+    bool valid = (dispatch.row_needs_window && row + 16 > end) ? luhn_valid_scalar(row, n) : dispatch.row(row, n);
+
+    uint64_t iin = kMalformedIin;
+    if (n >= iin_digits) {
+        unsigned bad = 0;
+        uint64_t value = 0;
+        for (size_t i = 0; i < iin_digits; ++i) {
+            bad |= is_not_digit(row[i]);
+            value = value * 10 + static_cast<unsigned char>(row[i] - '0');
+        }
+        if (!bad) {
+            iin = value;
+        }
+    }
+
+    uint64_t key = breakdown_key(iin, n);
+    if (key != part.last_key) {
+        part.last_key = key;
+        part.last_stats = &part.breakdown[key];
+    }
+    PanScanStats& stats = *part.last_stats;
+    if (valid) {
+        ++part.valid;
+        ++stats.valid;
+    } else {
+        ++stats.invalid;
+        if (part.invalid_rows.size() < max_invalid) {
+            part.invalid_rows.push_back(part.rows);
+            part.invalid_offsets.push_back(offset);
+        }
+    }
+    ++part.rows;
+}
+
+inline bool is_record_padding(char c) {
+    return c == '\0' || c == ' ' || c == '\r' || c == '\n';
+}
+
+// Scans the rows starting in [begin, end) of the buffer. `begin` must be a row start.
+void scan_range(const char* data, size_t size, size_t begin, size_t end, size_t record_width,
+                size_t iin_digits, size_t max_invalid, ScanPartial& part) {
+    const LuhnDispatch& dispatch = luhn_dispatch();
+    const char* buffer_end = data + size;
+
+    if (record_width > 0) {
+        for (size_t pos = begin; pos < end; pos += record_width) {
+            const char* row = data + pos;
+            size_t n = std::min(record_width, size - pos);
+            while (n > 0 && is_record_padding(row[n - 1])) {
+                --n;
+            }
+            scan_row(row, n, pos, buffer_end, iin_digits, max_invalid, dispatch, part);
+        }
+        return;
+    }
+
+    size_t pos = begin;
+    while (pos < end) {
+        const char* row = data + pos;
+        const char* newline = static_cast<const char*>(std::memchr(row, '\n', size - pos));
+        size_t line_end = newline ? static_cast<size_t>(newline - data) : size;
+        size_t n = line_end - pos;
+        while (n > 0 && (row[n - 1] == '\r' || row[n - 1] == ' ')) {
+            --n;
+        }
+        scan_row(row, n, pos, buffer_end, iin_digits, max_invalid, dispatch, part);
+        pos = line_end + 1;
+    }
+}
+
+} // namespace
+
+PanFileReport scan_pan_buffer(
+    const char* data,
+    size_t size,
+    size_t record_width,
+    size_t iin_digits,
+    size_t max_invalid,
+    unsigned threads
+) {
+    if (iin_digits == 0 || iin_digits > 8) {
+        throw std::invalid_argument("iin_digits must be between 1 and 8");
+    }
+
+    if (threads == 0) {
+        threads = std::max(1u, std::thread::hardware_concurrency());
+    }
+    size_t workers = std::min<size_t>(threads, std::max<size_t>(1, size / kMinBytesPerWorker));
+
+    // Worker boundaries fall on row starts: record multiples, or just past a newline
+    std::vector<size_t> bounds{0};
+    for (size_t w = 1; w < workers; ++w) {
+        size_t cut = size / workers * w;
+        if (record_width > 0) {
+            cut -= cut % record_width;
         } else {
-            // Handle potential generation failure (though unlikely with valid inputs here)
-            // For simplicity, we just skip adding if generation fails, 
-            // but a more robust approach might retry or log an error.
+            const void* newline = std::memchr(data + cut, '\n', size - cut);
+            cut = newline ? static_cast<size_t>(static_cast<const char*>(newline) - data) + 1 : size;
         }
+        bounds.push_back(std::max(cut, bounds.back()));
     }
-    return batch;
+    bounds.push_back(size);
+
+    std::vector<ScanPartial> parts(workers);
+    std::vector<std::thread> pool;
+    for (size_t w = 1; w < workers; ++w) {
+        pool.emplace_back(scan_range, data, size, bounds[w], bounds[w + 1], record_width, iin_digits,
+                          max_invalid, std::ref(parts[w]));
+    }
+    scan_range(data, size, bounds[0], bounds[1], record_width, iin_digits, max_invalid, parts[0]);
+    for (auto& worker : pool) {
+        worker.join();
+    }
+
+    PanFileReport report;
+    for (const ScanPartial& part : parts) {
+        for (size_t i = 0; i < part.invalid_rows.size() && report.invalid_rows.size() < max_invalid; ++i) {
+            report.invalid_rows.push_back(report.rows + part.invalid_rows[i]);
+            report.invalid_offsets.push_back(part.invalid_offsets[i]);
+        }
+        report.rows += part.rows;
+        report.valid += part.valid;
+
+        for (const auto& [key, stats] : part.breakdown) {
+            uint64_t iin = key >> 8;
+            std::string iin_text;
+            if (iin != kMalformedIin) {
+                iin_text = std::to_string(iin);
+                iin_text.insert(0, iin_digits - iin_text.size(), '0');
+            }
+            PanScanStats& merged = report.breakdown[{iin_text, static_cast<int>(key & 0xFF)}];
+            merged.valid += stats.valid;
+            merged.invalid += stats.invalid;
+        }
+    }
+    return report;
+}
+
+// --- PAN detection in free text ---
+
+namespace {
+
+constexpr size_t kMinPanDigits = 13;
+constexpr size_t kMaxPanDigits = 19;
+constexpr size_t kMaxKeepFirst = 6;
+constexpr size_t kMaxKeepLast = 4;
+// A digit run still open at the end of a streamed block is held back up to this size. Beyond it
+// the run is scanned as it stands; no PAN is that long, so only pathological input is affected.
+constexpr size_t kMaxHeldRun = 1 << 16;
+
+inline bool is_group_separator(char c) {
+    return c == ' ' || c == '-';
 }
 
+struct DigitGroup {
+    size_t begin;
+    size_t end;
+};
+
+// Luhn check over the digits of groups[first..last], which hold at most kMaxPanDigits digits
+bool groups_luhn_valid(const char* data, const std::vector<DigitGroup>& groups, size_t first, size_t last) {
+    char digits[kMaxPanDigits];
+    size_t n = 0;
+    for (size_t g = first; g <= last; ++g) {
+        size_t len = groups[g].end - groups[g].begin;
+        std::memcpy(digits + n, data + groups[g].begin, len);
+        n += len;
+    }
+    return luhn_valid_scalar(digits, n);
 }
 
+// Appends the PANs within one run of digit groups
+void match_groups(const char* data, const std::vector<DigitGroup>& groups, size_t total_digits,
+                  std::vector<PanMatch>& matches) {
+    bool whole_fits = total_digits >= kMinPanDigits && total_digits <= kMaxPanDigits;
+    if (groups.size() == 1) {
+        if (whole_fits && luhn_valid_scalar(data + groups[0].begin, total_digits)) {
+            matches.push_back({groups[0].begin, groups[0].end});
+        }
+        return;
+    }
+    if (whole_fits && groups_luhn_valid(data, groups, 0, groups.size() - 1)) {
+        matches.push_back({groups.front().begin, groups.back().end});
+        return;
+    }
+
+    // Every valid span of whole groups, with overlapping spans merged. Picking one span per
+    // starting group could let an unrelated leading number claim a PAN's first groups and leave
+    // the rest of it unmatched ("qty 6 4111 1111 1111 1111"); the union never does.
+    bool open = false;
+    size_t span_first = 0;
+    size_t span_last = 0;
+    for (size_t first = 0; first < groups.size(); ++first) {
+        size_t digits = 0;
+        for (size_t last = first; last < groups.size(); ++last) {
+            digits += groups[last].end - groups[last].begin;
+            if (digits > kMaxPanDigits) {
+                break;
+            }
+            if (digits < kMinPanDigits || !groups_luhn_valid(data, groups, first, last)) {
+                continue;
+            }
+            if (open && first <= span_last) {
+                span_last = std::max(span_last, last);
+            } else {
+                if (open) {
+                    matches.push_back({groups[span_first].begin, groups[span_last].end});
+                }
+                open = true;
+                span_first = first;
+                span_last = last;
+            }
+        }
+    }
+    if (open) {
+        matches.push_back({groups[span_first].begin, groups[span_last].end});
+    }
+}
+
+void check_mask_options(const PanMaskOptions& options) {
+    if (options.keep_first > kMaxKeepFirst || options.keep_last > kMaxKeepLast) {
+        throw std::invalid_argument("at most the first 6 and last 4 digits of a PAN may stay unmasked");
+    }
+    if (is_not_digit(options.mask_char) == 0) {
+        throw std::invalid_argument("mask character must not be a digit");
+    }
+}
+
+void mask_match(char* data, const PanMatch& match, const PanMaskOptions& options) {
+    size_t digits = 0;
+    for (size_t i = match.begin; i < match.end; ++i) {
+        digits += !is_not_digit(data[i]);
+    }
+    size_t k = 0;
+    for (size_t i = match.begin; i < match.end; ++i) {
+        if (is_not_digit(data[i])) {
+            continue;
+        }
+        if (k >= options.keep_first && k + options.keep_last < digits) {
+            data[i] = options.mask_char;
+        }
+        ++k;
+    }
+}
+
+} // namespace
+
+size_t find_pans(const char* data, size_t size, bool final, std::vector<PanMatch>& matches) {
+    std::vector<DigitGroup> groups;
+    size_t pos = 0;
+    while (pos < size) {
+        if (is_not_digit(data[pos])) {
+            ++pos;
+            continue;
+        }
+
+        size_t run_start = pos;
+        size_t total_digits = 0;
+        groups.clear();
+        while (true) {
+            size_t begin = pos;
+            while (pos < size && !is_not_digit(data[pos])) {
+                ++pos;
+            }
+            groups.push_back({begin, pos});
+            total_digits += pos - begin;
+            if (pos + 1 < size && is_group_separator(data[pos]) && !is_not_digit(data[pos + 1])) {
+                ++pos;
+                continue;
+            }
+            break;
+        }
+
+        if (!final && (pos == size || (pos + 1 == size && is_group_separator(data[pos])))) {
+            return run_start; // The run may continue in the next block
+        }
+        match_groups(data, groups, total_digits, matches);
+    }
+    return size;
+}
+
+void mask_matches(char* data, const std::vector<PanMatch>& matches, const PanMaskOptions& options) {
+    check_mask_options(options);
+    for (const PanMatch& match : matches) {
+        mask_match(data, match, options);
+    }
+}
+
+size_t mask_pans(char* data, size_t size, const PanMaskOptions& options) {
+    std::vector<PanMatch> matches;
+    find_pans(data, size, true, matches);
+    mask_matches(data, matches, options);
+    return matches.size();
+}
+
+PanScrubber::PanScrubber(const PanMaskOptions& options) : options_(options) {
+    check_mask_options(options_);
+}
+
+void PanScrubber::feed(const char* data, size_t size, std::string& out) {
+    pending_.append(data, size);
+    found_.clear();
+    size_t consumed = find_pans(pending_.data(), pending_.size(), false, found_);
+    if (pending_.size() - consumed > kMaxHeldRun) {
+        size_t first_tail_match = found_.size();
+        find_pans(pending_.data() + consumed, pending_.size() - consumed, true, found_);
+        for (size_t i = first_tail_match; i < found_.size(); ++i) {
+            found_[i].begin += consumed;
+            found_[i].end += consumed;
+        }
+        consumed = pending_.size();
+    }
+    emit(consumed, out);
+}
+
+void PanScrubber::finish(std::string& out) {
+    found_.clear();
+    find_pans(pending_.data(), pending_.size(), true, found_);
+    emit(pending_.size(), out);
+}
+
+void PanScrubber::emit(size_t consumed, std::string& out) {
+    for (const PanMatch& match : found_) {
+        mask_match(pending_.data(), match, options_);
+    }
+    matches_ += found_.size();
+    out.append(pending_, 0, consumed);
+    pending_.erase(0, consumed);
+}
+
+}
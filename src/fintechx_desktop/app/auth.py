@@ -1,28 +1,46 @@
 
 import hashlib
+import hmac
 import os
 import logging
-from ..infrastructure.database import get_db_connection, initialize_schema
+from ..core import metrics
+from ..infrastructure.database import pooled_connection
+
+try:
+    from fintechx_desktop.infrastructure import fintechx_native
+except ImportError:
+    fintechx_native = None # hashlib computes the same PBKDF2-HMAC-SHA256, just without the native module
+fintechx_native = metrics.instrument_module(fintechx_native, "native")
 
 # Constants for password hashing
 HASH_ALGORITHM = 'sha256'
 SALT_BYTES = 16
 PBKDF2_ITERATIONS_AUTH = 200000 # Use a higher iteration count for password hashing than DB key
+HASH_BYTES = 32 # PBKDF2-HMAC-SHA256 output length
+
+@metrics.timed("auth.pbkdf2")
+def _pbkdf2(password: str, salt: bytes) -> bytes:
+    """PBKDF2-HMAC-SHA256 over the login password. The native path releases the GIL throughout."""
+    if fintechx_native is not None:
+        return bytes(fintechx_native.derive_key_pbkdf2(password, salt, PBKDF2_ITERATIONS_AUTH, HASH_BYTES))
+    return hashlib.pbkdf2_hmac(
+        hash_name=HASH_ALGORITHM,
+        password=password.encode("utf-8"),
+        salt=salt,
+        iterations=PBKDF2_ITERATIONS_AUTH
+    )
 
+@metrics.timed("auth.hash_password")
 def hash_password(password: str, salt: bytes = None) -> tuple[str, bytes]:
     """Hashes a password using PBKDF2-HMAC-SHA256."""
     if salt is None:
         salt = os.urandom(SALT_BYTES)
     
-    key = hashlib.pbkdf2_hmac(
-        hash_name=HASH_ALGORITHM,
-        password=password.encode("utf-8"),
-        salt=salt,
-        iterations=PBKDF2_ITERATIONS_AUTH
-    )
+    key = _pbkdf2(password, salt)
     # Store the hash as hex, salt as is (or hex)
     return key.hex(), salt
 
+@metrics.timed("auth.verify_password")
 def verify_password(stored_hash_hex: str, provided_password: str, salt: bytes) -> bool:
     """Verifies a provided password against a stored hash and salt."""
     try:
@@ -31,80 +49,180 @@ def verify_password(stored_hash_hex: str, provided_password: str, salt: bytes) -
         logging.error("Invalid stored hash format.")
         return False
         
-    new_key = hashlib.pbkdf2_hmac(
-        hash_name=HASH_ALGORITHM,
-        password=provided_password.encode("utf-8"),
-        salt=salt,
-        iterations=PBKDF2_ITERATIONS_AUTH
-    )
+    new_key = _pbkdf2(provided_password, salt)
     # Use compare_digest for timing attack resistance
-    return hashlib.compare_digest(stored_key, new_key)
+    return hmac.compare_digest(stored_key, new_key)
 
+@metrics.timed("auth.create_user")
 def create_user(db_password: str, username: str, password: str) -> bool:
     """Creates a new user in the database."""
-    conn = None
     try:
-        conn = get_db_connection(db_password)
-        initialize_schema(conn) # Ensure schema exists
-        cursor = conn.cursor()
-
-        # Check if user already exists
-        cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
-        if cursor.fetchone():
-            logging.warning(f"Username 	{username}	 already exists.")
-            return False
-
-        # Hash the user's login password
-        password_hash_hex, salt = hash_password(password)
-
-        cursor.execute("""
-        INSERT INTO users (username, password_hash, salt) 
-        VALUES (?, ?, ?)
-        """, (username, password_hash_hex, salt))
-        
-        conn.commit()
-        logging.info(f"User 	{username}	 created successfully.")
-        return True
+        # Pooled connections are already keyed and have the schema in place
+        with pooled_connection(db_password) as conn:
+            cursor = conn.cursor()
+
+            # Check if user already exists
+            cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
+            if cursor.fetchone():
+                logging.warning(f"Username 	{username}	 already exists.")
+                return False
+
+            # Hash the user's login password
+            password_hash_hex, salt = hash_password(password)
+
+            cursor.execute("""
+            INSERT INTO users (username, password_hash, salt) 
+            VALUES (?, ?, ?)
+            """, (username, password_hash_hex, salt))
+            
+            conn.commit()
+            logging.info(f"User 	{username}	 created successfully.")
+            return True
 
     except Exception as e:
+        # The pool rolls back and discards the connection on error
         logging.error(f"Error creating user 	{username}	: {e}")
-        if conn:
-            conn.rollback()
         return False
-    finally:
-        if conn:
-            conn.close()
 
+@metrics.timed("auth.authenticate_user")
 def authenticate_user(db_password: str, username: str, password: str) -> bool:
     """Authenticates a user against the database."""
-    conn = None
     try:
-        conn = get_db_connection(db_password)
-        initialize_schema(conn) # Ensure schema exists
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT password_hash, salt FROM users WHERE username = ?", (username,))
-        result = cursor.fetchone()
+        with pooled_connection(db_password) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT password_hash, salt FROM users WHERE username = ?", (username,))
+            result = cursor.fetchone()
 
         if not result:
+            metrics.increment("auth.login.failure")
             logging.warning(f"Login attempt failed: User 	{username}	 not found.")
             return False
 
         stored_hash_hex, salt = result
         
         if verify_password(stored_hash_hex, password, salt):
+            metrics.increment("auth.login.success")
             logging.info(f"User 	{username}	 authenticated successfully.")
             return True
         else:
+            metrics.increment("auth.login.failure")
             logging.warning(f"Login attempt failed: Invalid password for user 	{username}	.")
             return False
 
     except Exception as e:
         logging.error(f"Error authenticating user 	{username}	: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
+
+# --- Bulk provisioning ---
+
+BULK_BATCH_SIZE = 2000 # Users hashed and inserted per transaction
+_SQL_IN_CHUNK = 500 # Stays under SQLite's default host-parameter limit
+
+# Per-row outcomes of create_users_bulk
+BULK_CREATED = "created"
+BULK_EXISTS = "exists" # Already in the database
+BULK_DUPLICATE = "duplicate" # Repeated earlier in the same input
+BULK_INVALID = "invalid" # Empty username or password
+BULK_ERROR = "error" # Its batch failed to insert
+
+def _batched(iterable, size: int):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _stored_hashes(cursor, usernames: list) -> dict:
+    """Maps each of the given usernames that exists to its stored password hash."""
+    found = {}
+    for i in range(0, len(usernames), _SQL_IN_CHUNK):
+        chunk = usernames[i:i + _SQL_IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"SELECT username, password_hash FROM users WHERE username IN ({placeholders})", chunk)
+        found.update(cursor.fetchall())
+    return found
+
+def _insert_hashed_batch(conn, usernames: list, hashes: list, outcomes: list, positions: list):
+    """Inserts one hashed batch in a single transaction and records which rows it created."""
+    cursor = conn.cursor()
+    try:
+        rows = [(username, hash_hex, salt) for username, (hash_hex, salt) in zip(usernames, hashes)]
+        # Rows inserted concurrently by someone else are skipped, not errors
+        cursor.executemany("""
+        INSERT INTO users (username, password_hash, salt)
+        VALUES (?, ?, ?)
+        ON CONFLICT(username) DO NOTHING
+        """, rows)
+        # Salts are random, so a row is ours exactly when the stored hash is the one we wrote
+        stored = _stored_hashes(cursor, usernames)
+        conn.commit()
+    except Exception as e:
+        logging.error(f"Bulk insert of {len(usernames)} users failed: {e}")
+        conn.rollback()
+        for username, position in zip(usernames, positions):
+            outcomes[position] = (username, BULK_ERROR)
+        return
+
+    for username, (hash_hex, _), position in zip(usernames, hashes, positions):
+        outcomes[position] = (username, BULK_CREATED if stored.get(username) == hash_hex else BULK_EXISTS)
+
+@metrics.timed("auth.create_users_bulk")
+def create_users_bulk(db_password: str, users, batch_size: int = BULK_BATCH_SIZE, executor=None) -> list:
+    """Creates many users from an iterable of (username, password) pairs.
+
+    Input is consumed in batches of batch_size. Each batch is hashed in parallel on the
+    authentication executor while the previous batch is inserted with one executemany and one
+    commit. Usernames already in the database are detected before hashing, so they cost no
+    PBKDF2 run.
+
+    Returns one (username, outcome) pair per input row, in input order, where outcome is one
+    of BULK_CREATED, BULK_EXISTS, BULK_DUPLICATE, BULK_INVALID or BULK_ERROR.
+    Raises ConnectionError if the database cannot be unlocked.
+    """
+    from .auth_executor import get_auth_executor # auth_executor imports this module
+
+    executor = executor or get_auth_executor()
+    outcomes = []
+    seen = set()
+    in_flight = None # (usernames, hash futures, outcome positions) of the batch being hashed
+
+    with pooled_connection(db_password) as conn:
+        cursor = conn.cursor()
+        for batch in _batched(users, batch_size):
+            candidates = []
+            for username, password in batch:
+                outcomes.append((username, None))
+                if not username or not password:
+                    outcomes[-1] = (username, BULK_INVALID)
+                elif username in seen:
+                    outcomes[-1] = (username, BULK_DUPLICATE)
+                else:
+                    seen.add(username)
+                    candidates.append((len(outcomes) - 1, username, password))
+
+            existing = _stored_hashes(cursor, [username for _, username, _ in candidates])
+            positions, usernames, futures = [], [], []
+            for position, username, password in candidates:
+                if username in existing:
+                    outcomes[position] = (username, BULK_EXISTS)
+                    continue
+                positions.append(position)
+                usernames.append(username)
+                futures.append(executor.submit_hash_password(password))
+
+            if in_flight is not None:
+                _insert_hashed_batch(conn, in_flight[0], [f.result() for f in in_flight[1]], outcomes, in_flight[2])
+            in_flight = (usernames, futures, positions) if usernames else None
+
+        if in_flight is not None:
+            _insert_hashed_batch(conn, in_flight[0], [f.result() for f in in_flight[1]], outcomes, in_flight[2])
+
+    created = sum(1 for _, outcome in outcomes if outcome == BULK_CREATED)
+    logging.info(f"Bulk provisioning: {created} of {len(outcomes)} users created.")
+    return outcomes
 
 # Example usage (for testing, remove later)
 # if __name__ == '__main__':
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from . import auth
+
+# Password hashing and verification are CPU-bound PBKDF2 runs that release the GIL, so a plain
+# thread pool spreads them across cores. Keep them off the Qt GUI thread by going through here.
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+class AuthExecutor:
+    """Runs authentication work on a pool of worker threads.
+
+    Every ``submit_*`` method returns a ``concurrent.futures.Future``; the ``*_async`` variants
+    wrap the same calls for asyncio code. Results match the synchronous functions in ``auth``.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or default_workers()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fintechx-auth")
+
+    def submit_hash_password(self, password: str, salt: bytes = None) -> Future:
+        """Future resolving to ``(hash_hex, salt)``."""
+        return self._pool.submit(auth.hash_password, password, salt)
+
+    def submit_verify_password(self, stored_hash_hex: str, provided_password: str, salt: bytes) -> Future:
+        """Future resolving to True if the password matches."""
+        return self._pool.submit(auth.verify_password, stored_hash_hex, provided_password, salt)
+
+    def submit_authenticate(self, db_password: str, username: str, password: str) -> Future:
+        """Future resolving to the result of ``auth.authenticate_user``."""
+        return self._pool.submit(auth.authenticate_user, db_password, username, password)
+
+    def submit_create_user(self, db_password: str, username: str, password: str) -> Future:
+        """Future resolving to the result of ``auth.create_user``."""
+        return self._pool.submit(auth.create_user, db_password, username, password)
+
+    def map_hash_passwords(self, passwords) -> list:
+        """Hashes many passwords in parallel, returning ``(hash_hex, salt)`` pairs in input order."""
+        return list(self._pool.map(auth.hash_password, passwords))
+
+    async def authenticate_async(self, db_password: str, username: str, password: str) -> bool:
+        return await asyncio.wrap_future(self.submit_authenticate(db_password, username, password))
+
+    async def create_user_async(self, db_password: str, username: str, password: str) -> bool:
+        return await asyncio.wrap_future(self.submit_create_user(db_password, username, password))
+
+    async def verify_password_async(self, stored_hash_hex: str, provided_password: str, salt: bytes) -> bool:
+        return await asyncio.wrap_future(self.submit_verify_password(stored_hash_hex, provided_password, salt))
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_auth_executor() -> AuthExecutor:
+    """Returns the process-wide executor, sized to the number of cores."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = AuthExecutor()
+            logging.info(f"Authentication executor started with {_executor.max_workers} workers")
+        return _executor
@@ -0,0 +1,179 @@
+import argparse
+import json
+import mmap
+import os
+import sys
+
+# Headless entry point for batch jobs. Must not import PyQt6 or anything under ui/.
+
+EXIT_OK = 0
+EXIT_INVALID_ROWS = 1
+EXIT_PANS_FOUND = 1
+EXIT_ERROR = 2
+
+SCRUB_BLOCK_SIZE = 1 << 20
+
+
+def _load_native():
+    """Imports the native module, which the CLI cannot work without."""
+    try:
+        from fintechx_desktop.infrastructure import fintechx_native
+    except ImportError:
+        print("error: native C++ module (fintechx_native) not found. Ensure it's built and installed.", file=sys.stderr)
+        sys.exit(EXIT_ERROR)
+    return fintechx_native
+
+
+def scan_pan_file(path: str, width: int = 0, iin_digits: int = 6, max_invalid: int = 1000, threads: int = 0) -> dict:
+    """Memory-maps a PAN file and validates it with the native multi-threaded scanner."""
+    native = _load_native()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return native.scan_pan_buffer(b"", width, iin_digits, max_invalid, threads)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            return native.scan_pan_buffer(mapped, width, iin_digits, max_invalid, threads)
+
+
+def format_text_report(path: str, report: dict) -> str:
+    """Renders a report as a short human-readable summary."""
+    lines = [
+        f"file: {path}",
+        f"rows: {report['rows']}  valid: {report['valid']}  invalid: {report['invalid']}",
+    ]
+    if report["invalid_rows"]:
+        shown = len(report["invalid_rows"])
+        lines.append(f"invalid rows (showing {shown} of {report['invalid']}):")
+        for row, offset in zip(report["invalid_rows"], report["invalid_offsets"]):
+            lines.append(f"  row {row} @ byte {offset}")
+    lines.append("breakdown (iin, length: valid/invalid):")
+    for entry in report["breakdown"]:
+        iin = entry["iin"] or "<malformed>"
+        lines.append(f"  {iin}, {entry['length']}: {entry['valid']}/{entry['invalid']}")
+    return "\n".join(lines)
+
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    try:
+        report = scan_pan_file(args.file, args.width, args.iin_digits, args.max_invalid, args.threads)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    if args.format == "json":
+        output = json.dumps({"file": args.file, **report}, separators=(",", ":"))
+    else:
+        output = format_text_report(args.file, report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    return EXIT_INVALID_ROWS if report["invalid"] else EXIT_OK
+
+
+def scrub_stream(src, dst, keep_first: int = 0, keep_last: int = 4, block_size: int = SCRUB_BLOCK_SIZE) -> int:
+    """Copies binary stream src to dst with every PAN masked. Returns the number of PANs masked."""
+    native = _load_native()
+    scrubber = native.PanScrubber(keep_first, keep_last)
+    while True:
+        block = src.read(block_size)
+        if not block:
+            break
+        dst.write(scrubber.feed(block))
+    dst.write(scrubber.finish())
+    return scrubber.matches
+
+
+def scrub_file(path: str, output: str = None, keep_first: int = 0, keep_last: int = 4) -> int:
+    """Scrubs a file ('-' for stdin) to output (None for stdout). Returns the number of PANs masked.
+
+    A file output is written to output + '.part' and renamed over output once complete, so
+    output may be the input file itself and is never left half-scrubbed.
+    """
+    src = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        if output is None:
+            count = scrub_stream(src, sys.stdout.buffer, keep_first, keep_last)
+            sys.stdout.buffer.flush()
+            return count
+        partial = output + ".part"
+        try:
+            with open(partial, "wb") as dst:
+                count = scrub_stream(src, dst, keep_first, keep_last)
+            os.replace(partial, output)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return count
+    finally:
+        if src is not sys.stdin.buffer:
+            src.close()
+
+
+def cmd_scrub(args: argparse.Namespace) -> int:
+    try:
+        count = scrub_file(args.file, args.output, args.keep_first, args.keep_last)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    if not args.quiet:
+        print(f"masked {count} PAN(s)", file=sys.stderr)
+    return EXIT_PANS_FOUND if count else EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="fintechx-pan", description="Headless PAN file tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    validate = subparsers.add_parser(
+        "validate",
+        help="Luhn-check every PAN in a file",
+        description="Memory-maps a newline- or fixed-width-delimited PAN file and Luhn-checks every row "
+                    "across all cores. Exits 0 if all rows are valid, 1 if any are invalid, 2 on error.",
+    )
+    validate.add_argument("file", help="PAN file to check")
+    validate.add_argument("--width", type=int, default=0,
+                          help="fixed record size in bytes, including any newline (default: newline-delimited)")
+    validate.add_argument("--iin-digits", type=int, default=6, help="leading digits grouped as the IIN (default: 6)")
+    validate.add_argument("--max-invalid", type=int, default=1000,
+                          help="maximum number of invalid row positions to report (default: 1000)")
+    validate.add_argument("--threads", type=int, default=0, help="worker threads (default: all cores)")
+    validate.add_argument("--format", choices=("json", "text"), default="json", help="report format (default: json)")
+    validate.add_argument("-o", "--output", help="write the report to this file instead of stdout")
+    validate.set_defaults(func=cmd_validate)
+
+    scrub = subparsers.add_parser(
+        "scrub",
+        help="mask PANs in a log or text file",
+        description="Streams a text file through the native PAN scanner and masks every Luhn-valid 13-19 digit "
+                    "card number, including ones grouped with spaces or dashes. Exits 0 if none were found, "
+                    "1 if any were masked, 2 on error.",
+    )
+    scrub.add_argument("file", help="file to scrub, or - for stdin")
+    scrub.add_argument("-o", "--output",
+                       help="write the scrubbed text here (may be the input file) instead of stdout")
+    scrub.add_argument("--keep-first", type=int, default=0, help="leading digits left unmasked, at most 6 (default: 0)")
+    scrub.add_argument("--keep-last", type=int, default=4, help="trailing digits left unmasked, at most 4 (default: 4)")
+    scrub.add_argument("-q", "--quiet", action="store_true", help="do not print the masked count to stderr")
+    scrub.set_defaults(func=cmd_scrub)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "validate" and (args.width < 0 or args.max_invalid < 0 or args.threads < 0):
+        parser.error("--width, --max-invalid and --threads must not be negative")
+    if args.command == "scrub" and (args.keep_first < 0 or args.keep_last < 0):
+        parser.error("--keep-first and --keep-last must not be negative")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
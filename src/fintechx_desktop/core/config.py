@@ -5,9 +5,6 @@ import logging
 CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".fintechx")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.ini")
 
-# Ensure config directory exists
-os.makedirs(CONFIG_DIR, exist_ok=True)
-
 # Default configuration values
 DEFAULT_CONFIG = {
     "General": {
@@ -18,6 +15,11 @@ DEFAULT_CONFIG = {
         "window_width": "800",
         "window_height": "600",
     },
+    "Diagnostics": {
+        "metrics": "off", # off, on, or trace (also records spans); FINTECHX_METRICS overrides
+        "metrics_export_path": "", # Prometheus text file (or .json) rewritten periodically when set
+        "metrics_export_interval": "15", # Seconds
+    },
     # Add other sections and settings as needed
     # Avoid storing sensitive data like passwords or keys here.
 }
@@ -52,6 +54,7 @@ def load_config() -> configparser.ConfigParser:
 def save_config(config: configparser.ConfigParser):
     """Saves the current configuration to the INI file."""
     try:
+        os.makedirs(CONFIG_DIR, exist_ok=True)
         with open(CONFIG_FILE, "w", encoding="utf-8") as configfile:
             config.write(configfile)
         logging.info(f"Configuration saved to {CONFIG_FILE}")
@@ -1,19 +1,209 @@
+import atexit
+import json
 import logging
 import logging.handlers
 import os
+import queue
+import re
 import sys
+import threading
+import time
 
 LOG_DIR = os.path.join(os.path.expanduser("~"), ".fintechx", "logs")
 LOG_FILE = os.path.join(LOG_DIR, "fintechx_app.log")
+JSON_LOG_FILE = os.path.join(LOG_DIR, "fintechx_app.jsonl")
 LOG_LEVEL = logging.INFO # Default level
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_QUEUE_SIZE = 10000 # Records buffered between callers and the writer thread
+BLOCK_TIMEOUT = 0.05 # Seconds a WARNING+ record may wait for queue space before it is dropped too
 
-# Ensure log directory exists
-os.makedirs(LOG_DIR, exist_ok=True)
+# Application threads only enqueue records; a single listener thread formats and writes them.
+# Use lazy %-style arguments (logger.info("paid %s", amount)) so that records below the level
+# are never formatted. The message itself is merged on the calling thread (see
+# BoundedQueueHandler.prepare); timestamps, layout, masking and tracebacks are the listener's.
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler with a drop policy for a bounded queue.
+
+    When the queue is full, records below WARNING are dropped immediately, so callers never
+    wait on a slow disk. WARNING and above wait up to BLOCK_TIMEOUT for space, then are
+    dropped too. Dropped records are counted and reported by the listener.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block_timeout: float = BLOCK_TIMEOUT):
+        super().__init__(log_queue)
+        self.block_timeout = block_timeout
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge msg % args now, as the stock handler does: arguments read later on the listener
+        # thread could already have been mutated by the caller. Unlike the stock handler, leave
+        # exc_info for the listener, which formats tracebacks off the caller's thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+    def take_dropped(self) -> int:
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        return dropped
+
+# Fallback when the native module is missing: a port of the native scanner's rule (see
+# find_pans in pan_utils.hpp) without its throughput. A run is digit groups joined by single
+# spaces or dashes; it is a PAN if its 13-19 digits pass Luhn, and otherwise every valid span of
+# whole groups is masked, with overlapping spans merged.
+_DIGIT_RUN = re.compile(r"\d+(?:[ -]\d+)*", re.ASCII)
+_DIGIT_GROUP = re.compile(r"\d+", re.ASCII)
+
+def _luhn_valid(digits: str) -> bool:
+    total = 0
+    for i, c in enumerate(reversed(digits)):
+        d = ord(c) - 48
+        if i % 2:
+            d = d * 2 - 9 if d > 4 else d * 2
+        total += d
+    return total % 10 == 0
+
+def _pan_spans(groups: list) -> list:
+    """(first, last) group indexes of the PANs in one run of digit groups (re.Match objects)."""
+    if 13 <= sum(len(g.group()) for g in groups) <= 19 and _luhn_valid("".join(g.group() for g in groups)):
+        return [(0, len(groups) - 1)]
+    if len(groups) == 1:
+        return []
+    spans = []
+    for first in range(len(groups)):
+        digits = ""
+        for last in range(first, len(groups)):
+            digits += groups[last].group()
+            if len(digits) > 19:
+                break
+            if len(digits) < 13 or not _luhn_valid(digits):
+                continue
+            if spans and first <= spans[-1][1]:
+                spans[-1] = (spans[-1][0], max(spans[-1][1], last))
+            else:
+                spans.append((first, last))
+    return spans
+
+def _mask_pans_python(text: str) -> str:
+    def mask(match):
+        run = match.group()
+        groups = list(_DIGIT_GROUP.finditer(run))
+        out = list(run)
+        for first, last in _pan_spans(groups):
+            positions = [i for g in groups[first:last + 1] for i in range(g.start(), g.end())]
+            for i in positions[:-4]:
+                out[i] = "*"
+        return "".join(out)
+    return _DIGIT_RUN.sub(mask, text)
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+class PanMaskingFilter(logging.Filter):
+    """Masks card numbers in a record's message, exception text and stack text, keeping the last 4 digits.
+
+    Uses the native single-pass scanner (fintechx_native.mask_pans). The record's msg % args
+    is merged into msg so handlers format the masked text. Never rejects a record.
+    """
+
+    def __init__(self, name: str = ""):
+        super().__init__(name)
+        try:
+            from fintechx_desktop.infrastructure import fintechx_native
+            self._mask = fintechx_native.mask_pans
+        except ImportError:
+            self._mask = _mask_pans_python
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = self._mask(record.getMessage())
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+        if record.exc_text:
+            record.exc_text = self._mask(record.exc_text)
+        if record.stack_info:
+            record.stack_info = self._mask(record.stack_info)
+        return True
+
+class _DropReportingListener(logging.handlers.QueueListener):
+    """QueueListener that logs how many records the handler dropped since the last report.
+
+    With a pan_filter, every record is masked once here, before any handler sees it.
+    """
+
+    REPORT_INTERVAL = 5.0 # Seconds
+
+    def __init__(self, log_queue, queue_handler: BoundedQueueHandler, *handlers, pan_filter=None):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.pan_filter = pan_filter
+        self._last_report = time.monotonic()
+
+    def prepare(self, record):
+        if self.pan_filter is not None:
+            self.pan_filter.filter(record)
+        return record
+
+    def handle(self, record):
+        super().handle(record)
+        now = time.monotonic()
+        if now - self._last_report >= self.REPORT_INTERVAL:
+            self._last_report = now
+            self.report_dropped()
+
+    def report_dropped(self):
+        dropped = self.queue_handler.take_dropped()
+        if dropped:
+            super().handle(logging.makeLogRecord({
+                "name": "fintechx_desktop.logging",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "Log queue full: %d records dropped",
+                "args": (dropped,),
+            }))
+
+class JsonLinesFormatter(logging.Formatter):
+    """Renders each record as one compact JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str)
+
+_listener = None
+
+def setup_logging(level=LOG_LEVEL, json_lines: bool = False, queue_size: int = LOG_QUEUE_SIZE,
+                  mask_pans: bool = True):
+    """Configures logging for the application.
+
+    The fintechx_desktop logger gets a single BoundedQueueHandler. A listener thread drains
+    the queue into the console and rotating-file handlers, plus a JSON-lines file when
+    json_lines is true. With mask_pans, card numbers are masked on the listener thread before
+    anything is written. Calling this again replaces the previous pipeline.
+    """
+    global _listener
+    shutdown_logging()
 
-def setup_logging(level=LOG_LEVEL):
-    """Configures logging for the application."""
-    
     # Get the root logger
     logger = logging.getLogger("fintechx_desktop") # Use a specific name for the app logger
     logger.setLevel(level)
@@ -24,38 +214,66 @@ def setup_logging(level=LOG_LEVEL):
 
     # Create formatter
     formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
 
     # --- Console Handler --- 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
-    # --- Rotating File Handler --- 
+    # --- Rotating File Handlers --- 
     # Rotate logs, keeping 5 backups, max 5MB each
     try:
+        os.makedirs(LOG_DIR, exist_ok=True)
         file_handler = logging.handlers.RotatingFileHandler(
             LOG_FILE, maxBytes=5*1024*1024, backupCount=5, encoding="utf-8"
         )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+        if json_lines:
+            json_handler = logging.handlers.RotatingFileHandler(
+                JSON_LOG_FILE, maxBytes=5*1024*1024, backupCount=5, encoding="utf-8"
+            )
+            json_handler.setLevel(level)
+            json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(json_handler)
     except Exception as e:
         # Fallback to console if file logging fails
-        logging.getLogger().error(f"Failed to set up file logging: {e}", exc_info=True)
+        logging.getLogger().error("Failed to set up file logging: %s", e, exc_info=True)
 
-    # Set the root logger level as well if needed, or rely on the specific logger
-    # logging.getLogger().setLevel(level)
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    # Records stay in the app's pipeline rather than also going to whatever root has
+    logger.propagate = False
+
+    pan_filter = PanMaskingFilter() if mask_pans else None
+    _listener = _DropReportingListener(log_queue, queue_handler, *handlers, pan_filter=pan_filter)
+    _listener.start()
 
     logger.info("Logging configured.")
 
+def shutdown_logging():
+    """Flushes queued records and stops the listener thread. Safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        _listener.stop() # Drains everything already queued
+        _listener.report_dropped()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(shutdown_logging)
+
 # Example usage (typically called once at application startup)
 # if __name__ == "__main__":
-#     setup_logging()
+#     setup_logging(json_lines=True)
 #     logging.getLogger("fintechx_desktop.ui").info("UI component started")
-#     logging.getLogger("fintechx_desktop.app").warning("Something might be wrong")
+#     logging.getLogger("fintechx_desktop.app").warning("Something might be wrong: %s", "details")
 #     try:
 #         1 / 0
 #     except ZeroDivisionError:
 #         logging.getLogger("fintechx_desktop.core").error("Critical error", exc_info=True)
-
@@ -0,0 +1,328 @@
+import atexit
+import bisect
+import collections
+import contextlib
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+# In-process instrumentation: counters, latency histograms and optional span tracing.
+#
+# Disabled by default. While disabled, timed() wrappers and span() cost one global flag check,
+# so hot paths can stay instrumented permanently. Enable with enable() or configure() (the
+# [Diagnostics] metrics setting, or FINTECHX_METRICS=1 / =trace for spans too); read with
+# snapshot(); export with write_prometheus() (for a node_exporter textfile collector) or write_json().
+
+METRICS_ENV_VAR = "FINTECHX_METRICS"
+PROMETHEUS_PREFIX = "fintechx"
+# Histogram bucket upper bounds in seconds, from native calls (microseconds) to PBKDF2 and DB opens
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_TRACE_SPANS = 2000 # Most recent finished spans kept while tracing
+
+logger = logging.getLogger(__name__)
+
+_enabled = False
+_tracing = False
+
+class Histogram:
+    """Latency distribution over LATENCY_BUCKETS plus count, sum and max. Not thread-safe on its own."""
+
+    __slots__ = ("counts", "count", "sum", "max", "errors")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1) # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the max for the +Inf bucket)."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(q * self.count)
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        cumulative = []
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS + (math.inf,), self.counts):
+            seen += n
+            cumulative.append(["+Inf" if bound == math.inf else bound, seen])
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "errors": self.errors,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": cumulative,
+        }
+
+class _Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = collections.defaultdict(int)
+        self.histograms = collections.defaultdict(Histogram)
+        self.spans = collections.deque(maxlen=MAX_TRACE_SPANS)
+        self.started = time.time()
+
+_registry = _Registry()
+_span_stack = threading.local() # Per-thread names of open spans, for parent links
+
+def enable(tracing: bool = False):
+    """Starts recording; with tracing, also keeps the most recent spans with their parents."""
+    global _enabled, _tracing
+    _enabled = True
+    _tracing = tracing
+
+def disable():
+    """Stops recording. Data collected so far is kept until reset()."""
+    global _enabled, _tracing
+    _enabled = False
+    _tracing = False
+
+def is_enabled() -> bool:
+    return _enabled
+
+def is_tracing() -> bool:
+    return _tracing
+
+def reset():
+    """Discards every counter, histogram and span."""
+    global _registry
+    _registry = _Registry()
+
+def increment(name: str, value: int = 1):
+    """Adds to a counter."""
+    if not _enabled:
+        return
+    registry = _registry
+    with registry.lock:
+        registry.counters[name] += value
+
+def observe(name: str, seconds: float, error: bool = False):
+    """Records one duration for an operation; error also counts it as failed."""
+    if not _enabled:
+        return
+    registry = _registry
+    with registry.lock:
+        histogram = registry.histograms[name]
+        histogram.observe(seconds)
+        if error:
+            histogram.errors += 1
+
+def _record_span(name: str, wall_start: float, seconds: float, parent, error: bool):
+    registry = _registry
+    span = {
+        "name": name,
+        "start": wall_start,
+        "duration": seconds,
+        "thread": threading.current_thread().name,
+        "parent": parent,
+        "error": error,
+    }
+    with registry.lock:
+        registry.spans.append(span)
+
+class _Span:
+    """Times a block into the operation's histogram and, while tracing, records it as a span."""
+
+    __slots__ = ("name", "_start", "_wall_start", "_parent", "_stack")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        if _tracing:
+            stack = getattr(_span_stack, "names", None)
+            if stack is None:
+                stack = _span_stack.names = []
+            self._parent = stack[-1] if stack else None
+            stack.append(self.name)
+            self._stack = stack
+            self._wall_start = time.time()
+        else:
+            self._stack = None
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._start
+        error = exc_type is not None
+        observe(self.name, seconds, error)
+        if self._stack is not None:
+            self._stack.pop()
+            _record_span(self.name, self._wall_start, seconds, self._parent, error)
+        return False
+
+_NULL_SPAN = contextlib.nullcontext()
+
+def span(name: str):
+    """Context manager timing a block as operation `name`; a shared no-op while disabled."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+def timed(name: str):
+    """Decorator timing every call as operation `name`. Costs one flag check while disabled."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+class _InstrumentedModule:
+    """Proxy for a module whose functions are wrapped with timed() on first access.
+
+    Classes and other attributes pass through unchanged.
+    """
+
+    def __init__(self, module, prefix: str):
+        self._module = module
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if callable(attr) and not isinstance(attr, type):
+            attr = timed(f"{self._prefix}.{name}")(attr)
+        setattr(self, name, attr) # Later lookups skip __getattr__
+        return attr
+
+    def __repr__(self):
+        return f"<instrumented {self._module!r}>"
+
+def instrument_module(module, prefix: str):
+    """Returns `module` with every function timed as '<prefix>.<name>'; None stays None."""
+    if module is None:
+        return None
+    return _InstrumentedModule(module, prefix)
+
+# --- Snapshots and export ---
+
+def snapshot() -> dict:
+    """A consistent copy of everything recorded so far."""
+    registry = _registry
+    with registry.lock:
+        counters = dict(registry.counters)
+        histograms = {name: h.as_dict() for name, h in registry.histograms.items()}
+        spans = list(registry.spans)
+    return {
+        "enabled": _enabled,
+        "tracing": _tracing,
+        "started": registry.started,
+        "taken": time.time(),
+        "counters": counters,
+        "histograms": histograms,
+        "spans": spans,
+    }
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def to_prometheus(data: dict = None) -> str:
+    """Renders a snapshot in the Prometheus text exposition format."""
+    data = data if data is not None else snapshot()
+    duration = f"{PROMETHEUS_PREFIX}_operation_duration_seconds"
+    errors = f"{PROMETHEUS_PREFIX}_operation_errors_total"
+    events = f"{PROMETHEUS_PREFIX}_events_total"
+    lines = [f"# HELP {duration} Duration of instrumented operations.", f"# TYPE {duration} histogram"]
+    for name, h in sorted(data["histograms"].items()):
+        op = _label(name)
+        for bound, count in h["buckets"]:
+            lines.append(f'{duration}_bucket{{operation="{op}",le="{bound}"}} {count}')
+        lines.append(f'{duration}_sum{{operation="{op}"}} {h["sum"]!r}')
+        lines.append(f'{duration}_count{{operation="{op}"}} {h["count"]}')
+    lines += [f"# HELP {errors} Instrumented operations that raised.", f"# TYPE {errors} counter"]
+    for name, h in sorted(data["histograms"].items()):
+        lines.append(f'{errors}{{operation="{_label(name)}"}} {h["errors"]}')
+    lines += [f"# HELP {events} Application event counters.", f"# TYPE {events} counter"]
+    for name, value in sorted(data["counters"].items()):
+        lines.append(f'{events}{{event="{_label(name)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+def _write_atomically(path: str, text: str):
+    # Scrapers and readers never see a half-written file
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(partial, path)
+
+def write_prometheus(path: str, data: dict = None):
+    _write_atomically(path, to_prometheus(data))
+
+def write_json(path: str, data: dict = None):
+    _write_atomically(path, json.dumps(data if data is not None else snapshot(), indent=2, sort_keys=True) + "\n")
+
+class _Exporter(threading.Thread):
+    def __init__(self, path: str, interval: float):
+        super().__init__(name="fintechx-metrics-exporter", daemon=True)
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def export(self):
+        try:
+            if self.path.endswith(".json"):
+                write_json(self.path)
+            else:
+                write_prometheus(self.path)
+        except OSError as e:
+            logger.error("Failed to export metrics to %s: %s", self.path, e)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.export()
+
+_exporter = None
+
+def start_exporter(path: str, interval: float = 15.0):
+    """Rewrites `path` every `interval` seconds and once more at exit (.json for JSON, else Prometheus text)."""
+    global _exporter
+    stop_exporter()
+    _exporter = _Exporter(path, interval)
+    _exporter.start()
+
+def stop_exporter():
+    """Stops the periodic exporter after a final export. Safe to call more than once."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.stopped.set()
+        _exporter.export()
+        _exporter = None
+
+atexit.register(stop_exporter)
+
+def configure(mode: str = None):
+    """Applies a metrics mode: 'on' (or 1/true/yes), 'trace' for spans too, anything else leaves it off.
+
+    The FINTECHX_METRICS environment variable, when set, takes precedence over `mode`.
+    """
+    value = (os.environ.get(METRICS_ENV_VAR) or mode or "").strip().lower()
+    if value in ("1", "true", "on", "yes"):
+        enable()
+    elif value == "trace":
+        enable(tracing=True)
@@ -0,0 +1,67 @@
+import logging
+import os
+import threading
+from typing import Optional
+
+try:
+    from fintechx_desktop.infrastructure import fintechx_native
+except ImportError:
+    fintechx_native = None # Without the native module there is no BIN table; lookups return None
+
+# BIN (IIN) ranges map a PAN's leading digits to its scheme, issuer and valid lengths. The table
+# is a native, read-only index built once per process from a CSV of low,high,scheme,issuer,lengths
+# rows (see bin_ranges.csv next to this module). A copy in the user's config directory replaces
+# the packaged one, so issuer-level ranges can be added without a rebuild.
+
+USER_BIN_TABLE_PATH = os.path.join(os.path.expanduser("~"), ".fintechx", "bin_ranges.csv")
+DEFAULT_BIN_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin_ranges.csv")
+
+logger = logging.getLogger(__name__)
+
+_table = None
+_table_loaded = False
+_table_lock = threading.Lock()
+
+def bin_table_path() -> str:
+    """The CSV the table is loaded from: the user's copy if present, else the packaged default."""
+    return USER_BIN_TABLE_PATH if os.path.exists(USER_BIN_TABLE_PATH) else DEFAULT_BIN_TABLE_PATH
+
+def get_bin_table():
+    """Returns the process-wide native BinTable, loading it on first use; None if it is unavailable."""
+    global _table, _table_loaded
+    with _table_lock:
+        if not _table_loaded:
+            _table_loaded = True
+            if fintechx_native is None:
+                logger.error("Native C++ module (fintechx_native) not found. BIN lookups disabled.")
+            else:
+                path = bin_table_path()
+                try:
+                    _table = fintechx_native.BinTable.from_csv(path)
+                    logger.info("Loaded %d BIN ranges from %s", len(_table), path)
+                except (RuntimeError, ValueError) as e:
+                    logger.error("Failed to load BIN table %s: %s", path, e)
+        return _table
+
+def reload_bin_table():
+    """Drops the cached table so the next lookup rereads the CSV."""
+    global _table, _table_loaded
+    with _table_lock:
+        _table = None
+        _table_loaded = False
+    return get_bin_table()
+
+def lookup_bin(pan: str) -> Optional[dict]:
+    """{'scheme', 'issuer', 'lengths'} for the range holding a PAN or prefix, or None if unknown.
+
+    A prefix shorter than 8 digits matches only if one range covers every PAN that starts with it.
+    """
+    table = get_bin_table()
+    if table is None:
+        return None
+    return table.lookup(pan.replace(" ", "").replace("-", ""))
+
+def allowed_lengths(pan: str) -> list[int]:
+    """Valid PAN lengths for a PAN or prefix; empty when its range is unknown."""
+    info = lookup_bin(pan)
+    return info["lengths"] if info else []
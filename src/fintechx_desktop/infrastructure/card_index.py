@@ -0,0 +1,109 @@
+import logging
+from typing import Iterable, Optional
+
+from fintechx_desktop.core import metrics
+from . import database
+from .ledger import LedgerEntry, _ENTRY_COLUMNS
+
+try:
+    from fintechx_desktop.infrastructure import fintechx_native
+except ImportError:
+    fintechx_native = None # PAN storage needs the native module; PanVault refuses to start without it
+fintechx_native = metrics.instrument_module(fintechx_native, "native")
+
+# PANs are stored encrypted with AES-256-GCM under random IVs, so equal PANs never produce equal
+# ciphertexts. Each row therefore also carries a blind index: HMAC-SHA256 of the normalised PAN
+# under a separate key, truncated to PAN_INDEX_BYTES. Equality lookups hit a B-tree index on that
+# column. The index reveals which rows share a card, but nothing about the PAN itself without
+# the index key.
+
+PAN_INDEX_INFO = b"fintechx/pan-blind-index/v1"
+PAN_ENCRYPTION_INFO = b"fintechx/pan-encryption/v1"
+PAN_INDEX_BYTES = 16 # 128-bit tags: collisions are negligible and the index stays compact
+ATTACH_BATCH_SIZE = 10000
+
+def normalize_pan(pan: str) -> bytes:
+    """ASCII digits of a PAN with spaces and dashes removed; the form that is indexed and encrypted."""
+    digits = pan.replace(" ", "").replace("-", "")
+    if not digits.isdigit():
+        raise ValueError("PAN must contain only digits, spaces and dashes")
+    return digits.encode("ascii")
+
+class PanVault:
+    """Encrypts PANs for storage in transactions and finds rows by card via the blind index."""
+
+    def __init__(self, index_key: bytes, encryption_key: bytes):
+        if fintechx_native is None:
+            raise RuntimeError("Native C++ module (fintechx_native) is required for PAN storage.")
+        if index_key == encryption_key:
+            raise ValueError("index and encryption keys must differ")
+        self._index_key = bytes(index_key)
+        self._cipher = fintechx_native.AesGcm(encryption_key)
+
+    @classmethod
+    def for_database(cls, db_password: str) -> "PanVault":
+        """Keys derived from the database key with HKDF, one per purpose."""
+        return cls(database.derive_subkey(db_password, PAN_INDEX_INFO),
+                   database.derive_subkey(db_password, PAN_ENCRYPTION_INFO))
+
+    def blind_index(self, pan: str) -> bytes:
+        return self.blind_indexes([pan])[0]
+
+    @metrics.timed("pan_vault.blind_indexes")
+    def blind_indexes(self, pans: Iterable[str]) -> list[bytes]:
+        """Blind indexes for many PANs, computed natively in one GIL-free batch."""
+        normalized = [normalize_pan(pan) for pan in pans]
+        packed = fintechx_native.hmac_sha256_batch(normalized, self._index_key, PAN_INDEX_BYTES)
+        return [packed[i:i + PAN_INDEX_BYTES] for i in range(0, len(packed), PAN_INDEX_BYTES)]
+
+    @metrics.timed("pan_vault.encrypt")
+    def encrypt(self, pan: str, index: bytes) -> bytes:
+        # The blind index is the AAD, so a ciphertext cannot be moved to a row indexed as another card
+        return self._cipher.encrypt(normalize_pan(pan), index)
+
+    @metrics.timed("pan_vault.decrypt")
+    def decrypt(self, sealed: bytes, index: bytes) -> Optional[str]:
+        """The stored PAN, or None if the ciphertext fails authentication."""
+        plaintext = self._cipher.decrypt(sealed, index)
+        return plaintext.decode("ascii") if plaintext is not None else None
+
+    def attach_pans(self, conn, rows: Iterable[tuple], batch_size: int = ATTACH_BATCH_SIZE) -> int:
+        """Stores (transaction_id, pan) pairs as ciphertext plus blind index, batch_size rows per commit."""
+        total = 0
+        batch = []
+
+        def flush():
+            indexes = self.blind_indexes(pan for _, pan in batch)
+            params = [(self.encrypt(pan, index), index, transaction_id)
+                      for (transaction_id, pan), index in zip(batch, indexes)]
+            try:
+                conn.executemany("UPDATE transactions SET pan_ciphertext = ?, pan_index = ? WHERE id = ?", params)
+                conn.commit()
+            except Exception as e:
+                logging.error("Storing PANs failed after %d rows: %s", total, e)
+                conn.rollback()
+                raise
+
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                flush()
+                total += len(batch)
+                batch = []
+        if batch:
+            flush()
+            total += len(batch)
+        return total
+
+    @metrics.timed("pan_vault.find_transactions")
+    def find_transactions(self, conn, pan: str, after_id: int = 0, limit: int = 100) -> list:
+        """Transactions made with this card, by id, as LedgerEntry rows.
+
+        An index seek on idx_transactions_pan_index; no row is decrypted. Pass the last id
+        returned as after_id for the next page.
+        """
+        cursor = conn.execute(
+            f"SELECT {_ENTRY_COLUMNS} FROM transactions WHERE pan_index = ? AND id > ? ORDER BY id LIMIT ?",
+            (self.blind_index(pan), after_id, limit)
+        )
+        return [LedgerEntry(*row) for row in cursor.fetchall()]
@@ -1,8 +1,17 @@
 
 import os
+import ctypes
+import ctypes.util
+import hashlib
+import hmac
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from pysqlcipher3 import dbapi2 as sqlite
 
+from fintechx_desktop.core import metrics
+
 # Import the native C++ module for key derivation
 # Note: This assumes the C++ module is built and available in the python path
 # The build process needs to handle placing the .so/.pyd file correctly.
@@ -25,76 +34,607 @@ except ImportError:
 
     fintechx_native = DummyNative()
 
+fintechx_native = metrics.instrument_module(fintechx_native, "native")
+
 DATABASE_FILE = "fintechx_data.db"
 DATABASE_PATH = os.path.join(os.path.expanduser("~"), ".fintechx", DATABASE_FILE) # Store in user's home dir
 PBKDF2_ITERATIONS = 150000 # Number of iterations for key derivation
 SALT_LENGTH = 16 # Bytes
 DB_KEY_LENGTH = 32 # Bytes (for AES-256)
-
-# Ensure the storage directory exists
-os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
+KEY_CACHE_TTL = 15 * 60 # Seconds a derived key stays cached after its last use
+POOL_MAX_IDLE = 4 # Idle connections kept open per database key
 
 # --- Database Initialization and Schema --- 
 
-def get_db_connection(db_password: str) -> sqlite.Connection:
-    """Establishes a connection to the encrypted SQLite database."""
-    conn = None
+def _load_salt(db_path: str) -> bytes:
+    """Reads the database key salt, creating it on first use."""
+    # We need a persistent salt for the database key derivation.
+    # This salt should be stored securely, but NOT in the database itself.
+    # For a desktop app, storing it in a separate config file or using OS keychain might be options.
+    # For simplicity here, we'll store it alongside the DB, but this is NOT ideal for production.
+    salt_path = db_path + ".salt"
+    # First filesystem access for a database in this process; nothing is created at import time
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    if os.path.exists(salt_path):
+        with open(salt_path, "rb") as f:
+            return f.read()
+    salt = fintechx_native.generate_random_bytes(SALT_LENGTH)
+    with open(salt_path, "wb") as f:
+        f.write(salt)
+    return salt
+
+# --- Derived Key Cache ---
+
+def _load_libc():
     try:
-        conn = sqlite.connect(DATABASE_PATH)
-
-        # Derive the database key from the password
-        # We need a persistent salt for the database key derivation.
-        # This salt should be stored securely, but NOT in the database itself.
-        # For a desktop app, storing it in a separate config file or using OS keychain might be options.
-        # For simplicity here, we'll store it alongside the DB, but this is NOT ideal for production.
-        salt_path = DATABASE_PATH + ".salt"
-        if os.path.exists(salt_path):
-            with open(salt_path, "rb") as f:
-                salt = f.read()
-        else:
-            salt = fintechx_native.generate_random_bytes(SALT_LENGTH)
-            with open(salt_path, "wb") as f:
-                f.write(salt)
+        return ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    except (OSError, TypeError):
+        return None
+
+_libc = _load_libc()
+
+class _SecretBuffer:
+    """A fixed-size byte buffer that is mlock()ed where possible and can be wiped in place."""
+
+    def __init__(self, data: bytes):
+        self._buf = bytearray(data)
+        self._view = (ctypes.c_char * len(self._buf)).from_buffer(self._buf)
+        self._locked = False
+        mlock = getattr(_libc, "mlock", None)
+        if mlock is not None and len(self._buf):
+            # Best effort: keeps the key out of swap. Fails harmlessly under a low RLIMIT_MEMLOCK.
+            self._locked = mlock(ctypes.addressof(self._view), ctypes.c_size_t(len(self._buf))) == 0
+
+    def hex(self) -> str:
+        return self._buf.hex()
+
+    def wipe(self):
+        ctypes.memset(ctypes.addressof(self._view), 0, len(self._buf))
+        if self._locked:
+            _libc.munlock(ctypes.addressof(self._view), ctypes.c_size_t(len(self._buf)))
+            self._locked = False
+
+class DerivedKeyCache:
+    """Caches PBKDF2-derived database keys per (database, password) for a sliding TTL.
+
+    Entries are looked up by an HMAC of the password under a random per-process secret, so the
+    password itself is never stored and a fingerprint cannot be used to test password guesses
+    without that secret. Keys live in mlock()ed buffers that are zeroed when they expire or
+    are evicted. Note that the hex string handed to SQLCipher is an immutable Python str and
+    cannot be wiped; it is short-lived and never cached.
+    """
+
+    def __init__(self, ttl: float = KEY_CACHE_TTL):
+        self.ttl = ttl
+        self._fingerprint_key = os.urandom(32) # Fingerprints are only compared within this process
+        self._lock = threading.Lock()
+        self._entries = {} # db_path -> (fingerprint, _SecretBuffer, expires_at)
+        self._salts = {}
+        self._timer = None
+
+    def salt(self, db_path: str) -> bytes:
+        with self._lock:
+            salt = self._salts.get(db_path)
+            if salt is None:
+                salt = self._salts[db_path] = _load_salt(db_path)
+            return salt
 
-        db_key_bytes = fintechx_native.derive_key_pbkdf2(
+    def fingerprint(self, db_path: str, db_password: str) -> bytes:
+        """Identifies a password for a database without storing it."""
+        message = db_path.encode("utf-8") + b"\0" + db_password.encode("utf-8")
+        return hmac.new(self._fingerprint_key, message, hashlib.sha256).digest()
+
+    def lookup(self, db_path: str, db_password: str) -> tuple[bytes, str]:
+        """Returns (fingerprint, hex key); the key is None on a cache miss. A hit refreshes the TTL."""
+        fingerprint = self.fingerprint(db_path, db_password)
+        return fingerprint, self.lookup_fingerprint(db_path, fingerprint)
+
+    def lookup_fingerprint(self, db_path: str, fingerprint: bytes) -> str:
+        """The hex key cached for a fingerprint from ``lookup``, or None once it has expired. A hit refreshes the TTL."""
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._entries.get(db_path)
+            if entry is None or not hmac.compare_digest(entry[0], fingerprint):
+                return None
+            self._entries[db_path] = (fingerprint, entry[1], now + self.ttl)
+            return entry[1].hex()
+
+    @metrics.timed("db.derive_key")
+    def derive(self, db_path: str, db_password: str) -> _SecretBuffer:
+        """Runs the full PBKDF2 derivation. The result is not cached until ``store`` is called."""
+        return _SecretBuffer(fintechx_native.derive_key_pbkdf2(
             db_password,
-            salt,
+            self.salt(db_path),
             PBKDF2_ITERATIONS,
             DB_KEY_LENGTH
-        )
-        # SQLCipher expects the key as a hex string
-        db_key_hex = db_key_bytes.hex()
+        ))
 
-        # Set the key PRAGMA - THIS MUST BE THE FIRST OPERATION
-        conn.execute(f"PRAGMA key = 'x\"{db_key_hex}\"' ")
+    def store(self, db_path: str, fingerprint: bytes, key: _SecretBuffer):
+        """Caches a key that has been proven to unlock db_path, replacing (and wiping) any previous one."""
+        with self._lock:
+            old = self._entries.get(db_path)
+            if old is not None and old[1] is not key:
+                old[1].wipe()
+            self._entries[db_path] = (fingerprint, key, time.monotonic() + self.ttl)
+            self._schedule_purge()
+
+    def evict(self, db_path: str = None):
+        """Wipes the cached key for one database, or for all of them."""
+        with self._lock:
+            paths = [db_path] if db_path is not None else list(self._entries)
+            for path in paths:
+                entry = self._entries.pop(path, None)
+                if entry is not None:
+                    entry[1].wipe()
+
+    def _purge_expired(self, now: float):
+        for path, (_, key, expires_at) in list(self._entries.items()):
+            if expires_at <= now:
+                key.wipe()
+                del self._entries[path]
+
+    def _schedule_purge(self):
+        # Expired keys are also dropped on the next lookup; the timer covers an idle app
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.ttl + 1, self._purge_on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _purge_on_timer(self):
+        with self._lock:
+            self._timer = None
+            self._purge_expired(time.monotonic())
+            if self._entries:
+                self._schedule_purge()
+
+    def subkey(self, db_path: str, db_password: str, info: bytes, length: int = DB_KEY_LENGTH) -> bytes:
+        """Derives an independent key for another purpose from the database key with HKDF-SHA256.
+
+        Uses the cached database key when there is one. The result depends on the password, so
+        unlock the database first if a wrong password must be rejected rather than yield a wrong key.
+        """
+        _, db_key_hex = self.lookup(db_path, db_password)
+        if db_key_hex is None:
+            key = self.derive(db_path, db_password)
+            db_key_hex = key.hex()
+            key.wipe()
+        return bytes(fintechx_native.derive_key_hkdf(bytes.fromhex(db_key_hex), self.salt(db_path), info, length))
+
+_key_cache = DerivedKeyCache()
+
+def derive_subkey(db_password: str, info: bytes, length: int = DB_KEY_LENGTH) -> bytes:
+    """HKDF subkey of DATABASE_PATH's key, e.g. for the PAN blind index (see card_index.py)."""
+    return _key_cache.subkey(DATABASE_PATH, db_password, info, length)
+
+# SQLCipher settings applied after PRAGMA key and before the first read, which is when SQLCipher
+# derives its keys. Raw keys skip SQLCipher's own PBKDF2 entirely; the KDF algorithm still
+# selects the (2-iteration) derivation of the page HMAC key, so it must match the file.
+CIPHER_PRAGMAS = (
+    "PRAGMA cipher_page_size = 4096;",
+    "PRAGMA cipher_hmac_algorithm = HMAC_SHA256;",
+    "PRAGMA cipher_kdf_algorithm = PBKDF2_HMAC_SHA256;",
+)
+
+# Files created before the raw-key open were keyed with PRAGMA key = 'x"<hex>"', which SQLCipher
+# treats as a passphrase and stretches again with kdf_iter rounds on every open.
+LEGACY_CIPHER_PRAGMAS = (
+    "PRAGMA cipher_page_size = 4096;",
+    f"PRAGMA kdf_iter = {PBKDF2_ITERATIONS};",
+    "PRAGMA cipher_hmac_algorithm = HMAC_SHA256;",
+    "PRAGMA cipher_kdf_algorithm = PBKDF2_HMAC_SHA256;",
+)
+
+def _raw_key_marker(db_path: str) -> str:
+    # Written next to the database once it has opened with a raw key; only unmarked files can be legacy
+    return db_path + ".rawkey"
+
+def _mark_raw_keyed(db_path: str):
+    marker = _raw_key_marker(db_path)
+    if not os.path.exists(marker):
+        try:
+            open(marker, "wb").close()
+        except OSError as e:
+            # Not fatal: a wrong key just keeps trying the legacy settings too
+            logging.warning(f"Could not write {marker}: {e}")
 
-        # Set secure PRAGMA settings (do this after setting the key)
-        conn.execute("PRAGMA cipher_page_size = 4096;")
-        conn.execute(f"PRAGMA kdf_iter = {PBKDF2_ITERATIONS};") # Match iterations used for key derivation
-        conn.execute("PRAGMA cipher_hmac_algorithm = HMAC_SHA256;")
-        conn.execute("PRAGMA cipher_kdf_algorithm = PBKDF2_HMAC_SHA256;")
+def _raw_key_literal(db_key_hex: str) -> str:
+    return f"\"x'{db_key_hex}'\""
 
+def _legacy_key_literal(db_key_hex: str) -> str:
+    return f"'x\"{db_key_hex}\"'"
+
+def _try_open(db_path: str, key_literal: str, pragmas: tuple, check_same_thread: bool) -> sqlite.Connection:
+    """Opens and keys a connection, raising sqlite.Error if the key or settings do not match the file."""
+    conn = sqlite.connect(db_path, check_same_thread=check_same_thread)
+    try:
+        # Set the key PRAGMA - THIS MUST BE THE FIRST OPERATION
+        conn.execute(f"PRAGMA key = {key_literal};")
+        for pragma in pragmas:
+            conn.execute(pragma)
         # Test the key by trying to access data (e.g., schema version)
         # This will fail if the key is incorrect
         conn.execute("SELECT count(*) FROM sqlite_master;")
+        return conn
+    except BaseException:
+        conn.close()
+        raise
+
+@metrics.timed("db.migrate_legacy_database")
+def migrate_legacy_database(db_path: str, db_key_hex: str) -> bool:
+    """Re-encrypts a database keyed the legacy (passphrase) way so it opens with the raw key.
+
+    The data is exported with sqlcipher_export into a sibling file, which then atomically
+    replaces the original. The legacy file is kept as ``<db>.legacy.bak`` for the user to
+    remove. Returns False if db_path does not open with the legacy settings.
+    """
+    try:
+        legacy = _try_open(db_path, _legacy_key_literal(db_key_hex), LEGACY_CIPHER_PRAGMAS, True)
+    except sqlite.Error:
+        return False
+
+    migrated_path = db_path + ".migrating"
+    backup_path = db_path + ".legacy.bak"
+    try:
+        if os.path.exists(migrated_path):
+            os.remove(migrated_path)
+        legacy.execute(f"ATTACH DATABASE ? AS migrated KEY {_raw_key_literal(db_key_hex)};", (migrated_path,))
+        for pragma in CIPHER_PRAGMAS:
+            legacy.execute(pragma.replace("PRAGMA ", "PRAGMA migrated.", 1))
+        legacy.execute("SELECT sqlcipher_export('migrated');")
+        user_version = legacy.execute("PRAGMA main.user_version;").fetchone()[0]
+        legacy.execute(f"PRAGMA migrated.user_version = {int(user_version)};")
+        legacy.execute("DETACH DATABASE migrated;")
+        legacy.close()
+
+        # Prove the new file opens on the fast path before swapping it in
+        _try_open(migrated_path, _raw_key_literal(db_key_hex), CIPHER_PRAGMAS, True).close()
+    except BaseException:
+        legacy.close()
+        if os.path.exists(migrated_path):
+            os.remove(migrated_path)
+        raise
+
+    os.replace(db_path, backup_path)
+    os.replace(migrated_path, db_path)
+    logging.warning(f"Migrated {db_path} to raw-key encryption; the previous file is kept at {backup_path}")
+    return True
+
+@metrics.timed("db.open")
+def _open_keyed_connection(db_path: str, db_key_hex: str, check_same_thread: bool = True) -> sqlite.Connection:
+    """Opens db_path with an already-derived raw key and verifies the key works.
+
+    A file that does not open on the raw-key path but does open with the legacy settings is
+    migrated in place first, so SQLCipher's own KDF runs at most once per legacy file. Files
+    that have ever opened with a raw key are marked, so a wrong key for them fails without
+    also paying for the legacy KDF.
+    """
+    try:
+        try:
+            conn = _try_open(db_path, _raw_key_literal(db_key_hex), CIPHER_PRAGMAS, check_same_thread)
+        except sqlite.DatabaseError:
+            if os.path.exists(_raw_key_marker(db_path)) or not migrate_legacy_database(db_path, db_key_hex):
+                raise
+            conn = _try_open(db_path, _raw_key_literal(db_key_hex), CIPHER_PRAGMAS, check_same_thread)
+        _mark_raw_keyed(db_path)
 
-        logging.info(f"Successfully connected to encrypted database: {DATABASE_PATH}")
+        logging.info(f"Successfully connected to encrypted database: {db_path}")
         return conn
 
     except sqlite.Error as e:
         logging.error(f"Database connection or key error: {e}")
-        if conn:
-            conn.close()
         # Re-raise or handle appropriately (e.g., prompt user for correct password)
         raise ConnectionError(f"Failed to connect/unlock database: {e}") from e
     except Exception as e:
         logging.error(f"Unexpected error during DB connection: {e}")
-        if conn:
+        raise
+
+def _unlock(db_path: str, db_password: str, key_cache: DerivedKeyCache,
+            check_same_thread: bool = True) -> tuple[bytes, sqlite.Connection]:
+    """Opens db_path with the cached key, deriving (and caching) it only if needed.
+
+    A key is cached only after it has unlocked the database, so a mistyped password
+    never displaces the working key.
+    """
+    fingerprint, db_key_hex = key_cache.lookup(db_path, db_password)
+    if db_key_hex is not None:
+        metrics.increment("db.key_cache.hit")
+        return fingerprint, _open_keyed_connection(db_path, db_key_hex, check_same_thread)
+
+    metrics.increment("db.key_cache.miss")
+    key = key_cache.derive(db_path, db_password)
+    try:
+        conn = _open_keyed_connection(db_path, key.hex(), check_same_thread)
+    except Exception:
+        key.wipe()
+        raise
+    key_cache.store(db_path, fingerprint, key)
+    return fingerprint, conn
+
+@metrics.timed("db.get_db_connection")
+def get_db_connection(db_password: str) -> sqlite.Connection:
+    """Establishes a connection to the encrypted SQLite database.
+
+    The caller owns the returned connection. Prefer ``pooled_connection`` for short operations.
+    """
+    _, conn = _unlock(DATABASE_PATH, db_password, _key_cache)
+    return conn
+
+# --- Connection Pool ---
+
+_schema_lock = threading.Lock()
+_schema_initialized = set() # Database paths whose schema has been verified this process
+
+def _ensure_schema(db_path: str, conn: sqlite.Connection):
+    with _schema_lock:
+        if db_path not in _schema_initialized:
+            initialize_schema(conn)
+            _schema_initialized.add(db_path)
+
+class ConnectionPool:
+    """Hands out already-keyed SQLCipher connections for one database file.
+
+    Idle connections are kept per key fingerprint, so a connection unlocked with one password
+    is never handed to a caller presenting another. An idle connection still holds the key, so
+    it is closed once it has been idle for the key cache's TTL, like the cached key itself.
+    Connections are opened with check_same_thread=False but are only ever used by one borrower
+    at a time.
+    """
+
+    def __init__(self, db_path: str = DATABASE_PATH, max_idle: int = POOL_MAX_IDLE,
+                 key_cache: DerivedKeyCache = None):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self.key_cache = key_cache or _key_cache
+        self._lock = threading.Lock()
+        self._idle = {} # fingerprint -> [(Connection, expires_at)], oldest first
+        self._timer = None
+
+    def _take_idle(self, fingerprint: bytes) -> sqlite.Connection:
+        with self._lock:
+            self._close_expired(time.monotonic())
+            idle = self._idle.get(fingerprint)
+            if idle:
+                metrics.increment("db.pool.reused")
+                return idle.pop()[0]
+        return None
+
+    def _acquire(self, db_password: str) -> tuple[bytes, sqlite.Connection]:
+        fingerprint, db_key_hex = self.key_cache.lookup(self.db_path, db_password)
+        if db_key_hex is not None:
+            conn = self._take_idle(fingerprint)
+            if conn is not None:
+                return fingerprint, conn
+        metrics.increment("db.pool.opened")
+        fingerprint, conn = _unlock(self.db_path, db_password, self.key_cache, check_same_thread=False)
+        _ensure_schema(self.db_path, conn)
+        return fingerprint, conn
+
+    def _acquire_by_fingerprint(self, fingerprint: bytes) -> sqlite.Connection:
+        db_key_hex = self.key_cache.lookup_fingerprint(self.db_path, fingerprint)
+        if db_key_hex is None:
+            raise ConnectionError("Database key has expired or was evicted; unlock the database again")
+        conn = self._take_idle(fingerprint)
+        if conn is None:
+            metrics.increment("db.pool.opened")
+            conn = _open_keyed_connection(self.db_path, db_key_hex, check_same_thread=False)
+            _ensure_schema(self.db_path, conn)
+        return conn
+
+    def _release(self, fingerprint: bytes, conn: sqlite.Connection):
+        conn.rollback()
+        with self._lock:
+            idle = self._idle.setdefault(fingerprint, [])
+            if len(idle) < self.max_idle:
+                idle.append((conn, time.monotonic() + self.key_cache.ttl))
+                if self._timer is None:
+                    self._schedule_purge()
+                return
+        conn.close()
+
+    def _close_expired(self, now: float):
+        """Closes idle connections past their TTL. Called with self._lock held."""
+        for fingerprint, idle in list(self._idle.items()):
+            while idle and idle[0][1] <= now:
+                idle.pop(0)[0].close()
+            if not idle:
+                del self._idle[fingerprint]
+
+    def _schedule_purge(self):
+        # Expired connections are also closed on the next acquire; the timer covers an idle app
+        self._timer = threading.Timer(self.key_cache.ttl + 1, self._purge_on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _purge_on_timer(self):
+        with self._lock:
+            self._timer = None
+            self._close_expired(time.monotonic())
+            if self._idle:
+                self._schedule_purge()
+
+    @contextmanager
+    def _lend(self, fingerprint: bytes, conn: sqlite.Connection):
+        try:
+            yield conn
+        except BaseException:
             conn.close()
+            raise
+        else:
+            self._release(fingerprint, conn)
+
+    @contextmanager
+    def connection(self, db_password: str):
+        """Borrows a keyed connection; uncommitted work is rolled back when it is returned."""
+        with metrics.span("db.pool.acquire"):
+            fingerprint, conn = self._acquire(db_password)
+        with self._lend(fingerprint, conn):
+            yield conn
+
+    def unlock(self, db_password: str) -> bytes:
+        """Unlocks the database and returns the key fingerprint for ``connection_by_fingerprint``.
+
+        Lets long-lived holders (e.g. UI views) borrow connections without keeping the password.
+        """
+        fingerprint, conn = self._acquire(db_password)
+        self._release(fingerprint, conn)
+        return fingerprint
+
+    @contextmanager
+    def connection_by_fingerprint(self, fingerprint: bytes):
+        """Borrows a connection with a key unlocked earlier by ``unlock``.
+
+        Works only while that key is cached; each borrow refreshes its TTL like a password lookup.
+        Raises ConnectionError once the key has expired or the pool was closed.
+        """
+        with metrics.span("db.pool.acquire"):
+            conn = self._acquire_by_fingerprint(fingerprint)
+        with self._lend(fingerprint, conn):
+            yield conn
+
+    def close(self):
+        """Closes every idle connection and wipes this database's cached key (e.g. on app lock)."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+        self.key_cache.evict(self.db_path)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """Returns the process-wide pool for DATABASE_PATH."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
+
+def pooled_connection(db_password: str):
+    """Borrows a keyed connection with the schema already initialised, e.g. ``with pooled_connection(pw) as conn:``."""
+    return get_pool().connection(db_password)
+
+def unlock_database(db_password: str) -> bytes:
+    """Unlocks DATABASE_PATH and returns a key fingerprint for ``unlocked_connection`` (see ConnectionPool.unlock)."""
+    return get_pool().unlock(db_password)
+
+def unlocked_connection(fingerprint: bytes):
+    """Like ``pooled_connection``, but for a fingerprint from ``unlock_database`` instead of the password."""
+    return get_pool().connection_by_fingerprint(fingerprint)
+
+SCHEMA_VERSION = 2 # PRAGMA user_version; 1 = integer minor units with trigger-maintained balances and an
+                   # append-only ledger, 2 = PAN columns
+OPENING_BALANCE_CATEGORY = "Opening Balance" # Category of balances carried over by _migrate_to_integer_cents
+
+# Money is stored as INTEGER minor units (cents); see ledger.to_cents/format_cents
+_ACCOUNTS_DDL = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL, -- e.g., 'checking', 'savings', 'credit_card'
+    balance_cents INTEGER NOT NULL DEFAULT 0, -- Maintained by trg_transactions_insert
+    currency TEXT DEFAULT 'USD',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+"""
+
+_TRANSACTIONS_DDL = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_id INTEGER NOT NULL,
+    description TEXT,
+    amount_cents INTEGER NOT NULL,
+    category TEXT,
+    transaction_date DATE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    pan_ciphertext BLOB, -- AES-256-GCM sealed PAN (card_index.PanVault)
+    pan_index BLOB, -- Truncated HMAC blind index of the PAN, for equality lookups
+    FOREIGN KEY (account_id) REFERENCES accounts(id)
+);
+"""
+
+def _columns(cursor, table: str) -> set:
+    return {row[1] for row in cursor.execute(f"PRAGMA table_info({table});").fetchall()}
+
+def _migrate_to_integer_cents(conn: sqlite.Connection):
+    """Rebuilds REAL-valued accounts/transactions tables as integer cents, in one transaction.
+
+    The rebuild runs in autocommit mode under an explicit BEGIN IMMEDIATE/COMMIT: with the
+    driver's implicit transactions every CREATE/DROP/ALTER would first commit, and a failure
+    after ``DROP TABLE transactions`` could not be rolled back.
+
+    Amounts are rounded half away from zero to the cent. Account balances are recomputed from
+    the ledger, which becomes the single source of truth the triggers then maintain. Where a
+    stored balance differs from its account's transactions (e.g. an opening balance entered
+    without one), the difference is first recorded as an OPENING_BALANCE_CATEGORY transaction,
+    so no balance changes.
+    """
+    cursor = conn.cursor()
+    if "amount" not in _columns(cursor, "transactions") and "balance" not in _columns(cursor, "accounts"):
+        return
+
+    logging.warning("Migrating accounts/transactions to integer cents...")
+    conn.commit()
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    cursor.execute("BEGIN IMMEDIATE;")
+    try:
+        if "amount" in _columns(cursor, "transactions"):
+            cursor.execute(_TRANSACTIONS_DDL.format(name="transactions_cents"))
+            cursor.execute("""
+            INSERT INTO transactions_cents (id, account_id, description, amount_cents, category, transaction_date, created_at)
+            SELECT id, account_id, description, CAST(ROUND(amount * 100) AS INTEGER), category, transaction_date, created_at
+            FROM transactions;
+            """)
+            cursor.execute("DROP TABLE transactions;")
+            cursor.execute("ALTER TABLE transactions_cents RENAME TO transactions;")
+
+        if "balance" in _columns(cursor, "accounts"):
+            mismatches = cursor.execute("""
+            SELECT a.id, CAST(ROUND(COALESCE(a.balance, 0) * 100) AS INTEGER) AS stored,
+                   COALESCE((SELECT SUM(t.amount_cents) FROM transactions t WHERE t.account_id = a.id), 0) AS summed,
+                   COALESCE((SELECT MIN(t.transaction_date) FROM transactions t WHERE t.account_id = a.id),
+                            DATE(a.created_at), DATE('now'))
+            FROM accounts a
+            WHERE stored != summed;
+            """).fetchall()
+            for account_id, stored, summed, opening_date in mismatches:
+                logging.warning("Account %s: stored balance %s != %s cents of transactions; "
+                                "recording the difference as an opening balance", account_id, stored, summed)
+                cursor.execute("""
+                INSERT INTO transactions (account_id, description, amount_cents, category, transaction_date)
+                VALUES (?, ?, ?, ?, ?);
+                """, (account_id, "Opening balance (migrated)", stored - summed, OPENING_BALANCE_CATEGORY,
+                      opening_date))
+
+            cursor.execute(_ACCOUNTS_DDL.format(name="accounts_cents"))
+            cursor.execute("""
+            INSERT INTO accounts_cents (id, user_id, name, type, balance_cents, currency, created_at)
+            SELECT a.id, a.user_id, a.name, a.type,
+                   COALESCE((SELECT SUM(t.amount_cents) FROM transactions t WHERE t.account_id = a.id), 0),
+                   a.currency, a.created_at
+            FROM accounts a;
+            """)
+            cursor.execute("DROP TABLE accounts;")
+            cursor.execute("ALTER TABLE accounts_cents RENAME TO accounts;")
+        cursor.execute("COMMIT;")
+    except Exception:
+        cursor.execute("ROLLBACK;")
         raise
+    finally:
+        conn.isolation_level = isolation_level
+    logging.info("Integer-cents migration complete.")
 
 def initialize_schema(conn: sqlite.Connection):
-    """Initializes the database schema if it doesn't exist."""
+    """Initializes the database schema if it doesn't exist, migrating older layouts in place."""
     try:
         cursor = conn.cursor()
 
@@ -109,36 +649,108 @@ def initialize_schema(conn: sqlite.Connection):
         );
         """)
 
-        # Create accounts table (example)
+        # Create accounts and transactions tables (example)
+        cursor.execute(_ACCOUNTS_DDL.format(name="accounts"))
+        cursor.execute(_TRANSACTIONS_DDL.format(name="transactions"))
+        conn.commit()
+
+        (version,) = cursor.execute("PRAGMA user_version;").fetchone()
+        if version < 1:
+            _migrate_to_integer_cents(conn)
+        if "pan_index" not in _columns(cursor, "transactions"):
+            cursor.execute("ALTER TABLE transactions ADD COLUMN pan_ciphertext BLOB;")
+            cursor.execute("ALTER TABLE transactions ADD COLUMN pan_index BLOB;")
+
+        # Ledger read paths (see ledger.py). Keyed on (filter, transaction_date, id), so keyset
+        # pagination is an index seek in page order with no sort. They also carry the short
+        # columns, so balance reconciliation (SUM(amount_cents) per account) reads only the index;
+        # free-text descriptions are left out to keep the indexes small, and a page fetches them
+        # from the table by rowid.
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS accounts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            name TEXT NOT NULL,
-            type TEXT NOT NULL, -- e.g., 'checking', 'savings', 'credit_card'
-            balance REAL DEFAULT 0.0,
-            currency TEXT DEFAULT 'USD',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        );
+        CREATE INDEX IF NOT EXISTS idx_transactions_account_ledger
+            ON transactions(account_id, transaction_date, id, amount_cents, category);
+        """)
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_category_ledger
+            ON transactions(category, transaction_date, id, account_id, amount_cents);
         """)
 
-        # Create transactions table (example)
+        # Card lookups by blind index; rows without a PAN stay out of the index
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_pan_index
+            ON transactions(pan_index) WHERE pan_index IS NOT NULL;
+        """)
+
+        # Incremental balances: every ledger write adjusts accounts.balance_cents, so a balance
+        # lookup is a primary-key read instead of a SUM over the account's history
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_insert AFTER INSERT ON transactions
+        BEGIN
+            UPDATE accounts SET balance_cents = balance_cents + NEW.amount_cents WHERE id = NEW.account_id;
+        END;
+        """)
+
+        # The ledger is append-only: balances, checkpoints, the analytics rollups and
+        # ledger.write_version all assume a written row never changes or disappears, so
+        # corrections are new rows. Only the PAN columns (card_index.py) may be rewritten.
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_no_delete BEFORE DELETE ON transactions
+        BEGIN
+            SELECT RAISE(ABORT, 'transactions are append-only; record a correcting transaction instead');
+        END;
+        """)
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS transactions (
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_no_update
+        BEFORE UPDATE OF id, account_id, amount_cents, category, transaction_date ON transactions
+        BEGIN
+            SELECT RAISE(ABORT, 'transactions are append-only; record a correcting transaction instead');
+        END;
+        """)
+
+        # Periodic balance snapshots (ledger.checkpoint_balances); reconciliation only has to
+        # re-sum the transactions written since an account's latest checkpoint
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS balance_checkpoints (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             account_id INTEGER NOT NULL,
-            description TEXT,
-            amount REAL NOT NULL,
-            category TEXT,
-            transaction_date DATE NOT NULL,
+            balance_cents INTEGER NOT NULL,
+            last_transaction_id INTEGER NOT NULL, -- Highest transactions.id included in balance_cents
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (account_id) REFERENCES accounts(id)
         );
         """)
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_balance_checkpoints_account
+            ON balance_checkpoints(account_id, last_transaction_id);
+        """)
+
+        # Analytics rollups (rollups.py), folded in incrementally up to the watermark
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rollup_category_totals (
+            category TEXT PRIMARY KEY,
+            total_cents INTEGER NOT NULL DEFAULT 0, -- Signed sum
+            volume_cents INTEGER NOT NULL DEFAULT 0, -- Sum of absolute amounts
+            txn_count INTEGER NOT NULL DEFAULT 0
+        );
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rollup_monthly_totals (
+            month TEXT PRIMARY KEY, -- 'YYYY-MM'
+            debit_cents INTEGER NOT NULL DEFAULT 0,
+            credit_cents INTEGER NOT NULL DEFAULT 0,
+            txn_count INTEGER NOT NULL DEFAULT 0
+        );
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rollup_watermarks (
+            name TEXT PRIMARY KEY,
+            last_transaction_id INTEGER NOT NULL -- Highest transactions.id folded into the rollups
+        );
+        """)
 
         # Add other tables as needed (budgets, goals, invoices, etc.)
 
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
         conn.commit()
         logging.info("Database schema initialized or verified.")
 
@@ -149,8 +761,7 @@ def initialize_schema(conn: sqlite.Connection):
 
 # Example usage (will be called from application layer)
 # def setup_database(password):
-#     conn = get_db_connection(password)
-#     initialize_schema(conn)
-#     return conn
+#     with pooled_connection(password) as conn:
+#         ...
 
 
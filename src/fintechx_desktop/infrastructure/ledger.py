@@ -0,0 +1,205 @@
+import logging
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable, NamedTuple, Optional
+
+from . import rollups
+
+# Data access for the transactions table. All functions take an open (e.g. pooled) connection
+# with the schema in place; see database.pooled_connection.
+
+INSERT_BATCH_SIZE = 10000 # Rows per executemany/commit
+DEFAULT_PAGE_SIZE = 100
+CHECKPOINT_EVERY_ROWS = 100000 # insert_transactions snapshots balances after this many new rows
+
+class LedgerEntry(NamedTuple):
+    id: int
+    account_id: int
+    description: Optional[str]
+    amount_cents: int
+    category: Optional[str]
+    transaction_date: str
+
+# Opaque position in a keyset-paginated read: (transaction_date, id) of the last row returned
+PageCursor = tuple
+
+_ENTRY_COLUMNS = "id, account_id, description, amount_cents, category, transaction_date"
+
+# --- Money ---
+
+def to_cents(amount) -> int:
+    """Converts a decimal amount (str, Decimal, int or float) to integer cents, rounding half away from zero.
+
+    Floats are converted via their shortest repr, so to_cents(0.1) == 10.
+    """
+    if isinstance(amount, float):
+        amount = repr(amount)
+    return int(Decimal(amount).scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def format_cents(cents: int) -> str:
+    """Renders integer cents as a plain decimal string, e.g. -1205 -> '-12.05'."""
+    sign = "-" if cents < 0 else ""
+    whole, frac = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{frac:02d}"
+
+# --- Writes ---
+
+def insert_transactions(conn, rows: Iterable[tuple], batch_size: int = INSERT_BATCH_SIZE,
+                        checkpoint_every: int = CHECKPOINT_EVERY_ROWS) -> int:
+    """Inserts (account_id, description, amount_cents, category, transaction_date) rows.
+
+    The input is streamed in batches of batch_size, each written with one executemany and
+    committed, so memory stays flat for arbitrarily large imports. Account balances are kept
+    current by the schema's triggers, and the analytics rollups are folded in before each commit.
+    Once checkpoint_every rows have been written since the last snapshot, balances are
+    checkpointed (0 disables this). Returns the rows inserted.
+    A failing batch is rolled back and the error re-raised; earlier batches stay committed.
+    """
+    cursor = conn.cursor()
+    total = 0
+    batch = []
+
+    def flush():
+        try:
+            cursor.executemany("""
+            INSERT INTO transactions (account_id, description, amount_cents, category, transaction_date)
+            VALUES (?, ?, ?, ?, ?)
+            """, batch)
+            rollups.fold_pending(conn)
+            conn.commit()
+        except Exception as e:
+            logging.error(f"Ledger insert failed after {total} rows: {e}")
+            conn.rollback()
+            raise
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            flush()
+            total += len(batch)
+            batch = []
+    if batch:
+        flush()
+        total += len(batch)
+    if checkpoint_every and total:
+        maybe_checkpoint_balances(conn, checkpoint_every)
+    return total
+
+def write_version(conn) -> int:
+    """A number that changes whenever a transaction is written (the ledger is append-only). O(1)."""
+    (version,) = conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()
+    return version
+
+# --- Balances ---
+
+def get_balance(conn, account_id: int) -> Optional[int]:
+    """Current balance in cents (a primary-key read), or None for an unknown account."""
+    row = conn.execute("SELECT balance_cents FROM accounts WHERE id = ?", (account_id,)).fetchone()
+    return row[0] if row else None
+
+def checkpoint_balances(conn) -> int:
+    """Snapshots every account's balance as of the latest transaction. Returns the accounts snapshotted."""
+    cursor = conn.cursor()
+    try:
+        (last_id,) = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()
+        cursor.execute("""
+        INSERT INTO balance_checkpoints (account_id, balance_cents, last_transaction_id)
+        SELECT id, balance_cents, ? FROM accounts
+        """, (last_id,))
+        conn.commit()
+    except Exception as e:
+        logging.error(f"Balance checkpoint failed: {e}")
+        conn.rollback()
+        raise
+    return cursor.rowcount
+
+def maybe_checkpoint_balances(conn, every_rows: int = CHECKPOINT_EVERY_ROWS) -> bool:
+    """Checkpoints balances if at least every_rows transactions were written since the last checkpoint."""
+    (since,) = conn.execute("""
+    SELECT COUNT(*) FROM transactions
+    WHERE id > (SELECT COALESCE(MAX(last_transaction_id), 0) FROM balance_checkpoints)
+    """).fetchone()
+    if since < every_rows:
+        return False
+    checkpoint_balances(conn)
+    return True
+
+def reconcile_balances(conn) -> list[tuple[int, int, int]]:
+    """Checks each maintained balance against its latest checkpoint plus the transactions since.
+
+    Only rows written after the checkpoint are summed.
+    Accounts without a checkpoint are summed in full. Returns (account_id, maintained_cents,
+    expected_cents) for every account that disagrees; an empty list means the books balance.
+    Assumes the ledger is append-only: corrections are new rows, not edits to checkpointed ones.
+    """
+    rows = conn.execute("""
+    SELECT a.id, a.balance_cents,
+           COALESCE(c.balance_cents, 0) + COALESCE((
+               SELECT SUM(t.amount_cents) FROM transactions t
+               WHERE t.account_id = a.id AND t.id > COALESCE(c.last_transaction_id, 0)
+           ), 0)
+    FROM accounts a
+    LEFT JOIN balance_checkpoints c ON c.id = (
+        SELECT id FROM balance_checkpoints WHERE account_id = a.id
+        ORDER BY last_transaction_id DESC LIMIT 1
+    )
+    """).fetchall()
+    mismatches = [row for row in rows if row[1] != row[2]]
+    for account_id, maintained, expected in mismatches:
+        logging.warning(f"Balance mismatch on account {account_id}: {maintained} != {expected} cents")
+    return mismatches
+
+# --- Reads ---
+
+def _page(cursor, where: str, params: list, after: Optional[PageCursor], limit: int) -> tuple[list, Optional[PageCursor]]:
+    if after is not None:
+        where += " AND (transaction_date, id) > (?, ?)"
+        params += [after[0], after[1]]
+    cursor.execute(
+        f"SELECT {_ENTRY_COLUMNS} FROM transactions WHERE {where} "
+        f"ORDER BY transaction_date, id LIMIT ?",
+        params + [limit]
+    )
+    entries = [LedgerEntry(*row) for row in cursor.fetchall()]
+    next_cursor = (entries[-1].transaction_date, entries[-1].id) if len(entries) == limit else None
+    return entries, next_cursor
+
+def fetch_account_transactions(conn, account_id: int, start_date: str = None, end_date: str = None,
+                               after: PageCursor = None, limit: int = DEFAULT_PAGE_SIZE) -> tuple[list, Optional[PageCursor]]:
+    """Returns one page of an account's transactions ordered by (transaction_date, id).
+
+    Dates are inclusive ISO strings. Pass the returned cursor as ``after`` to get the next page;
+    it is None once the range is exhausted. Each page is a seek on
+    idx_transactions_account_ledger, so its cost does not grow with the page number.
+    """
+    where = "account_id = ?"
+    params = [account_id]
+    if start_date is not None:
+        where += " AND transaction_date >= ?"
+        params.append(start_date)
+    if end_date is not None:
+        where += " AND transaction_date <= ?"
+        params.append(end_date)
+    return _page(conn.cursor(), where, params, after, limit)
+
+def fetch_category_transactions(conn, category: str, start_date: str = None, end_date: str = None,
+                                after: PageCursor = None, limit: int = DEFAULT_PAGE_SIZE) -> tuple[list, Optional[PageCursor]]:
+    """Like fetch_account_transactions, but across accounts for one category (idx_transactions_category_ledger)."""
+    where = "category = ?"
+    params = [category]
+    if start_date is not None:
+        where += " AND transaction_date >= ?"
+        params.append(start_date)
+    if end_date is not None:
+        where += " AND transaction_date <= ?"
+        params.append(end_date)
+    return _page(conn.cursor(), where, params, after, limit)
+
+def iter_account_transactions(conn, account_id: int, start_date: str = None, end_date: str = None,
+                              page_size: int = 1000):
+    """Yields every transaction of an account in date order, one keyset page at a time."""
+    after = None
+    while True:
+        entries, after = fetch_account_transactions(conn, account_id, start_date, end_date, after, page_size)
+        yield from entries
+        if after is None:
+            return
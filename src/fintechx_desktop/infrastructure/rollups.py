@@ -0,0 +1,118 @@
+import logging
+
+# Pre-aggregated analytics over the transactions table. Totals are folded in incrementally:
+# every transaction with id above the stored watermark is aggregated once and added to the
+# rollup tables, then the watermark advances, all in the same transaction. The ledger is
+# append-only (corrections are new rows), so folded rows never need revisiting.
+#
+# The watermark must be read inside the write transaction that folds past it; otherwise two
+# connections can both read the same watermark and fold the same rows twice.
+
+CATCH_UP_CHUNK_ROWS = 200000 # Rows folded per transaction by catch_up_rollups
+UNCATEGORIZED = "Uncategorized"
+_WATERMARK = "transactions"
+
+def _watermark(cursor) -> int:
+    row = cursor.execute("SELECT last_transaction_id FROM rollup_watermarks WHERE name = ?", (_WATERMARK,)).fetchone()
+    return row[0] if row else 0
+
+def _fold_range(cursor, low: int, high: int):
+    """Adds transactions with low < id <= high to the rollups and moves the watermark to high."""
+    cursor.execute("""
+    INSERT INTO rollup_category_totals (category, total_cents, volume_cents, txn_count)
+    SELECT COALESCE(category, ?), SUM(amount_cents), SUM(ABS(amount_cents)), COUNT(*)
+    FROM transactions WHERE id > ? AND id <= ?
+    GROUP BY 1
+    ON CONFLICT(category) DO UPDATE SET
+        total_cents = total_cents + excluded.total_cents,
+        volume_cents = volume_cents + excluded.volume_cents,
+        txn_count = txn_count + excluded.txn_count
+    """, (UNCATEGORIZED, low, high))
+    cursor.execute("""
+    INSERT INTO rollup_monthly_totals (month, debit_cents, credit_cents, txn_count)
+    SELECT substr(transaction_date, 1, 7),
+           SUM(CASE WHEN amount_cents < 0 THEN -amount_cents ELSE 0 END),
+           SUM(CASE WHEN amount_cents > 0 THEN amount_cents ELSE 0 END),
+           COUNT(*)
+    FROM transactions WHERE id > ? AND id <= ?
+    GROUP BY 1
+    ON CONFLICT(month) DO UPDATE SET
+        debit_cents = debit_cents + excluded.debit_cents,
+        credit_cents = credit_cents + excluded.credit_cents,
+        txn_count = txn_count + excluded.txn_count
+    """, (low, high))
+    cursor.execute("""
+    INSERT INTO rollup_watermarks (name, last_transaction_id) VALUES (?, ?)
+    ON CONFLICT(name) DO UPDATE SET last_transaction_id = MAX(last_transaction_id, excluded.last_transaction_id)
+    """, (_WATERMARK, high))
+
+def fold_pending(conn) -> int:
+    """Folds every transaction past the watermark into the rollups without committing.
+
+    Called by ledger.insert_transactions inside each batch's transaction, so the rollups
+    commit (or roll back) together with the rows they summarise. The caller must already hold
+    the write lock (i.e. have written in this transaction), so no other connection can fold
+    concurrently. Returns the new watermark.
+    """
+    cursor = conn.cursor()
+    low = _watermark(cursor)
+    (high,) = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()
+    if high > low:
+        _fold_range(cursor, low, high)
+    return max(low, high)
+
+def catch_up_rollups(conn, chunk_rows: int = CATCH_UP_CHUNK_ROWS) -> int:
+    """Folds transactions written outside insert_transactions (or before the rollups existed).
+
+    Works through the backlog in id ranges of chunk_rows, committing each, so a first run over a
+    large ledger neither holds one huge transaction nor loses progress if interrupted. Each
+    range is read and folded under BEGIN IMMEDIATE, so concurrent catch-ups and inserts never
+    fold a row twice. Cheap (no write lock) when there is nothing to do. Returns the number of
+    transaction ids folded by this call.
+    """
+    cursor = conn.cursor()
+    (high,) = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()
+    if high <= _watermark(cursor):
+        return 0
+
+    folded = 0
+    while True:
+        cursor.execute("BEGIN IMMEDIATE;")
+        try:
+            low = _watermark(cursor)
+            (high,) = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()
+            upper = min(high, low + chunk_rows)
+            if upper > low:
+                _fold_range(cursor, low, upper)
+            conn.commit()
+        except Exception as e:
+            logging.error(f"Rollup catch-up failed after folding {folded} transactions: {e}")
+            conn.rollback()
+            raise
+        if upper <= low:
+            break
+        folded += upper - low
+        if upper == high:
+            logging.info(f"Rollups caught up to transaction id {high}")
+            break
+    return folded
+
+def fetch_category_volume(conn) -> dict:
+    """Category -> gross volume in cents, largest first."""
+    return dict(conn.execute(
+        "SELECT category, volume_cents FROM rollup_category_totals ORDER BY volume_cents DESC"
+    ).fetchall())
+
+def fetch_monthly_spending(conn, months: int = 12) -> dict:
+    """'YYYY-MM' -> spending (debits) in cents for the most recent months, oldest first."""
+    rows = conn.execute(
+        "SELECT month, debit_cents FROM rollup_monthly_totals ORDER BY month DESC LIMIT ?", (months,)
+    ).fetchall()
+    return dict(reversed(rows))
+
+def load_dashboard_data(conn, months: int = 12) -> tuple[dict, dict]:
+    """(volume by category, monthly spending) in dollars, as AnalyticsDashboardWidget plots them."""
+    catch_up_rollups(conn)
+    volume = {category: cents / 100 for category, cents in fetch_category_volume(conn).items()}
+    trend = {month: cents / 100 for month, cents in fetch_monthly_spending(conn, months).items()}
+    return volume, trend
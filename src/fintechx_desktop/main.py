@@ -1,6 +1,7 @@
 import sys
 import logging
 from PyQt6.QtWidgets import QApplication
+from .core import metrics
 from .core.logging_config import setup_logging
 from .core.config import load_config
 from .ui.main_window import MainWindow
@@ -15,9 +16,16 @@ def run_app():
     setup_logging(level=log_level)
     logger = logging.getLogger("fintechx_desktop.main")
     logger.info("Starting FinTechX Desktop Application...")
-    logger.info(f"Log level set to: {log_level_str}")
+    logger.info("Log level set to: %s", log_level_str)
 
-    # 3. Initialize Application UI
+    # 3. Metrics (off unless configured; the diagnostics panel can also switch them on)
+    metrics.configure(config.get("Diagnostics", "metrics", fallback="off"))
+    export_path = config.get("Diagnostics", "metrics_export_path", fallback="")
+    if metrics.is_enabled() and export_path:
+        metrics.start_exporter(export_path, config.getfloat("Diagnostics", "metrics_export_interval", fallback=15.0))
+        logger.info("Exporting metrics to %s", export_path)
+
+    # 4. Initialize Application UI
     app = QApplication(sys.argv)
     main_window = MainWindow()
     main_window.show()
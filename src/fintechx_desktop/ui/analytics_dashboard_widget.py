@@ -1,17 +1,96 @@
 import logging
 import random  # Keep for potential future examples, but don't use for default plot
+import threading
+from collections import OrderedDict
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGroupBox, QLabel
-from PyQt6.QtCore import pyqtSlot
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
 
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+
+RESULT_CACHE_SIZE = 4 # Distinct ledger versions kept
+
+
+class _LoaderSignals(QObject):
+    # request id, (volume_data, trend_data) or (None, None) on error
+    loaded = pyqtSignal(int, object)
+
+
+class _AnalyticsLoader(QRunnable):
+    """Fetches dashboard data on a pool thread, consulting the widget's version-keyed cache first."""
+
+    def __init__(self, request_id, data_source, version_source, cache, signals):
+        super().__init__()
+        self.request_id = request_id
+        self.data_source = data_source
+        self.version_source = version_source
+        self.cache = cache
+        self.generation = cache.generation  # Taken on the GUI thread, before any set_data_source
+        self.signals = signals
+
+    def run(self):
+        logger = logging.getLogger("fintechx_desktop.ui.analytics_dashboard")
+        try:
+            version = self.version_source() if self.version_source is not None else None
+            data = self.cache.get(version) if version is not None else None
+            if data is None:
+                data = self.data_source()
+                if version is not None:
+                    self.cache.put(version, data, self.generation)
+        except Exception as e:
+            logger.error(f"Failed to fetch analytics data: {e}")
+            data = (None, None)
+        self.signals.loaded.emit(self.request_id, data)
+
+
+class _ResultCache:
+    """Small thread-safe LRU of dashboard data keyed by ledger write version.
+
+    clear() starts a new generation; results loaded for an earlier one are not stored.
+    """
+
+    def __init__(self, size=RESULT_CACHE_SIZE):
+        self.size = size
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, version):
+        with self._lock:
+            data = self._entries.get(version)
+            if data is not None:
+                self._entries.move_to_end(version)
+            return data
+
+    def put(self, version, data, generation):
+        with self._lock:
+            if generation != self.generation:
+                return  # Loaded from a data source that has since been replaced
+            self._entries[version] = data
+            self._entries.move_to_end(version)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
 
 
 class AnalyticsDashboardWidget(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, data_source=None, version_source=None):
         super().__init__(parent)
         self.logger = logging.getLogger("fintechx_desktop.ui.analytics_dashboard")
+        # Callable returning (volume_by_category, spending_by_month) dicts, e.g. rollups.load_dashboard_data.
+        # Runs on a worker thread.
+        self.data_source = data_source
+        # Optional callable returning the ledger write version; results are cached per version
+        self.version_source = version_source
+        self._cache = _ResultCache()
+        self._request_id = 0
+        self._signals = _LoaderSignals(self)
+        self._signals.loaded.connect(self._on_data_loaded)
+
         main_layout = QVBoxLayout(self)
         dashboard_group = QGroupBox("Payment Analytics Dashboard")
         self.dashboard_layout = QVBoxLayout()  # instance variable to allow clearing/adding widgets
@@ -28,62 +107,113 @@ class AnalyticsDashboardWidget(QWidget):
         main_layout.addWidget(dashboard_group)
         self.setLayout(main_layout)
 
-        # Load data when the widget is initialized/shown
-        self.load_and_plot_data()
+        self._create_plots()
+        self.plot_data({}, {})
+
+    def _create_plots(self):
+        # Axes and artists are built once; refreshes only update their data
+        self.volume_ax = self.figure.add_subplot(121)
+        self.volume_ax.set_title("Transaction Volume by Category")
+        self.volume_ax.set_ylabel("Volume ($)")
+        self.volume_bars = None
+        self.volume_categories = []
+
+        self.trend_ax = self.figure.add_subplot(122)
+        self.trend_ax.set_title("Monthly Spending Trend")
+        self.trend_ax.set_ylabel("Total Spending ($)")
+        self.trend_ax.grid(True)
+        (self.trend_line,) = self.trend_ax.plot([], [], marker="o", linestyle="-", color="green")
+        self.trend_months = []
+
+        self.no_data_text = self.figure.text(0.5, 0.5, "No Data Available", ha="center", va="center",
+                                             fontsize=12, color="gray")
+
+    def set_data_source(self, data_source, version_source=None):
+        self.data_source = data_source
+        self.version_source = version_source
+        self._cache.clear()
+        self._request_id += 1  # Drop any load still running against the old source
 
     def fetch_analytics_data(self):
-        self.logger.info("Simulating fetching analytics data (currently returns empty)...")
-        volume_data = {}
-        trend_data = {}
-        return volume_data, trend_data
+        """Synchronous fetch, for callers that are not on the GUI thread."""
+        if self.data_source is None:
+            return {}, {}
+        return self.data_source()
 
     def load_and_plot_data(self):
-        self.figure.clear()
+        """Starts a background load; the newest request wins and older results are dropped."""
+        self._request_id += 1
+        if self.data_source is None:
+            self.logger.info("No analytics data source configured.")
+            self.plot_data({}, {})
+            return
+        self.status_label.setText("Loading...")
+        loader = _AnalyticsLoader(self._request_id, self.data_source, self.version_source, self._cache, self._signals)
+        QThreadPool.globalInstance().start(loader)
+
+    @pyqtSlot(int, object)
+    def _on_data_loaded(self, request_id, data):
+        if request_id != self._request_id:
+            return  # A newer refresh is in flight; never let an older result overwrite it
+        self.plot_data(*data)
+
+    def plot_data(self, volume_data, trend_data):
         self.status_label.setText("")  # Clear status
-        volume_data, trend_data = self.fetch_analytics_data()
 
         # Check if data was fetched successfully (even if empty)
         if volume_data is None or trend_data is None:
             self.status_label.setText("Error loading analytics data.")
-            self.canvas.draw()
             return
 
-        # Check if there is any data to plot
         has_volume_data = bool(volume_data)
         has_trend_data = bool(trend_data)
-
         if not has_volume_data and not has_trend_data:
             self.status_label.setText("No analytics data available to display.")
-            # Optionally add placeholder text directly on the canvas
-            ax = self.figure.add_subplot(111)
-            ax.text(0.5, 0.5, "No Data Available", ha="center", va="center", fontsize=12, color="gray")
-            ax.axis("off") # Hide axes
-            self.canvas.draw()
-            return
+        self.no_data_text.set_visible(not has_volume_data and not has_trend_data)
+        self.volume_ax.set_visible(has_volume_data)
+        self.trend_ax.set_visible(has_trend_data)
 
-        # --- Plotting Logic ---
+        layout_changed = False
         if has_volume_data:
-            ax1 = self.figure.add_subplot(121 if has_trend_data else 111)
-            categories = list(volume_data.keys())
-            volumes = list(volume_data.values())
-            ax1.bar(categories, volumes, color="skyblue")
-            ax1.set_title("Transaction Volume by Category")
-            ax1.set_ylabel("Volume ($)")
-            ax1.tick_params(axis="x", rotation=45)
-
-            # Plot trend data if available
-            if has_trend_data:
-                ax2 = self.figure.add_subplot(122 if has_volume_data else 111)
-            months = list(trend_data.keys())
-            spending = list(trend_data.values())
-            ax2.plot(months, spending, marker="o", linestyle="-", color="green")
-            ax2.set_title("Monthly Spending Trend")
-            ax2.set_ylabel("Total Spending ($)")
-            ax2.grid(True)
+            layout_changed |= self._update_volume(volume_data)
+        if has_trend_data:
+            layout_changed |= self._update_trend(trend_data)
 
+        # tight_layout is the expensive part of a redraw; only redo it when tick labels changed
+        if layout_changed:
             self.figure.tight_layout()
-            self.canvas.draw()
-            self.logger.info("Analytics dashboard plots updated.")
+        self.canvas.draw_idle()
+        self.logger.info("Analytics dashboard plots updated.")
+
+    def _update_volume(self, volume_data):
+        categories = list(volume_data.keys())
+        volumes = list(volume_data.values())
+        if categories == self.volume_categories and self.volume_bars is not None:
+            for bar, height in zip(self.volume_bars, volumes):
+                bar.set_height(height)
+            changed = False
+        else:
+            if self.volume_bars is not None:
+                self.volume_bars.remove()
+            positions = range(len(categories))
+            self.volume_bars = self.volume_ax.bar(positions, volumes, color="skyblue")
+            self.volume_ax.set_xticks(positions, categories, rotation=45)
+            self.volume_categories = categories
+            changed = True
+        self.volume_ax.relim()
+        self.volume_ax.autoscale_view()
+        return changed
+
+    def _update_trend(self, trend_data):
+        months = list(trend_data.keys())
+        self.trend_line.set_data(range(len(months)), list(trend_data.values()))
+        changed = months != self.trend_months
+        if changed:
+            self.trend_ax.set_xticks(range(len(months)), months, rotation=45)
+            self.trend_months = months
+        self.trend_ax.relim()
+        self.trend_ax.autoscale_view()
+        return changed
 
     def refresh_dashboard(self):
         self.load_and_plot_data()
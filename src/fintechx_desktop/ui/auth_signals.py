@@ -0,0 +1,37 @@
+import logging
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from ..app.auth_executor import AuthExecutor, get_auth_executor
+
+class AuthSignals(QObject):
+    """Qt front end for the authentication executor.
+
+    Requests return immediately; results arrive as signals. The signals are emitted from a worker
+    thread, so Qt queues them onto the receiver's (GUI) thread and slots never block hashing.
+    """
+
+    authenticated = pyqtSignal(str, bool)  # username, success
+    user_created = pyqtSignal(str, bool)   # username, success
+    failed = pyqtSignal(str, str)          # username, error message
+
+    def __init__(self, executor: AuthExecutor = None, parent: QObject = None):
+        super().__init__(parent)
+        self._executor = executor or get_auth_executor()
+
+    def authenticate(self, db_password: str, username: str, password: str):
+        future = self._executor.submit_authenticate(db_password, username, password)
+        future.add_done_callback(lambda f: self._deliver(f, self.authenticated, username))
+
+    def create_user(self, db_password: str, username: str, password: str):
+        future = self._executor.submit_create_user(db_password, username, password)
+        future.add_done_callback(lambda f: self._deliver(f, self.user_created, username))
+
+    def _deliver(self, future, signal, username: str):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logging.error(f"Authentication task for {username} failed: {error}")
+            self.failed.emit(username, str(error))
+            return
+        signal.emit(username, bool(future.result()))
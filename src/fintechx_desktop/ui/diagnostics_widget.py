@@ -0,0 +1,182 @@
+import datetime
+import logging
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QPushButton, QCheckBox, QTableWidget,
+    QTableWidgetItem, QTextEdit, QFileDialog, QHeaderView, QLabel
+)
+from PyQt6.QtCore import pyqtSlot, QTimer
+
+from fintechx_desktop.core import metrics
+
+REFRESH_INTERVAL_MS = 1000
+SPANS_SHOWN = 200 # Most recent spans listed in the trace pane
+
+OPERATION_COLUMNS = ("Operation", "Count", "Errors", "Mean", "p50", "p95", "p99", "Max")
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+class DiagnosticsWidget(QWidget):
+    """Live view of core.metrics: operation latencies, event counters and recent spans.
+
+    Not listed in the menus; MainWindow opens it with Ctrl+Shift+D.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger("fintechx_desktop.ui.diagnostics")
+        main_layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.enabled_checkbox = QCheckBox("Record metrics")
+        self.tracing_checkbox = QCheckBox("Trace spans")
+        self.refresh_button = QPushButton("Refresh")
+        self.reset_button = QPushButton("Reset")
+        self.export_prometheus_button = QPushButton("Export Prometheus...")
+        self.export_json_button = QPushButton("Export JSON...")
+        for widget in (self.enabled_checkbox, self.tracing_checkbox, self.refresh_button, self.reset_button,
+                       self.export_prometheus_button, self.export_json_button):
+            controls.addWidget(widget)
+        controls.addStretch()
+        main_layout.addLayout(controls)
+
+        self.summary_label = QLabel()
+        main_layout.addWidget(self.summary_label)
+
+        operations_group = QGroupBox("Operations")
+        operations_layout = QVBoxLayout()
+        self.operations_table = QTableWidget(0, len(OPERATION_COLUMNS))
+        self.operations_table.setHorizontalHeaderLabels(OPERATION_COLUMNS)
+        self.operations_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.operations_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.operations_table.setSortingEnabled(True)
+        operations_layout.addWidget(self.operations_table)
+        operations_group.setLayout(operations_layout)
+        main_layout.addWidget(operations_group, 3)
+
+        counters_group = QGroupBox("Events")
+        counters_layout = QVBoxLayout()
+        self.counters_table = QTableWidget(0, 2)
+        self.counters_table.setHorizontalHeaderLabels(("Event", "Count"))
+        self.counters_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.counters_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        counters_layout.addWidget(self.counters_table)
+        counters_group.setLayout(counters_layout)
+        main_layout.addWidget(counters_group, 1)
+
+        spans_group = QGroupBox("Recent spans")
+        spans_layout = QVBoxLayout()
+        self.spans_output = QTextEdit()
+        self.spans_output.setReadOnly(True)
+        spans_layout.addWidget(self.spans_output)
+        spans_group.setLayout(spans_layout)
+        main_layout.addWidget(spans_group, 2)
+
+        self.setLayout(main_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        self.enabled_checkbox.setChecked(metrics.is_enabled())
+        self.tracing_checkbox.setChecked(metrics.is_tracing())
+        self.enabled_checkbox.toggled.connect(self.apply_recording)
+        self.tracing_checkbox.toggled.connect(self.apply_recording)
+        self.refresh_button.clicked.connect(self.refresh)
+        self.reset_button.clicked.connect(self.reset_metrics)
+        self.export_prometheus_button.clicked.connect(self.export_prometheus)
+        self.export_json_button.clicked.connect(self.export_json)
+
+    # Only poll while the panel is on screen
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    @pyqtSlot()
+    def apply_recording(self):
+        # Tracing implies recording, and turning recording off also turns tracing off
+        enabled = self.enabled_checkbox.isChecked()
+        tracing = self.tracing_checkbox.isChecked()
+        if self.sender() is self.tracing_checkbox and tracing:
+            enabled = True
+        if not enabled:
+            tracing = False
+        for checkbox, checked in ((self.enabled_checkbox, enabled), (self.tracing_checkbox, tracing)):
+            checkbox.blockSignals(True)
+            checkbox.setChecked(checked)
+            checkbox.blockSignals(False)
+        if enabled:
+            metrics.enable(tracing=tracing)
+        else:
+            metrics.disable()
+        self.logger.info("Metrics %s (tracing %s)", "enabled" if metrics.is_enabled() else "disabled",
+                         "on" if metrics.is_tracing() else "off")
+        self.refresh()
+
+    @pyqtSlot()
+    def reset_metrics(self):
+        metrics.reset()
+        self.refresh()
+
+    @pyqtSlot()
+    def refresh(self):
+        data = metrics.snapshot()
+        state = "recording" if data["enabled"] else "not recording"
+        if data["tracing"]:
+            state += ", tracing"
+        self.summary_label.setText(f"Metrics {state}. Collected since "
+                                   f"{datetime.datetime.fromtimestamp(data['started']):%H:%M:%S}.")
+
+        self.operations_table.setSortingEnabled(False)
+        self.operations_table.setRowCount(len(data["histograms"]))
+        for row, (name, h) in enumerate(sorted(data["histograms"].items())):
+            mean = h["sum"] / h["count"] if h["count"] else 0.0
+            values = (name, str(h["count"]), str(h["errors"]), _format_seconds(mean), _format_seconds(h["p50"]),
+                      _format_seconds(h["p95"]), _format_seconds(h["p99"]), _format_seconds(h["max"]))
+            for column, value in enumerate(values):
+                self.operations_table.setItem(row, column, QTableWidgetItem(value))
+        self.operations_table.setSortingEnabled(True)
+
+        self.counters_table.setRowCount(len(data["counters"]))
+        for row, (name, value) in enumerate(sorted(data["counters"].items())):
+            self.counters_table.setItem(row, 0, QTableWidgetItem(name))
+            self.counters_table.setItem(row, 1, QTableWidgetItem(str(value)))
+
+        lines = []
+        for span in reversed(data["spans"][-SPANS_SHOWN:]):
+            started = datetime.datetime.fromtimestamp(span["start"]).strftime("%H:%M:%S.%f")[:-3]
+            parent = f"  (in {span['parent']})" if span["parent"] else ""
+            failed = "  FAILED" if span["error"] else ""
+            lines.append(f"{started}  [{span['thread']}]  {span['name']}  "
+                         f"{_format_seconds(span['duration'])}{parent}{failed}")
+        self.spans_output.setPlainText("\n".join(lines) if lines else "No spans recorded (enable tracing).")
+
+    def _export(self, title: str, file_filter: str, writer):
+        path, _ = QFileDialog.getSaveFileName(self, title, "", file_filter)
+        if not path:
+            return
+        try:
+            writer(path)
+            self.logger.info("Exported metrics to %s", path)
+        except OSError as e:
+            self.logger.error("Failed to export metrics to %s: %s", path, e)
+            self.summary_label.setText(f"Export failed: {e}")
+
+    @pyqtSlot()
+    def export_prometheus(self):
+        self._export("Export Prometheus metrics", "Prometheus text (*.prom);;All files (*)", metrics.write_prometheus)
+
+    @pyqtSlot()
+    def export_json(self):
+        self._export("Export metrics as JSON", "JSON (*.json);;All files (*)", metrics.write_json)
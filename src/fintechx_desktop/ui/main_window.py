@@ -5,10 +5,13 @@ from PyQt6.QtWidgets import (
     QGroupBox, QComboBox
 )
 from PyQt6.QtCore import pyqtSlot
+from PyQt6.QtGui import QKeySequence, QShortcut
 
-# Import other UI widgets
-from .virtual_terminal_widget import VirtualTerminalWidget
-from .analytics_dashboard_widget import AnalyticsDashboardWidget
+from fintechx_desktop.core import metrics
+from fintechx_desktop.infrastructure import bin_ranges
+
+# Other views are imported on first navigation (see MainWindow._view_factories); the analytics
+# dashboard pulls in matplotlib, which dominates cold-start time.
 
 # Import the native C++ module
 try:
@@ -20,6 +23,7 @@ except ImportError:
         def generate_pan(self, prefix, length): return None
         def generate_pan_batch(self, prefix, length, count): return []
     fintechx_native = DummyNative()
+fintechx_native = metrics.instrument_module(fintechx_native, "native")
 
 
 # Placeholder Widgets for other views
@@ -40,6 +44,9 @@ class DashboardWidget(QWidget):
 
 
 # --- PAN Tools Widget ---
+# Offered when the prefix matches no BIN range (or the BIN table is unavailable)
+DEFAULT_LENGTH_OPTIONS = ("16 (Visa/Mastercard)", "15 (Amex)", "13 (Visa)")
+
 class PanToolsWidget(QWidget):
     # (Content from previous version - kept for brevity, assumed unchanged)
     def __init__(self, parent=None):
@@ -60,7 +67,7 @@ class PanToolsWidget(QWidget):
         self.pan_prefix_input = QLineEdit()
         self.pan_prefix_input.setPlaceholderText("e.g., 4, 51, 37")
         self.pan_length_combo = QComboBox()
-        self.pan_length_combo.addItems(["16 (Visa/Mastercard)", "15 (Amex)", "13 (Visa)"])
+        self.update_length_options("")
         self.pan_count_spinbox = QSpinBox()
         self.pan_count_spinbox.setRange(1, 1000)
         self.pan_count_spinbox.setValue(1)
@@ -78,8 +85,23 @@ class PanToolsWidget(QWidget):
         self.setLayout(main_layout)
         self.validate_button.clicked.connect(self.validate_pan)
         self.generate_button.clicked.connect(self.generate_pans)
+        self.pan_prefix_input.textChanged.connect(self.update_length_options)
+
+    @pyqtSlot(str)
+    def update_length_options(self, prefix):
+        """Offers the lengths the BIN table allows for the prefix, or the common lengths if it is unknown."""
+        prefix = prefix.strip()
+        card = bin_ranges.lookup_bin(prefix) if prefix.isdigit() else None
+        if card:
+            items = [f"{length} ({card['scheme']})" for length in card["lengths"]]
+        else:
+            items = list(DEFAULT_LENGTH_OPTIONS)
+        if items != [self.pan_length_combo.itemText(i) for i in range(self.pan_length_combo.count())]:
+            self.pan_length_combo.clear()
+            self.pan_length_combo.addItems(items)
 
     @pyqtSlot()
+    @metrics.timed("ui.pan_tools.validate")
     def validate_pan(self):
         pan_to_validate = self.pan_validate_input.text().strip().replace(" ", "")
         if not pan_to_validate or not pan_to_validate.isdigit():
@@ -88,7 +110,9 @@ class PanToolsWidget(QWidget):
         try:
             is_valid = fintechx_native.luhn_check(pan_to_validate)
             if is_valid:
-                self.validate_result_label.setText("Result: <font color='green'>Valid (Luhn Check Passed)</font>")
+                card = bin_ranges.lookup_bin(pan_to_validate)
+                scheme = f", {card['scheme']}" if card else ""
+                self.validate_result_label.setText(f"Result: <font color='green'>Valid (Luhn Check Passed{scheme})</font>")
             else:
                 self.validate_result_label.setText("Result: <font color='red'>Invalid (Luhn Check Failed)</font>")
         except Exception as e:
@@ -96,6 +120,7 @@ class PanToolsWidget(QWidget):
             self.validate_result_label.setText("Result: <font color='red'>Error during validation.</font>")
 
     @pyqtSlot()
+    @metrics.timed("ui.pan_tools.generate")
     def generate_pans(self):
         prefix = self.pan_prefix_input.text().strip()
         count = self.pan_count_spinbox.value()
@@ -128,25 +153,46 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 900, 700)
         self.central_widget = QStackedWidget()
         self.setCentralWidget(self.central_widget)
-        self.create_widgets()
-        self.add_widgets_to_stack()
+        self._views = {}
+        self._analytics_sources = None
         self.setup_menus()
         self.show_login_screen()
         self.statusBar().showMessage("Ready")
 
-    def create_widgets(self):
-        self.login_view = LoginWidget()
-        self.dashboard_view = DashboardWidget()
-        self.pan_tools_view = PanToolsWidget()
-        self.virtual_terminal_view = VirtualTerminalWidget()
-        self.analytics_dashboard_view = AnalyticsDashboardWidget()
+    def _create_virtual_terminal(self):
+        from .virtual_terminal_widget import VirtualTerminalWidget
+        return VirtualTerminalWidget()
+
+    def _create_diagnostics(self):
+        from .diagnostics_widget import DiagnosticsWidget
+        return DiagnosticsWidget()
 
-    def add_widgets_to_stack(self):
-        self.central_widget.addWidget(self.login_view)
-        self.central_widget.addWidget(self.dashboard_view)
-        self.central_widget.addWidget(self.pan_tools_view)
-        self.central_widget.addWidget(self.virtual_terminal_view)
-        self.central_widget.addWidget(self.analytics_dashboard_view)
+    def _create_analytics_dashboard(self):
+        from .analytics_dashboard_widget import AnalyticsDashboardWidget
+        view = AnalyticsDashboardWidget()
+        if self._analytics_sources is not None:
+            view.set_data_source(*self._analytics_sources)
+        return view
+
+    _view_factories = {
+        "login": lambda self: LoginWidget(),
+        "dashboard": lambda self: DashboardWidget(),
+        "pan_tools": lambda self: PanToolsWidget(),
+        "virtual_terminal": _create_virtual_terminal,
+        "analytics_dashboard": _create_analytics_dashboard,
+        "diagnostics": _create_diagnostics,
+    }
+
+    def view(self, name: str) -> QWidget:
+        """Returns the named view, constructing it and adding it to the stack on first use."""
+        widget = self._views.get(name)
+        if widget is None:
+            with metrics.span(f"ui.construct_view.{name}"):
+                widget = self._view_factories[name](self)
+            self._views[name] = widget
+            self.central_widget.addWidget(widget)
+            logging.debug(f"Constructed view '{name}'")
+        return widget
 
     def setup_menus(self):
         menu_bar = self.menuBar()
@@ -164,29 +210,62 @@ class MainWindow(QMainWindow):
         pan_tools_action.triggered.connect(self.show_pan_tools)
         vt_action.triggered.connect(self.show_virtual_terminal)
         analytics_action.triggered.connect(self.show_analytics_dashboard)
+        # Diagnostics is deliberately not in the menus
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self.show_diagnostics)
+
+    def set_database(self, db_password: str):
+        """Points the data-backed views at the database unlocked with db_password.
+
+        Hook for the login flow to call once the user has authenticated; nothing calls it yet
+        (LoginWidget is a placeholder), so until then the analytics dashboard shows no data.
+        Only the key fingerprint is kept, never the password: the views stop loading once the
+        cached key expires (database.KEY_CACHE_TTL) and need a fresh set_database after login.
+        Raises ConnectionError if the password does not unlock the database.
+        """
+        from ..infrastructure import database, ledger, rollups
+
+        fingerprint = database.unlock_database(db_password)
+
+        def load_analytics():
+            with database.unlocked_connection(fingerprint) as conn:
+                return rollups.load_dashboard_data(conn)
+
+        def ledger_version():
+            with database.unlocked_connection(fingerprint) as conn:
+                return ledger.write_version(conn)
+
+        self._analytics_sources = (load_analytics, ledger_version)
+        if "analytics_dashboard" in self._views:
+            self._views["analytics_dashboard"].set_data_source(load_analytics, ledger_version)
 
     def show_login_screen(self):
-        self.central_widget.setCurrentWidget(self.login_view)
+        self.central_widget.setCurrentWidget(self.view("login"))
         self.statusBar().showMessage("Please Login")
 
     def show_dashboard(self):
-        self.central_widget.setCurrentWidget(self.dashboard_view)
+        self.central_widget.setCurrentWidget(self.view("dashboard"))
         self.statusBar().showMessage("Dashboard Active")
 
     def show_pan_tools(self):
-        self.central_widget.setCurrentWidget(self.pan_tools_view)
+        self.central_widget.setCurrentWidget(self.view("pan_tools"))
         self.statusBar().showMessage("PAN Tools Active")
 
     def show_virtual_terminal(self):
-        self.central_widget.setCurrentWidget(self.virtual_terminal_view)
+        self.central_widget.setCurrentWidget(self.view("virtual_terminal"))
         self.statusBar().showMessage("Virtual Terminal Active")
 
     def show_analytics_dashboard(self):
         # Refresh data when the dashboard is shown
-        self.analytics_dashboard_view.refresh_dashboard()
-        self.central_widget.setCurrentWidget(self.analytics_dashboard_view)
+        analytics_view = self.view("analytics_dashboard")
+        analytics_view.refresh_dashboard()
+        self.central_widget.setCurrentWidget(analytics_view)
         self.statusBar().showMessage("Analytics Dashboard Active")
 
+    def show_diagnostics(self):
+        self.central_widget.setCurrentWidget(self.view("diagnostics"))
+        self.statusBar().showMessage("Diagnostics Active")
+
     def closeEvent(self, event):
         logging.info("Closing application...")
         event.accept()
\ No newline at end of file
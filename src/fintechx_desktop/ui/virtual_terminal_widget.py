@@ -5,6 +5,9 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import pyqtSlot, QDate
 
+from fintechx_desktop.core import metrics
+from fintechx_desktop.infrastructure import bin_ranges
+
 try:
     from fintechx_desktop.infrastructure import fintechx_native
 except ImportError:
@@ -13,6 +16,7 @@ except ImportError:
     class DummyNative:
         def luhn_check(self, pan): return True # Assume valid for UI dev
     fintechx_native = DummyNative()
+fintechx_native = metrics.instrument_module(fintechx_native, "native")
 
 
 class VirtualTerminalWidget(QWidget):
@@ -77,6 +81,7 @@ class VirtualTerminalWidget(QWidget):
         self.result_label.setText("Status: Ready")
 
     @pyqtSlot()
+    @metrics.timed("ui.virtual_terminal.submit")
     def submit_simulated_payment(self):
         pan = self.pan_input.text().strip().replace(" ", "")
         expiry_date = self.expiry_input.date()
@@ -103,17 +108,33 @@ class VirtualTerminalWidget(QWidget):
         try:
             if not fintechx_native.luhn_check(pan):
                 self.result_label.setText("Status: <font color=\'red\'>Failed (Invalid Card Number - Luhn Check)</font>")
-                self.logger.warning(f"Virtual terminal submission failed for PAN ending {pan[-4:]}: Luhn check failed.")
+                self.logger.warning("Virtual terminal submission failed for PAN ending %s: Luhn check failed.", pan[-4:])
                 return
         except Exception as e:
-            self.logger.error(f"Error during PAN validation: {e}")
+            self.logger.error("Error during PAN validation: %s", e)
             self.result_label.setText("Status: <font color=\'red\'>Error during validation.</font>")
             QMessageBox.warning(self, "Validation Error", f"An error occurred during PAN check: {e}")
             return
 
+        # --- Brand / length check against the BIN table (skipped if the table is unavailable) ---
+        scheme = "Unknown"
+        if bin_ranges.get_bin_table() is not None:
+            card = bin_ranges.lookup_bin(pan)
+            if card is None:
+                self.result_label.setText("Status: <font color=\'red\'>Failed (Unknown card range)</font>")
+                self.logger.warning("Virtual terminal submission failed for PAN ending %s: no BIN range matched.", pan[-4:])
+                return
+            scheme = card["scheme"]
+            if len(pan) not in card["lengths"]:
+                self.result_label.setText(f"Status: <font color=\'red\'>Failed (Invalid length for {scheme})</font>")
+                self.logger.warning("Virtual terminal submission failed for PAN ending %s: %d digits not valid for %s.",
+                                    pan[-4:], len(pan), scheme)
+                return
+
         success = True
-        message = "Local Validation OK - Transaction Simulated Successfully."
-        self.logger.info(f"Virtual terminal submission simulated for PAN ending {pan[-4:]}, Amount: {amount} {currency}")
+        message = f"Local Validation OK ({scheme}) - Transaction Simulated Successfully."
+        self.logger.info("Virtual terminal submission simulated for %s PAN ending %s, Amount: %s %s",
+                         scheme, pan[-4:], amount, currency)
 
         if success:
             self.result_label.setText(f"Status: <font color=\'green\'>{message}</font>")
@@ -0,0 +1,66 @@
+import pytest
+
+sqlite = pytest.importorskip("pysqlcipher3.dbapi2")
+
+from fintechx_desktop.infrastructure import database
+
+TRANSACTIONS = [
+    (1, 1, "Salary", 1500.25, "Income", "2024-01-31", "2024-01-31 09:00:00"),
+    (2, 1, "Groceries", -42.1, "Food", "2024-02-02", "2024-02-02 18:30:00"),
+]
+ACCOUNTS = [
+    (1, 1, "Checking", "checking", 2000.0, "USD", "2024-01-01 00:00:00"),
+]
+
+@pytest.fixture
+def legacy_conn():
+    """An unkeyed connection holding the pre-integer-cents (REAL-valued) schema."""
+    conn = sqlite.connect(":memory:")
+    conn.execute("""
+    CREATE TABLE accounts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, name TEXT NOT NULL,
+        type TEXT NOT NULL, balance REAL DEFAULT 0.0, currency TEXT DEFAULT 'USD',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+    conn.execute("""
+    CREATE TABLE transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, account_id INTEGER NOT NULL, description TEXT,
+        amount REAL NOT NULL, category TEXT, transaction_date DATE NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+    conn.executemany("INSERT INTO accounts VALUES (?, ?, ?, ?, ?, ?, ?);", ACCOUNTS)
+    conn.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?);", TRANSACTIONS)
+    conn.commit()
+    yield conn
+    conn.close()
+
+def test_migrate_to_integer_cents(legacy_conn):
+    database._migrate_to_integer_cents(legacy_conn)
+
+    cursor = legacy_conn.cursor()
+    assert "amount_cents" in database._columns(cursor, "transactions")
+    assert "balance_cents" in database._columns(cursor, "accounts")
+    amounts = cursor.execute("SELECT category, amount_cents FROM transactions ORDER BY id;").fetchall()
+    assert amounts == [("Income", 150025), ("Food", -4210),
+                       (database.OPENING_BALANCE_CATEGORY, 200000 - 150025 + 4210)]
+    assert cursor.execute("SELECT balance_cents FROM accounts;").fetchall() == [(200000,)]
+
+def test_migrate_to_integer_cents_rolls_back_on_failure(legacy_conn):
+    # A leftover accounts_cents without the expected columns makes the accounts rebuild fail
+    # after transactions has already been dropped and replaced
+    legacy_conn.execute("CREATE TABLE accounts_cents (id INTEGER PRIMARY KEY);")
+    legacy_conn.commit()
+
+    with pytest.raises(sqlite.OperationalError):
+        database._migrate_to_integer_cents(legacy_conn)
+
+    cursor = legacy_conn.cursor()
+    assert "amount" in database._columns(cursor, "transactions")
+    assert "balance" in database._columns(cursor, "accounts")
+    assert cursor.execute("SELECT * FROM transactions ORDER BY id;").fetchall() == TRANSACTIONS
+    assert cursor.execute("SELECT * FROM accounts;").fetchall() == ACCOUNTS
+    assert cursor.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name = 'transactions_cents';").fetchone() == (0,)
+    assert legacy_conn.isolation_level == ""
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+fintechx_native = pytest.importorskip("fintechx_desktop.infrastructure.fintechx_native")
+
+HEADER_SIZE = 16
+FRAME_OVERHEAD = 1 + 4 + 12 + 16
+CHUNK_SIZE = 1024
+
+@pytest.fixture
+def key():
+    return os.urandom(32)
+
+def _encrypt(tmp_path, key, data, chunk_size=CHUNK_SIZE):
+    src, dst = tmp_path / "plain.bin", tmp_path / "sealed.fxs"
+    src.write_bytes(data)
+    fintechx_native.encrypt_file(str(src), str(dst), key, chunk_size)
+    return dst
+
+@pytest.mark.parametrize("size", [0, 1, CHUNK_SIZE - 1, CHUNK_SIZE, 3 * CHUNK_SIZE + 17])
+def test_file_round_trip(tmp_path, key, size):
+    data = os.urandom(size)
+    sealed = _encrypt(tmp_path, key, data)
+    frames = max(1, -(-size // CHUNK_SIZE)) # The last chunk, even if empty, is the final frame
+    assert sealed.stat().st_size == HEADER_SIZE + frames * FRAME_OVERHEAD + size
+
+    out = tmp_path / "out.bin"
+    fintechx_native.decrypt_file(str(sealed), str(out), key)
+    assert out.read_bytes() == data
+
+def test_stream_round_trip_in_odd_pieces(key):
+    data = os.urandom(5 * CHUNK_SIZE + 3)
+    encryptor = fintechx_native.GcmStreamEncryptor(key, CHUNK_SIZE)
+    sealed = b"".join(encryptor.update(data[i:i + 700]) for i in range(0, len(data), 700))
+    sealed += encryptor.finalize()
+
+    decryptor = fintechx_native.GcmStreamDecryptor(key)
+    plain = b"".join(decryptor.update(sealed[i:i + 333]) for i in range(0, len(sealed), 333))
+    decryptor.finalize()
+    assert plain == data
+
+@pytest.mark.parametrize("cut", [
+    HEADER_SIZE, # Header only
+    HEADER_SIZE + CHUNK_SIZE + FRAME_OVERHEAD, # At a frame boundary, before the final frame
+    -1, # Inside the final frame
+])
+def test_truncated_file_is_rejected(tmp_path, key, cut):
+    sealed = _encrypt(tmp_path, key, os.urandom(2 * CHUNK_SIZE + 5))
+    sealed.write_bytes(sealed.read_bytes()[:cut])
+
+    out = tmp_path / "out.bin"
+    with pytest.raises(fintechx_native.AuthenticationError):
+        fintechx_native.decrypt_file(str(sealed), str(out), key)
+    assert not out.exists()
+
+@pytest.mark.parametrize("offset", [
+    0, # Magic
+    HEADER_SIZE + 20, # Ciphertext of the first frame
+    HEADER_SIZE + FRAME_OVERHEAD + CHUNK_SIZE - 1, # Tag of the first frame
+    -1, # Tag of the final frame
+])
+def test_tampered_file_is_rejected(tmp_path, key, offset):
+    sealed = _encrypt(tmp_path, key, os.urandom(2 * CHUNK_SIZE + 5))
+    data = bytearray(sealed.read_bytes())
+    data[offset] ^= 0x01
+    sealed.write_bytes(bytes(data))
+
+    out = tmp_path / "out.bin"
+    with pytest.raises(fintechx_native.AuthenticationError):
+        fintechx_native.decrypt_file(str(sealed), str(out), key)
+    assert not out.exists()
+
+def test_wrong_key_and_reordered_frames_are_rejected(tmp_path, key):
+    sealed = _encrypt(tmp_path, key, os.urandom(3 * CHUNK_SIZE + 5)).read_bytes()
+    out = tmp_path / "out.bin"
+
+    with pytest.raises(fintechx_native.AuthenticationError):
+        decryptor = fintechx_native.GcmStreamDecryptor(os.urandom(32))
+        decryptor.update(sealed)
+
+    frame = CHUNK_SIZE + FRAME_OVERHEAD
+    first, second = sealed[HEADER_SIZE:HEADER_SIZE + frame], sealed[HEADER_SIZE + frame:HEADER_SIZE + 2 * frame]
+    swapped = sealed[:HEADER_SIZE] + second + first + sealed[HEADER_SIZE + 2 * frame:]
+    (tmp_path / "swapped.fxs").write_bytes(swapped)
+    with pytest.raises(fintechx_native.AuthenticationError):
+        fintechx_native.decrypt_file(str(tmp_path / "swapped.fxs"), str(out), key)
+    assert not out.exists()
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip("pysqlcipher3") # database.py imports the driver; the tests use plain sqlite3
+
+from fintechx_desktop.infrastructure import database, ledger
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    database.initialize_schema(conn)
+    conn.execute("INSERT INTO users (username, password_hash, salt) VALUES ('alice', 'h', 's');")
+    conn.executemany("INSERT INTO accounts (user_id, name, type) VALUES (1, ?, 'checking');",
+                     [("Main",), ("Savings",)])
+    conn.commit()
+    yield conn
+    conn.close()
+
+def _rows(count, account_id=1, category="Food"):
+    # Several rows per date, so pages must break ties on id
+    return [(account_id, f"row {i}", i + 1, category, f"2024-01-{1 + i // 3:02d}") for i in range(count)]
+
+def test_money_conversions():
+    assert ledger.to_cents("12.345") == 1235
+    assert ledger.to_cents(-0.125) == -13
+    assert ledger.to_cents(0.1) == 10
+    assert ledger.format_cents(-1205) == "-12.05"
+    assert ledger.format_cents(7) == "0.07"
+
+def test_insert_maintains_balances(conn):
+    assert ledger.insert_transactions(conn, _rows(10), batch_size=3) == 10
+    ledger.insert_transactions(conn, [(2, "deposit", 500, "Income", "2024-02-01")])
+    assert ledger.get_balance(conn, 1) == sum(range(1, 11))
+    assert ledger.get_balance(conn, 2) == 500
+    assert ledger.get_balance(conn, 3) is None
+
+def test_keyset_pagination_visits_every_row_once(conn):
+    ledger.insert_transactions(conn, _rows(25))
+    ledger.insert_transactions(conn, _rows(5, account_id=2))
+
+    seen = []
+    after = None
+    while True:
+        page, after = ledger.fetch_account_transactions(conn, 1, after=after, limit=4)
+        assert len(page) <= 4
+        seen.extend(page)
+        if after is None:
+            break
+    assert [e.description for e in seen] == [f"row {i}" for i in range(25)]
+    assert [(e.transaction_date, e.id) for e in seen] == sorted((e.transaction_date, e.id) for e in seen)
+    assert list(ledger.iter_account_transactions(conn, 1, page_size=7)) == seen
+
+def test_pagination_date_range_and_category(conn):
+    ledger.insert_transactions(conn, _rows(12))
+    ledger.insert_transactions(conn, _rows(6, account_id=2, category="Rent"))
+
+    page, after = ledger.fetch_account_transactions(conn, 1, "2024-01-02", "2024-01-03", limit=100)
+    assert after is None
+    assert [e.description for e in page] == [f"row {i}" for i in range(3, 9)]
+
+    page, after = ledger.fetch_category_transactions(conn, "Rent", limit=4)
+    assert len(page) == 4 and after == (page[-1].transaction_date, page[-1].id)
+    rest, after = ledger.fetch_category_transactions(conn, "Rent", after=after, limit=4)
+    assert after is None
+    assert {e.account_id for e in page + rest} == {2} and len(rest) == 2
+
+def test_ledger_is_append_only(conn):
+    ledger.insert_transactions(conn, _rows(1))
+    with pytest.raises(sqlite3.DatabaseError):
+        conn.execute("DELETE FROM transactions;")
+    with pytest.raises(sqlite3.DatabaseError):
+        conn.execute("UPDATE transactions SET amount_cents = 0;")
+
+def test_checkpoint_and_reconcile(conn):
+    ledger.insert_transactions(conn, _rows(6), checkpoint_every=0)
+    assert not ledger.maybe_checkpoint_balances(conn, every_rows=7)
+    assert ledger.maybe_checkpoint_balances(conn, every_rows=6)
+    assert conn.execute("SELECT account_id, balance_cents, last_transaction_id FROM balance_checkpoints "
+                        "ORDER BY account_id;").fetchall() == [(1, 21, 6), (2, 0, 6)]
+
+    ledger.insert_transactions(conn, _rows(3), checkpoint_every=0)
+    assert ledger.reconcile_balances(conn) == []
+
+    conn.execute("UPDATE accounts SET balance_cents = balance_cents + 1 WHERE id = 1;")
+    conn.commit()
+    assert ledger.reconcile_balances(conn) == [(1, 21 + 6 + 1, 21 + 6)]
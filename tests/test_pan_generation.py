@@ -0,0 +1,35 @@
+import pytest
+
+fintechx_native = pytest.importorskip("fintechx_desktop.infrastructure.fintechx_native")
+
+# 14 prefix digits + 1 payload digit + check digit: exactly 10 PANs
+NARROW_PREFIX = "41111111111111"
+
+def test_unique_batch_covers_the_space():
+    pans = fintechx_native.generate_pan_batch(NARROW_PREFIX, 16, 10, unique=True)
+    assert len(set(pans)) == 10
+    assert all(p.startswith(NARROW_PREFIX) and fintechx_native.luhn_check(p) for p in pans)
+
+def test_unique_batch_is_exhausted():
+    with pytest.raises(ValueError):
+        fintechx_native.generate_pan_batch(NARROW_PREFIX, 16, 11, unique=True)
+
+def test_unique_batch_avoids_exclusions():
+    every = fintechx_native.generate_pan_batch(NARROW_PREFIX, 16, 10, unique=True)
+    excluded = every[:3]
+    pans = fintechx_native.generate_pan_batch(NARROW_PREFIX, 16, 7, unique=True, exclude=excluded)
+    assert set(pans) == set(every[3:])
+    with pytest.raises(ValueError):
+        fintechx_native.generate_pan_batch(NARROW_PREFIX, 16, 8, unique=True, exclude=excluded)
+
+def test_exclude_requires_unique():
+    with pytest.raises(ValueError):
+        fintechx_native.generate_pan_batch("4111", 16, 3, exclude=["4111111111111111"])
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_unique_packed_batch(threads):
+    count, length = 5000, 16
+    packed = fintechx_native.generate_pan_batch_bytes("411111111", length, count, threads, unique=True)
+    pans = {packed[i:i + length] for i in range(0, len(packed), length)}
+    assert len(pans) == count
+    assert all(p.startswith(b"411111111") for p in pans)
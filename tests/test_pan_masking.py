@@ -0,0 +1,76 @@
+import pytest
+
+from fintechx_desktop.core.logging_config import _mask_pans_python
+
+try:
+    from fintechx_desktop.infrastructure import fintechx_native
+except ImportError:
+    fintechx_native = None
+
+needs_native = pytest.mark.skipif(fintechx_native is None, reason="native module not built")
+
+MASKERS = [pytest.param(_mask_pans_python, id="python"),
+           pytest.param(lambda text: fintechx_native.mask_pans(text), id="native", marks=needs_native)]
+
+PANS = ["4111 1111 1111 1111", "5500-0000-0000-0004", "3400 000000 00009"]
+
+@pytest.mark.parametrize("mask", MASKERS)
+@pytest.mark.parametrize("text, expected", [
+    ("card 4111111111111111 ok", "card ************1111 ok"),
+    ("card 4111 1111 1111 1111.", "card **** **** **** 1111."),
+    ("card 4111-1111-1111-1111", "card ****-****-****-1111"),
+    ("ref 12 4111 1111 1111 1111", "ref 12 **** **** **** 1111"),
+    ("qty 6 4111 1111 1111 1111", "qty * **** **** **** 1111"),
+    ("order 4111111111111112", "order 4111111111111112"), # Fails Luhn
+    ("id 41111111111111111111", "id 41111111111111111111"), # 20 digits: not a PAN
+    ("id 411111111111111111110", "id 411111111111111111110"),
+    ("4111  1111 1111 1111", "4111  1111 1111 1111"), # Double space splits the run
+    ("no digits here", "no digits here"),
+])
+def test_mask_pans(mask, text, expected):
+    assert mask(text) == expected
+
+@pytest.mark.parametrize("mask", MASKERS)
+@pytest.mark.parametrize("pan", PANS)
+@pytest.mark.parametrize("separator", [" ", "-"])
+def test_leading_number_never_leaves_pan_digits_in_clear(mask, pan, separator):
+    # Any digit groups before a PAN may form Luhn-valid spans with its first groups; the PAN's
+    # own digits must still all be masked except the last 4
+    for prefix in range(1000):
+        head = f"qty {prefix}{separator}"
+        masked = mask(head + pan + " end")
+        assert masked.startswith("qty ") and masked.endswith(" end")
+        masked_pan = masked[len(head):len(head) + len(pan)]
+        assert sum(c.isdigit() for c in masked_pan) == 4, (prefix, masked)
+        assert masked_pan[-4:] == pan[-4:]
+
+@needs_native
+def test_find_pans_offsets():
+    text = b"a 4111 1111 1111 1111 b 5500000000000004 c 41111111111111111111"
+    assert fintechx_native.find_pans(text) == [(2, 21), (24, 40)]
+
+@needs_native
+def test_find_pans_merges_overlapping_spans():
+    text = b"qty 6 4111 1111 1111 1111"
+    assert fintechx_native.find_pans(text) == [(4, len(text))]
+
+@needs_native
+def test_mask_pans_types():
+    assert fintechx_native.mask_pans(bytearray(b"4111111111111111")) == b"************1111"
+    assert fintechx_native.mask_pans(b"4111111111111111", keep_first=6) == b"411111******1111"
+    clean = b"nothing to mask"
+    assert fintechx_native.mask_pans(clean) is clean
+    assert type(fintechx_native.mask_pans(bytearray(clean))) is bytes
+    with pytest.raises(ValueError):
+        fintechx_native.mask_pans("4111111111111111", keep_first=7)
+
+@needs_native
+def test_pan_scrubber_masks_across_blocks():
+    text = "paid with 4111 1111 1111 1111 and ref 12 5500-0000-0000-0004\n" * 3
+    for block_size in (1, 5, 17, len(text)):
+        scrubber = fintechx_native.PanScrubber()
+        out = b"".join(scrubber.feed(text[i:i + block_size].encode())
+                       for i in range(0, len(text), block_size))
+        out += scrubber.finish()
+        assert out.decode() == fintechx_native.mask_pans(text)
+        assert scrubber.matches == 6